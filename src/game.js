@@ -9,7 +9,7 @@ import { TableRenderer } from './ui/TableRenderer.js';
 import { ScoreDisplay } from './ui/ScoreDisplay.js';
 import { WinModal } from './ui/WinModal.js';
 import { HintTooltip } from './ui/HintTooltip.js';
-import { sanitizeInput, isRateLimited } from './logic/GameLogic.js';
+import { sanitizeInput, isRateLimited, validateGuess } from './logic/GameLogic.js';
 
 class HockeyGameDashboard {
     constructor() {
@@ -19,6 +19,7 @@ class HockeyGameDashboard {
         this.scoreDisplay = null;
         this.winModal = null;
         this.hintTooltip = null;
+        this.fuzzyIndex = null;
         this.init();
     }
 
@@ -71,6 +72,11 @@ class HockeyGameDashboard {
             this.tableRenderer.populateTable(this.gameState.currentPlayer);
             this.setupEventListeners();
 
+            // Typos are forgiven only once the fuzzy index can rule out other players
+            playerService.loadFuzzyIndex()
+                .then(index => { this.fuzzyIndex = index; })
+                .catch(error => console.warn('Fuzzy name index unavailable:', error));
+
             this.gameState.setCurrentRound(1);
             this.scoreDisplay.updateScore(this.gameState.score, this.gameState.roundStartScore);
             this.updateRoundDisplay();
@@ -177,7 +183,8 @@ class HockeyGameDashboard {
             return;
         }
 
-        if (guess === this.gameState.correctAnswer) {
+        const answerId = playerService.getPlayerId(this.gameState.currentPlayer);
+        if (validateGuess(guess, this.gameState.correctAnswer, this.fuzzyIndex, answerId)) {
             this.handleCorrectGuess();
         } else {
             this.handleIncorrectGuess();
@@ -3,6 +3,7 @@
 // Every function is testable without DOM and deterministic for same inputs
 
 import { GAME_CONFIG } from '../config.js';
+import { foldName, stripAccents, maxTypos, editDistance } from '../utils/NameIndex.js';
 
 /**
  * Calculate score based on game events
@@ -31,13 +32,28 @@ export function calculateScore(currentScore, hintsUsed, isCorrect, wrongChoices
 
 /**
  * Validate a player guess against correct answer
+ * Accents, apostrophes and case are ignored ("holmstrom" matches "Holmström"). A few typos
+ * are allowed (none below 5 letters, 1 below 10, otherwise 2) only when the fuzzy index
+ * resolves the guess to the answer alone: "ryan smith" is not "Ryan Smyth" if Ryan Smith
+ * played too
  * @param {string} guess - Player's guess
  * @param {string} correctAnswer - Correct player name
+ * @param {FuzzyIndex} [fuzzyIndex] - Index of all player names (without it only exact guesses count)
+ * @param {string} [answerId] - Player ID of the correct answer in fuzzyIndex
  * @returns {boolean} True if guess matches
  */
-export function validateGuess(guess, correctAnswer) {
+export function validateGuess(guess, correctAnswer, fuzzyIndex = null, answerId = null) {
   if (!guess || !correctAnswer) return false;
-  return guess.toLowerCase().trim() === correctAnswer.toLowerCase().trim();
+  const answer = foldName(correctAnswer);
+  const folded = foldName(guess);
+  if (answer === '' || folded === answer) return answer !== '';
+
+  const typos = maxTypos(answer.length);
+  if (!fuzzyIndex || !answerId || editDistance(folded, answer, typos) > typos) return false;
+
+  // The answer must be the closest player, with no other player as close
+  const [best, next] = fuzzyIndex.match(guess, 2, typos);
+  return Boolean(best) && best.id === answerId && (!next || next.distance > best.distance);
 }
 
 /**
@@ -159,9 +175,8 @@ export function shuffleArray(array, seed) {
 export function sanitizeInput(input, maxLength = GAME_CONFIG.MAX_INPUT_LENGTH) {
   if (!input) return '';
 
-  return input
-    .trim()
-    .toLowerCase()
+  // Accented letters become their base letter instead of being dropped
+  return stripAccents(input.trim().toLowerCase())
     .replace(GAME_CONFIG.ALLOWED_INPUT_PATTERN, '')
     .substring(0, maxLength);
 }
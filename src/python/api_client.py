@@ -4,20 +4,234 @@ Handles authentication and CRUD operations.
 """
 import os
 import json
-from typing import Optional, List, Dict, Any
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from lookup_cache import LookupCache
+from metrics import REGISTRY
+
+# Methods safe to retry after the request may have reached the server
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# Statuses worth retrying (rate limited or transient server errors)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Statuses that mean the request was rejected before processing
+REJECTED_STATUSES = frozenset({429})
+
+# Batch upload bounds (items and encoded bytes per request)
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+# Items per read request when streaming a collection
+DEFAULT_PAGE_SIZE = 500
+
+# Compact JSON for request bodies
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+REQUESTS = REGISTRY.counter(
+    'directus_requests_total', 'Directus API requests by final status', ['method', 'status']
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    'directus_request_seconds', 'Directus API request latency including retries', ['method']
+)
+RETRIES = REGISTRY.counter(
+    'directus_retries_total', 'Directus API requests retried, by cause', ['reason']
+)
+RECORDS_UPLOADED = REGISTRY.counter(
+    'directus_records_uploaded_total', 'Records created or updated in Directus', ['collection', 'method']
+)
+
+
+@dataclass
+class RequestFailure:
+    """Why a request returned None: the HTTP status, or None if no response arrived."""
+    status: Optional[int]
+    error: str
+
+    @property
+    def rejected(self) -> bool:
+        """
+        True if the server refused the request, so nothing was written.
+
+        A timeout, dropped connection or 5xx may arrive after the server
+        applied the request; resending a POST then creates duplicates.
+        """
+        return self.status is not None and 400 <= self.status < 500 and self.status != 408
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of uploading one player in a batch."""
+    index: int
+    name: Optional[str]
+    player_id: Optional[int] = None
+    stats_created: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the player and all its statistics were created."""
+        return self.error is None and self.player_id is not None
+
+
+def chunk_items(
+    items: List[Any],
+    max_items: int = DEFAULT_CHUNK_SIZE,
+    max_bytes: int = DEFAULT_CHUNK_BYTES
+) -> Iterator[List[Any]]:
+    """
+    Split items into chunks bounded by count and encoded JSON size.
+
+    An item larger than max_bytes gets a chunk of its own.
+
+    Args:
+        items: JSON-serializable items
+        max_items: Maximum items per chunk
+        max_bytes: Maximum encoded bytes per chunk
+
+    Yields:
+        Lists of items
+    """
+    chunk = []
+    chunk_bytes = 2
+
+    for item in items:
+        size = len(json.dumps(item)) + 1
+        if chunk and (len(chunk) >= max_items or chunk_bytes + size > max_bytes):
+            yield chunk
+            chunk = []
+            chunk_bytes = 2
+        chunk.append(item)
+        chunk_bytes += size
+
+    if chunk:
+        yield chunk
+
+
+def iter_json_rows(
+    groups: Iterable[Tuple[Any, List[Dict[str, Any]]]],
+    key: str = 'player_id'
+) -> Iterator[bytes]:
+    """
+    Encode grouped rows as one JSON array, adding key to every row.
+
+    Each group is encoded with a single C-encoder call and key is spliced
+    into the encoded objects, so rows are never copied to add it. Groups
+    whose rows are not flat, non-empty objects (or already carry key)
+    fall back to copying.
+
+    Args:
+        groups: (key value, rows) pairs, e.g. (player_id, statistics)
+        key: Field added to every row
+
+    Yields:
+        UTF-8 chunks of the JSON array
+    """
+    yield b'['
+    first = True
+
+    for value, rows in groups:
+        if not rows:
+            continue
+
+        encoded = _COMPACT_ENCODER.encode(rows)[1:-1]
+        prefix = '{' + _COMPACT_ENCODER.encode(key) + ':' + _COMPACT_ENCODER.encode(value)
+
+        # Inside strings quotes are escaped, so '{"' only starts an object;
+        # one per row means no nested objects
+        if encoded.count('{"') == len(rows) and '{}' not in encoded and f'"{key}":' not in encoded:
+            encoded = encoded.replace('{"', prefix + ',"')
+        else:
+            encoded = _COMPACT_ENCODER.encode([{**row, key: value} for row in rows])[1:-1]
+
+        yield encoded.encode('utf-8') if first else b',' + encoded.encode('utf-8')
+        first = False
+
+    yield b']'
+
+
+def encode_body(chunks: Iterable[bytes], compress: bool = False, level: int = 1) -> bytes:
+    """
+    Join encoded chunks into a request body, gzip-compressing on the fly.
+
+    With compression the uncompressed body is never held in memory.
+
+    Args:
+        chunks: Encoded body chunks
+        compress: Gzip the body
+        level: zlib compression level (1 = fastest)
+
+    Returns:
+        Request body bytes
+    """
+    if not compress:
+        return b''.join(chunks)
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    parts = [compressor.compress(chunk) for chunk in chunks]
+    parts.append(compressor.flush())
+    return b''.join(parts)
+
+
+class RejectedRetry(Retry):
+    """
+    Retry policy that also retries non-idempotent requests rejected
+    with 429: a rate-limited request was never processed, so resending
+    a POST cannot create duplicates.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code in REJECTED_STATUSES and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        reason = str(response.status) if response is not None and response.status else type(error).__name__
+        RETRIES.inc(reason=reason)
+        return retry
 
 
 class DirectusClient:
     """Client for Directus CMS API."""
 
-    def __init__(self, api_url: Optional[str] = None, token: Optional[str] = None):
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        token: Optional[str] = None,
+        pool_size: int = 10,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        cache_size: int = 1024,
+        cache_ttl: float = 300.0,
+        compress: bool = False,
+        compress_level: int = 1
+    ):
         """
         Initialize Directus client.
 
         Args:
             api_url: Directus API base URL (default: from DIRECTUS_URL env var)
             token: Directus access token (default: from DIRECTUS_TOKEN env var)
+            pool_size: Maximum keep-alive connections kept open to the server
+            timeout: Request timeout in seconds
+            max_retries: Retries for idempotent requests and failed connects
+            backoff_factor: Exponential backoff base between retries in seconds
+            cache_size: Maximum cached lookups (LRU eviction)
+            cache_ttl: Seconds a cached lookup stays fresh (0 disables caching;
+                concurrent identical lookups still share one request)
+            compress: Gzip request bodies (disabled automatically if the
+                server answers 415 Unsupported Media Type)
+            compress_level: zlib level for compressed bodies
         """
         self.api_url = api_url or os.getenv('DIRECTUS_URL', 'http://localhost:8055')
         self.token = token or os.getenv('DIRECTUS_TOKEN', '')
@@ -30,11 +244,82 @@ class DirectusClient:
             'Content-Type': 'application/json'
         }
 
+        self.timeout = timeout
+        self.compress = compress
+        self.compress_level = compress_level
+        self.session = self._init_session(pool_size, max_retries, backoff_factor)
+        self.lookup_cache = LookupCache(max_size=cache_size, ttl=cache_ttl)
+        self._local = threading.local()
+
+    @property
+    def last_failure(self) -> Optional[RequestFailure]:
+        """Failure of this thread's last request, or None if it succeeded."""
+        return getattr(self._local, 'failure', None)
+
+    def _init_session(
+        self,
+        pool_size: int,
+        max_retries: int,
+        backoff_factor: float
+    ) -> requests.Session:
+        """Create keep-alive session with connection pool and retry policy."""
+        retry = RejectedRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+    def _invalidate_players(self, ids=(), names=()):
+        """
+        Drop cached player lookups affected by a write.
+
+        Args:
+            ids: Player IDs written
+            names: Player names written (covers cached misses)
+        """
+        for name in names:
+            self.lookup_cache.invalidate(('players', 'name', name))
+
+        ids = set(ids)
+        if ids:
+            self.lookup_cache.invalidate_where(
+                lambda key, result: any(item.get('id') in ids for item in result.get('data') or [])
+            )
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
     def _make_request(
         self,
         method: str,
         endpoint: str,
-        data: Optional[Dict] = None
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        encoder: Optional[Callable[[], Iterable[bytes]]] = None
     ) -> Optional[Dict]:
         """
         Make HTTP request to Directus API.
@@ -42,40 +327,89 @@ class DirectusClient:
         Args:
             method: HTTP method (GET, POST, PATCH, DELETE)
             endpoint: API endpoint (e.g., 'items/players')
-            data: Request body data
+            data: Request body data (object or array)
+            params: Query string parameters
+            encoder: Returns encoded body chunks (used instead of data;
+                may be called again to resend uncompressed)
 
         Returns:
             Response JSON or None on failure
         """
         url = f"{self.api_url}/{endpoint}"
 
+        if method not in ('GET', 'POST', 'PATCH', 'DELETE'):
+            raise ValueError(f"Unsupported method: {method}")
+
+        if encoder is None and data:
+            encoder = lambda: (json.dumps(data).encode('utf-8'),)
+
+        start = time.perf_counter()
+        status = 'error'
+        self._local.failure = None
+
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=self.headers)
-            elif method == 'POST':
-                response = requests.post(
-                    url,
-                    headers=self.headers,
-                    data=json.dumps(data) if data else None
-                )
-            elif method == 'PATCH':
-                response = requests.patch(
-                    url,
-                    headers=self.headers,
-                    data=json.dumps(data) if data else None
-                )
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=self.headers)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            compress = self.compress and encoder is not None
+            response = self._send(method, url, params, encoder, compress)
 
+            if compress and response.status_code == 415:
+                print("Server does not accept gzip request bodies; sending uncompressed")
+                self.compress = False
+                RETRIES.inc(reason='415')
+                response = self._send(method, url, params, encoder, False)
+
+            status = str(response.status_code)
             response.raise_for_status()
-            return response.json()
+
+            # DELETE returns 204 No Content
+            if response.status_code == 204 or not response.content:
+                return {}
+
+            result = response.json()
+            if method in ('POST', 'PATCH') and endpoint.startswith('items/'):
+                written = result.get('data') if isinstance(result, dict) else None
+                count = len(written) if isinstance(written, list) else int(written is not None)
+                RECORDS_UPLOADED.inc(count, collection=endpoint.split('/')[1], method=method)
+
+            return result
 
         except requests.exceptions.RequestException as e:
             print(f"API Error ({method} {endpoint}): {e}")
+            response = getattr(e, 'response', None)
+            self._local.failure = RequestFailure(
+                status=response.status_code if response is not None else None,
+                error=str(e)
+            )
             return None
 
+        finally:
+            REQUESTS.inc(method=method, status=status)
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=method)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        encoder: Optional[Callable[[], Iterable[bytes]]],
+        compress: bool
+    ) -> requests.Response:
+        """Encode the body (optionally gzipped) and send one request."""
+        body = None
+        headers = None
+        if encoder is not None:
+            body = encode_body(encoder(), compress, self.compress_level)
+            if compress:
+                headers = {'Content-Encoding': 'gzip'}
+
+        return self.session.request(
+            method,
+            url,
+            data=body,
+            params=params,
+            headers=headers,
+            timeout=self.timeout
+        )
+
     def create_player(self, player_data: Dict[str, Any]) -> Optional[int]:
         """
         Create a new player record.
@@ -87,6 +421,7 @@ class DirectusClient:
             Player ID if successful, None otherwise
         """
         result = self._make_request('POST', 'items/players', player_data)
+        self._invalidate_players(names=[player_data.get('name')])
 
         if result and 'data' in result:
             player_id = result['data'].get('id')
@@ -111,13 +446,10 @@ class DirectusClient:
         Returns:
             True if all successful, False otherwise
         """
-        # Add player_id to each statistic
-        stats_with_player = [
-            {**stat, 'player_id': player_id}
-            for stat in statistics
-        ]
-
-        result = self._make_request('POST', 'items/statistics', stats_with_player)
+        result = self._make_request(
+            'POST', 'items/statistics',
+            encoder=lambda: iter_json_rows([(player_id, statistics)])
+        )
 
         if result:
             count = len(statistics)
@@ -131,14 +463,19 @@ class DirectusClient:
         """
         Find player by name.
 
+        Results (including "not found") are cached for cache_ttl seconds
+        and concurrent lookups of the same name share one request.
+
         Args:
             name: Player name to search for
 
         Returns:
             Player data if found, None otherwise
         """
-        endpoint = f"items/players?filter[name][_eq]={name}"
-        result = self._make_request('GET', endpoint)
+        result = self.lookup_cache.get_or_load(
+            ('players', 'name', name),
+            lambda: self._make_request('GET', 'items/players', params={'filter[name][_eq]': name})
+        )
 
         if result and 'data' in result and result['data']:
             return result['data'][0]
@@ -157,6 +494,7 @@ class DirectusClient:
             True if successful, False otherwise
         """
         result = self._make_request('PATCH', f'items/players/{player_id}', updates)
+        self._invalidate_players(ids=[player_id], names=[updates.get('name')] if 'name' in updates else ())
 
         if result:
             print(f"Player updated: ID={player_id}")
@@ -176,6 +514,7 @@ class DirectusClient:
             True if successful, False otherwise
         """
         result = self._make_request('DELETE', f'items/players/{player_id}')
+        self._invalidate_players(ids=[player_id])
 
         if result is not None:
             print(f"Player deleted: ID={player_id}")
@@ -184,26 +523,610 @@ class DirectusClient:
         print(f"Failed to delete player: ID={player_id}")
         return False
 
-    def bulk_create_players(self, players_data: List[Dict]) -> List[int]:
+    def create_players(self, players_data: List[Dict[str, Any]]) -> Optional[List[int]]:
+        """
+        Create several player records in one request.
+
+        Directus applies a batch atomically: all items are created or none.
+
+        Args:
+            players_data: List of player data dictionaries
+
+        Returns:
+            Created player IDs in input order, or None on failure
+        """
+        result = self._make_request('POST', 'items/players', players_data)
+        self._invalidate_players(names=[p.get('name') for p in players_data])
+
+        if result and isinstance(result.get('data'), list) and len(result['data']) == len(players_data):
+            return [item.get('id') for item in result['data']]
+
+        return None
+
+    def create_statistics_rows(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Create statistics rows that already carry their player_id.
+
+        Args:
+            rows: Statistics dictionaries including 'player_id'
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._make_request('POST', 'items/statistics', rows) is not None
+
+    def create_statistics_groups(self, groups: List[Tuple[int, List[Dict[str, Any]]]]) -> bool:
+        """
+        Create statistics for several players in one request.
+
+        Rows are stream-encoded with their player_id added, without
+        copying them.
+
+        Args:
+            groups: (player_id, statistics dictionaries) pairs
+
+        Returns:
+            True if successful, False otherwise
+        """
+        result = self._make_request(
+            'POST', 'items/statistics',
+            encoder=lambda: iter_json_rows(groups)
+        )
+        return result is not None
+
+    def list_items(
+        self,
+        collection: str,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        offset: int = 0,
+        sort: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Read one page of items.
+
+        Args:
+            collection: Collection name (e.g., 'players')
+            fields: Fields to return (default: all)
+            filters: Filters {field: value} (equality) or
+                {field: {'_gt': value, ...}} (Directus operators)
+            limit: Page size
+            offset: Items to skip
+            sort: Sort field (prefix '-' for descending)
+
+        Returns:
+            List of items, or None on failure
+        """
+        params = {'limit': limit, 'offset': offset}
+        if fields:
+            params['fields'] = ','.join(fields)
+        if sort:
+            params['sort'] = sort
+        for field, value in (filters or {}).items():
+            if isinstance(value, dict):
+                for op, operand in value.items():
+                    params[f'filter[{field}][{op}]'] = operand
+            else:
+                params[f'filter[{field}][_eq]'] = value
+
+        result = self._make_request('GET', f'items/{collection}', params=params)
+
+        if result is None or not isinstance(result.get('data'), list):
+            return None
+
+        return result['data']
+
+    def iter_items(
+        self,
+        collection: str,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        keyset: bool = True,
+        prefetch: bool = True
+    ) -> 'ItemPager':
+        """
+        Stream every matching item of a collection page by page.
+
+        Args:
+            collection: Collection name
+            fields: Fields to return (default: all; 'id' is added for keyset paging)
+            filters: Filters as for list_items
+            page_size: Items per request
+            keyset: Page by id > last id (True) or by limit/offset
+            prefetch: Fetch the next page while the current one is consumed
+
+        Returns:
+            ItemPager (iterable of item dictionaries)
+        """
+        return ItemPager(self, collection, fields, filters, page_size, keyset, prefetch)
+
+    def iter_players(self, fields: Optional[List[str]] = None, **kwargs) -> 'ItemPager':
+        """Stream all players. See iter_items."""
+        return self.iter_items('players', fields=fields, **kwargs)
+
+    def iter_statistics(
+        self,
+        player_id: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        **kwargs
+    ) -> 'ItemPager':
+        """Stream statistics rows, optionally for one player. See iter_items."""
+        filters = kwargs.pop('filters', None) or {}
+        if player_id is not None:
+            filters = {**filters, 'player_id': player_id}
+        return self.iter_items('statistics', fields=fields, filters=filters, **kwargs)
+
+    def update_items(self, collection: str, items: List[Dict[str, Any]]) -> bool:
+        """
+        Update several items in one request.
+
+        Args:
+            collection: Collection name
+            items: Partial items, each including its 'id'
+
+        Returns:
+            True if successful, False otherwise
+        """
+        result = self._make_request('PATCH', f'items/{collection}', items)
+        if collection == 'players':
+            self._invalidate_players(
+                ids=[item.get('id') for item in items],
+                names=[item['name'] for item in items if 'name' in item]
+            )
+        return result is not None
+
+    def delete_items(self, collection: str, ids: List[int]) -> bool:
+        """
+        Delete several items in one request.
+
+        Args:
+            collection: Collection name
+            ids: Item IDs to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        result = self._make_request('DELETE', f'items/{collection}', ids)
+        if collection == 'players':
+            self._invalidate_players(ids=ids)
+        return result is not None
+
+    def delete_items_by_filter(self, collection: str, filters: Dict[str, Any]) -> bool:
+        """
+        Delete every item matching filters in one request.
+
+        Args:
+            collection: Collection name
+            filters: Filters as for list_items
+
+        Returns:
+            True if successful, False otherwise
+        """
+        query_filter = {
+            field: value if isinstance(value, dict) else {'_eq': value}
+            for field, value in filters.items()
+        }
+        result = self._make_request('DELETE', f'items/{collection}', {'query': {'filter': query_filter}})
+        if collection == 'players':
+            self.lookup_cache.clear()
+        return result is not None
+
+    def replace_statistics(self, player_id: int, statistics: List[Dict[str, Any]]) -> bool:
+        """
+        Make a player's statistics rows exactly match statistics.
+
+        When the only differences are in the current (latest) season, just
+        those rows are created, patched or deleted. Otherwise the new rows
+        are bulk-inserted and the old ones bulk-deleted by filter, two
+        requests however many rows changed. Inserting first means a failure
+        never leaves the player without statistics; re-running repairs it.
+
+        Args:
+            player_id: Player ID
+            statistics: Complete desired statistics (without player_id)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        from sync import changed_fields, stat_key
+
+        existing = self.list_items('statistics', filters={'player_id': player_id}, limit=-1, sort='id')
+        if existing is None:
+            print(f"Failed to read statistics for player {player_id}")
+            return False
+
+        remote = {}
+        duplicates = []
+        for row in existing:
+            if stat_key(row) in remote:
+                duplicates.append(row)
+            else:
+                remote[stat_key(row)] = row
+
+        creates = []
+        patches = []
+        touched = set()
+        for stat in statistics:
+            row = remote.pop(stat_key(stat), None)
+            if row is None:
+                creates.append(stat)
+                touched.add(stat.get('season') or '')
+                continue
+            changes = changed_fields(stat, row)
+            if changes:
+                patches.append({**changes, 'id': row['id']})
+                touched.add(stat.get('season') or '')
+        deletes = list(remote.values()) + duplicates
+        touched.update(row.get('season') or '' for row in deletes)
+
+        if not touched:
+            return True
+
+        current = max([stat.get('season') or '' for stat in statistics] + [row.get('season') or '' for row in existing])
+
+        if touched == {current}:
+            ok = True
+            if creates:
+                ok = self.create_statistics_groups([(player_id, creates)]) and ok
+            if patches:
+                ok = self.update_items('statistics', patches) and ok
+            if deletes:
+                ok = self.delete_items('statistics', [row['id'] for row in deletes]) and ok
+            if ok:
+                print(
+                    f"Statistics updated: player {player_id} season {current}"
+                    f" (+{len(creates)} ~{len(patches)} -{len(deletes)})"
+                )
+            else:
+                print(f"Failed to update statistics for player {player_id}")
+            return ok
+
+        if statistics and not self.create_statistics_groups([(player_id, statistics)]):
+            print(f"Failed to replace statistics for player {player_id}")
+            return False
+
+        if existing and not self.delete_items_by_filter(
+            'statistics', {'player_id': player_id, 'id': {'_lte': max(row['id'] for row in existing)}}
+        ):
+            print(f"Failed to delete old statistics for player {player_id}")
+            return False
+
+        print(f"Statistics replaced: {len(statistics)} records for player {player_id}")
+        return True
+
+    def bulk_create_players(
+        self,
+        players_data: List[Dict],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunk_bytes: int = DEFAULT_CHUNK_BYTES
+    ) -> List[int]:
         """
         Create multiple players in batch.
 
+        Players are POSTed as arrays in size-bounded chunks. A chunk the
+        server rejects is retried item by item so one bad record does not
+        drop the rest of its chunk. A chunk whose outcome is unknown
+        (timeout, dropped connection, 5xx) is not resent: it may have
+        been created, so its players are left out of the result.
+
         Args:
             players_data: List of player data dictionaries
+            chunk_size: Maximum players per request
+            max_chunk_bytes: Maximum encoded bytes per request
 
         Returns:
             List of created player IDs
         """
         created_ids = []
 
-        for player_data in players_data:
-            player_id = self.create_player(player_data)
-            if player_id:
-                created_ids.append(player_id)
+        for chunk in chunk_items(players_data, chunk_size, max_chunk_bytes):
+            ids = self.create_players(chunk)
+
+            if ids is not None:
+                created_ids.extend(ids)
+                print(f"Players created: {len(ids)} in one batch")
+                continue
+
+            failure = self.last_failure
+            if not (failure and failure.rejected):
+                print(f"Player batch outcome unknown, not resending {len(chunk)} players")
+                continue
+
+            for player_data in chunk:
+                player_id = self.create_player(player_data)
+                if player_id:
+                    created_ids.append(player_id)
 
         return created_ids
 
 
+class ItemPager:
+    """
+    Iterable over a collection read in pages.
+
+    At most two pages are held at once (the one being consumed and the
+    one being prefetched), so memory stays constant in collection size.
+    Keyset paging (id > last id, sorted by id) keeps each request cheap
+    however deep into the collection it is; offset paging is available
+    for servers or sorts where keyset does not apply.
+    """
+
+    def __init__(
+        self,
+        client: DirectusClient,
+        collection: str,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        keyset: bool = True,
+        prefetch: bool = True
+    ):
+        """
+        Initialize pager (no requests are made until iteration).
+
+        Args:
+            client: DirectusClient instance
+            collection: Collection name
+            fields: Fields to return (default: all)
+            filters: Filters as for DirectusClient.list_items
+            page_size: Items per request
+            keyset: Page by id > last id (True) or by limit/offset
+            prefetch: Fetch the next page in a background thread
+        """
+        self.client = client
+        self.collection = collection
+        self.fields = list(fields) if fields else None
+        if keyset and self.fields and 'id' not in self.fields:
+            self.fields.append('id')
+        self.filters = dict(filters or {})
+        self.page_size = page_size
+        self.keyset = keyset
+        self.prefetch = prefetch
+
+        self.pages = 0
+        self.items = 0
+
+    def _fetch(self, cursor: Any) -> List[Dict]:
+        """
+        Fetch the page after cursor (last id or offset).
+
+        Raises:
+            ConnectionError: If the request failed
+        """
+        if self.keyset:
+            filters = dict(self.filters)
+            if cursor is not None:
+                bounds = filters.get('id') if isinstance(filters.get('id'), dict) else {}
+                filters['id'] = {**bounds, '_gt': cursor}
+            page = self.client.list_items(
+                self.collection, fields=self.fields, filters=filters,
+                limit=self.page_size, sort='id'
+            )
+        else:
+            page = self.client.list_items(
+                self.collection, fields=self.fields, filters=self.filters,
+                limit=self.page_size, offset=cursor or 0, sort='id'
+            )
+
+        if page is None:
+            raise ConnectionError(f"Failed to read {self.collection} page after {cursor}")
+        return page
+
+    def _next_cursor(self, cursor: Any, page: List[Dict]) -> Any:
+        """Cursor for the page following page."""
+        if self.keyset:
+            return page[-1]['id']
+        return (cursor or 0) + len(page)
+
+    def __iter__(self) -> Iterator[Dict]:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pager') if self.prefetch else None
+
+        try:
+            cursor = None
+            page = self._fetch(cursor)
+
+            while True:
+                self.pages += 1
+                last = len(page) < self.page_size
+                if not page:
+                    return
+
+                following = None
+                if not last:
+                    cursor = self._next_cursor(cursor, page)
+                    if executor is not None:
+                        following = executor.submit(self._fetch, cursor)
+
+                for item in page:
+                    self.items += 1
+                    yield item
+
+                if last:
+                    return
+                page = following.result() if following is not None else self._fetch(cursor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+
+def export_items(
+    client: DirectusClient,
+    collection: str,
+    path: str,
+    fields: Optional[List[str]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> int:
+    """
+    Stream a collection to a JSON Lines file.
+
+    Args:
+        client: DirectusClient instance
+        collection: Collection name
+        path: Output file path
+        fields: Fields to export (default: all)
+        page_size: Items per request
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for item in client.iter_items(collection, fields=fields, page_size=page_size):
+            f.write(json.dumps(item))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def player_statistics(player_data) -> List[Dict[str, Any]]:
+    """
+    Season and goalie statistics dictionaries for a PlayerData.
+
+    Args:
+        player_data: PlayerData object
+
+    Returns:
+        List of statistics dictionaries
+    """
+    return (
+        [season.to_dict() for season in player_data.seasons]
+        + [gs.to_dict() for gs in player_data.goalie_stats]
+    )
+
+
+def upload_record(player_data) -> Dict[str, Any]:
+    """
+    Serialized upload of a PlayerData.
+
+    Args:
+        player_data: PlayerData object
+
+    Returns:
+        {'player': player dict, 'statistics': statistics dicts}
+    """
+    return {
+        'player': player_data.player.to_dict(),
+        'statistics': player_statistics(player_data)
+    }
+
+
+def upload_players_batch(
+    players: List,  # List[PlayerData] from models.py
+    client: DirectusClient,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> List[BatchItemResult]:
+    """
+    Upload players in chunks: one request for the chunk's players, one
+    for all of the chunk's statistics.
+
+    Round-trips drop from 2N to about 2N/chunk_size. When the server
+    rejects a chunk request, that chunk falls back to per-player
+    requests so each failure is attributed to the item that caused it.
+    When the outcome is unknown (timeout, dropped connection, 5xx) the
+    chunk may already be applied, so nothing is resent and every item of
+    the chunk is reported with error 'outcome unknown'.
+
+    Args:
+        players: PlayerData objects
+        client: DirectusClient instance
+        chunk_size: Maximum players per request
+        max_chunk_bytes: Maximum encoded player bytes per request
+
+    Returns:
+        One BatchItemResult per input player, in input order
+    """
+    return upload_records_batch(
+        [upload_record(p) for p in players], client, chunk_size, max_chunk_bytes
+    )
+
+
+def upload_records_batch(
+    records: List[Dict[str, Any]],
+    client: DirectusClient,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> List[BatchItemResult]:
+    """
+    Upload serialized players in chunks. See upload_players_batch.
+
+    Args:
+        records: upload_record() dictionaries
+        client: DirectusClient instance
+        chunk_size: Maximum players per request
+        max_chunk_bytes: Maximum encoded player bytes per request
+
+    Returns:
+        One BatchItemResult per input record, in input order
+    """
+    results = [
+        BatchItemResult(index=i, name=r['player'].get('name'))
+        for i, r in enumerate(records)
+    ]
+    indexed = [(i, r['player']) for i, r in enumerate(records)]
+
+    # Chunk on encoded player size; statistics follow their players
+    for chunk in chunk_items(indexed, chunk_size, max_chunk_bytes):
+        indexes = [i for i, _ in chunk]
+        player_ids = client.create_players([data for _, data in chunk])
+
+        if player_ids is not None:
+            print(f"Players created: {len(player_ids)} in one batch")
+        elif _rejected(client):
+            # Nothing was written: isolate the failing players
+            player_ids = [client.create_player(data) for _, data in chunk]
+        else:
+            for i in indexes:
+                results[i].error = 'player create outcome unknown'
+            continue
+
+        row_count = 0
+        created = []
+        for i, player_id in zip(indexes, player_ids):
+            if not player_id:
+                results[i].error = 'player create failed'
+                continue
+
+            results[i].player_id = player_id
+            stats = records[i]['statistics']
+            row_count += len(stats)
+            created.append((i, player_id, stats))
+
+        if not row_count:
+            continue
+
+        if client.create_statistics_groups([(player_id, stats) for _, player_id, stats in created]):
+            print(f"Statistics created: {row_count} records for {len(created)} players")
+            for i, _, stats in created:
+                results[i].stats_created = len(stats)
+            continue
+
+        if not _rejected(client):
+            for i, _, stats in created:
+                if stats:
+                    results[i].error = 'statistics create outcome unknown'
+            continue
+
+        # Chunk statistics rejected: retry per player to attribute failures
+        for i, player_id, stats in created:
+            if not stats:
+                continue
+            if client.create_statistics(player_id, stats):
+                results[i].stats_created = len(stats)
+            else:
+                results[i].error = 'statistics create failed'
+
+    return results
+
+
+def _rejected(client: DirectusClient) -> bool:
+    """True if the client's last failed request was refused by the server."""
+    failure = client.last_failure
+    return failure is not None and failure.rejected
+
+
 def upload_player_data(
     player_data,  # PlayerData from models.py
     client: DirectusClient
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Segmented, compressed archive of raw scraped player pages.
+Replaces one .txt file per player with large append-only segment files
+plus an index mapping player ID to (segment, offset, length, fetch time).
+"""
+import argparse
+import json
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Record header: magic, player_id, fetch_time, compressed payload length
+RECORD_MAGIC = b'HDBR'
+RECORD_HEADER = struct.Struct('>4sQdI')
+
+SEGMENT_PATTERN = re.compile(r'^segment-(\d{6})\.seg$')
+INDEX_FILE = 'index.jsonl'
+# Old and new segment numbers of a compaction that has not finished
+COMPACT_JOURNAL = 'compact.json'
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class IndexEntry:
+    """Location of one archived page version."""
+    player_id: int
+    segment: int
+    offset: int
+    length: int
+    fetch_time: float
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for index serialization."""
+        return asdict(self)
+
+
+def _segment_name(segment: int) -> str:
+    """File name of segment number."""
+    return f"segment-{segment:06d}.seg"
+
+
+class PageArchive:
+    """Append-only segmented archive of raw player pages."""
+
+    def __init__(
+        self,
+        root: str,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        compress_level: int = 6
+    ):
+        """
+        Open (or create) archive directory.
+
+        Args:
+            root: Archive directory
+            segment_size: Roll over to a new segment past this many bytes
+            compress_level: zlib compression level (1-9)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.compress_level = compress_level
+        self.index: Dict[int, IndexEntry] = {}
+        self.superseded = 0
+
+        self._writer = None
+        self._index_file = None
+
+        self._load_index()
+        self._finish_compaction()
+        self._segment = max(self.segments(), default=0)
+
+    def segments(self) -> List[int]:
+        """Sorted list of segment numbers on disk."""
+        numbers = []
+        for path in self.root.iterdir():
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def segment_path(self, segment: int) -> Path:
+        """Path of segment number."""
+        return self.root / _segment_name(segment)
+
+    def _load_index(self):
+        """Load index file, latest entry per player wins."""
+        index_path = self.root / INDEX_FILE
+
+        if not index_path.exists():
+            if self.segments():
+                self.rebuild_index()
+            return
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = IndexEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    # Torn last line after a crash
+                    continue
+                if entry.player_id in self.index:
+                    self.superseded += 1
+                self.index[entry.player_id] = entry
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the index by scanning every segment.
+
+        Segments are self-describing, so this recovers from a lost or
+        truncated index file.
+
+        Returns:
+            Number of players indexed
+        """
+        self.close()
+        self.index = {}
+        self.superseded = 0
+
+        for segment in self.segments():
+            for entry in self._scan_segment(segment):
+                if entry.player_id in self.index:
+                    self.superseded += 1
+                self.index[entry.player_id] = entry
+
+        self._write_index(self.index.values())
+        return len(self.index)
+
+    def _write_index(self, entries):
+        """Atomically replace the index file."""
+        lines = [json.dumps(entry.to_dict()) for entry in sorted(entries, key=lambda e: (e.segment, e.offset))]
+        self._write_durable(INDEX_FILE, ''.join(line + '\n' for line in lines))
+
+    def _write_durable(self, name: str, text: str):
+        """Atomically replace root/name with text, synced to disk."""
+        path = self.root / name
+        tmp_path = path.with_suffix('.tmp')
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+        self._sync_root()
+
+    def _sync_root(self):
+        """Make renames and deletions in the archive directory durable (POSIX)."""
+        if os.name != 'posix':
+            return
+        fd = os.open(self.root, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _finish_compaction(self):
+        """
+        Complete or roll back a compaction interrupted by a crash.
+
+        The new index is the commit point: if it references the new
+        segments, the old ones are deleted; otherwise the new ones are,
+        and the old index and segments stay in use.
+        """
+        # Files being written when the process died
+        stray = list(self.root.glob('segment-*.seg.tmp'))
+        stray += [(self.root / name).with_suffix('.tmp') for name in (INDEX_FILE, COMPACT_JOURNAL)]
+        for path in stray:
+            if path.exists():
+                os.unlink(path)
+
+        journal_path = self.root / COMPACT_JOURNAL
+        if not journal_path.exists():
+            return
+
+        journal = json.loads(journal_path.read_text(encoding='utf-8'))
+        new = set(journal['new'])
+        committed = any(entry.segment in new for entry in self.index.values())
+        for segment in (journal['old'] if committed else journal['new']):
+            if self.segment_path(segment).exists():
+                os.unlink(self.segment_path(segment))
+
+        os.unlink(journal_path)
+        self._sync_root()
+
+    def _scan_segment(self, segment: int) -> Iterator[IndexEntry]:
+        """Yield index entries for every complete record in segment."""
+        with open(self.segment_path(segment), 'rb', buffering=READ_BUFFER_SIZE) as f:
+            offset = 0
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+
+                magic, player_id, fetch_time, length = RECORD_HEADER.unpack(header)
+                if magic != RECORD_MAGIC:
+                    print(f"FAILED - Corrupt record in {_segment_name(segment)} at {offset}")
+                    return
+
+                f.seek(length, os.SEEK_CUR)
+                end = offset + RECORD_HEADER.size + length
+                if f.tell() < end:
+                    # Truncated tail record
+                    return
+
+                yield IndexEntry(player_id, segment, offset, length, fetch_time)
+                offset = end
+
+    def _open_writer(self):
+        """Open current segment for append, rolling over when full."""
+        if self._writer is None:
+            if self._segment == 0:
+                self._segment = 1
+            path = self.segment_path(self._segment)
+            if path.exists() and path.stat().st_size >= self.segment_size:
+                self._segment += 1
+            self._writer = open(self.segment_path(self._segment), 'ab')
+            self._index_file = open(self.root / INDEX_FILE, 'a', encoding='utf-8')
+
+        elif self._writer.tell() >= self.segment_size:
+            self._writer.close()
+            self._segment += 1
+            self._writer = open(self.segment_path(self._segment), 'ab')
+
+    def append(self, player_id: int, text: str, fetch_time: Optional[float] = None) -> IndexEntry:
+        """
+        Append a page version for player.
+
+        Args:
+            player_id: HockeyDB player ID
+            text: Raw page text
+            fetch_time: Unix timestamp of the fetch (default: now)
+
+        Returns:
+            IndexEntry of the stored record
+        """
+        fetch_time = time.time() if fetch_time is None else fetch_time
+        payload = zlib.compress(text.encode('utf-8'), self.compress_level)
+
+        self._open_writer()
+        offset = self._writer.tell()
+        self._writer.write(RECORD_HEADER.pack(RECORD_MAGIC, player_id, fetch_time, len(payload)))
+        self._writer.write(payload)
+
+        entry = IndexEntry(player_id, self._segment, offset, len(payload), fetch_time)
+        self._index_file.write(json.dumps(entry.to_dict()) + '\n')
+
+        if player_id in self.index:
+            self.superseded += 1
+        self.index[player_id] = entry
+
+        return entry
+
+    def flush(self):
+        """Flush segment and index writes to disk."""
+        if self._writer:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._index_file.flush()
+            os.fsync(self._index_file.fileno())
+
+    def get(self, player_id: int) -> Optional[str]:
+        """
+        Read latest page version for player.
+
+        Args:
+            player_id: HockeyDB player ID
+
+        Returns:
+            Page text, or None if not archived
+        """
+        entry = self.index.get(player_id)
+        if entry is None:
+            return None
+
+        if self._writer and entry.segment == self._segment:
+            self._writer.flush()
+
+        with open(self.segment_path(entry.segment), 'rb') as f:
+            f.seek(entry.offset + RECORD_HEADER.size)
+            return zlib.decompress(f.read(entry.length)).decode('utf-8')
+
+    def iter_pages(self, latest_only: bool = True) -> Iterator[Tuple[int, str, float]]:
+        """
+        Stream archived pages in segment order.
+
+        Segments are read front to back with large buffered reads, so
+        throughput is bounded by disk bandwidth rather than seeks.
+
+        Args:
+            latest_only: Skip superseded page versions
+
+        Yields:
+            (player_id, text, fetch_time) tuples
+        """
+        if self._writer:
+            self._writer.flush()
+
+        for segment in self.segments():
+            with open(self.segment_path(segment), 'rb', buffering=READ_BUFFER_SIZE) as f:
+                offset = 0
+                while True:
+                    header = f.read(RECORD_HEADER.size)
+                    if len(header) < RECORD_HEADER.size:
+                        break
+
+                    magic, player_id, fetch_time, length = RECORD_HEADER.unpack(header)
+                    if magic != RECORD_MAGIC:
+                        break
+
+                    payload = f.read(length)
+                    if len(payload) < length:
+                        break
+
+                    current = self.index.get(player_id)
+                    is_latest = (
+                        current is not None
+                        and current.segment == segment
+                        and current.offset == offset
+                    )
+
+                    if is_latest or not latest_only:
+                        yield player_id, zlib.decompress(payload).decode('utf-8'), fetch_time
+
+                    offset += RECORD_HEADER.size + length
+
+    def compact(self) -> Tuple[int, int]:
+        """
+        Rewrite segments keeping only the latest version of each page.
+
+        Records are copied compressed (no recompression) into new segment
+        numbers, written under temporary names and synced. Then, with a
+        journal naming old and new segments in place, they are renamed,
+        the new index is swapped in atomically (the commit point) and only
+        then are the old segments deleted. A crash at any step leaves
+        either the old or the new archive, completed on the next open.
+
+        Returns:
+            Tuple of (versions dropped, bytes reclaimed)
+        """
+        self.close()
+
+        old_segments = self.segments()
+        old_size = sum(self.segment_path(s).stat().st_size for s in old_segments)
+        dropped = self.superseded
+
+        new_index: Dict[int, IndexEntry] = {}
+        new_segments: List[int] = []
+        out = None
+
+        try:
+            for segment in old_segments:
+                live = sorted(
+                    (e for e in self.index.values() if e.segment == segment),
+                    key=lambda e: e.offset
+                )
+                if not live:
+                    continue
+
+                with open(self.segment_path(segment), 'rb', buffering=READ_BUFFER_SIZE) as f:
+                    for entry in live:
+                        if out is None or out.tell() >= self.segment_size:
+                            if out is not None:
+                                out.flush()
+                                os.fsync(out.fileno())
+                                out.close()
+                            new_segments.append(max(old_segments + new_segments) + 1)
+                            out = open(self._compact_tmp(new_segments[-1]), 'wb')
+
+                        f.seek(entry.offset)
+                        record = f.read(RECORD_HEADER.size + entry.length)
+                        new_index[entry.player_id] = IndexEntry(
+                            entry.player_id, new_segments[-1], out.tell(),
+                            entry.length, entry.fetch_time
+                        )
+                        out.write(record)
+
+            if out is not None:
+                out.flush()
+                os.fsync(out.fileno())
+        finally:
+            if out is not None:
+                out.close()
+
+        # Swap in: journal, rename new segments, commit the index, then
+        # remove the old segments
+        self._write_durable(COMPACT_JOURNAL, json.dumps({'old': old_segments, 'new': new_segments}))
+        for segment in new_segments:
+            os.replace(self._compact_tmp(segment), self.segment_path(segment))
+        self._sync_root()
+
+        self._write_index(new_index.values())
+        self.index = new_index
+        self.superseded = 0
+
+        for segment in old_segments:
+            os.unlink(self.segment_path(segment))
+        os.unlink(self.root / COMPACT_JOURNAL)
+        self._sync_root()
+
+        self._segment = max(new_segments, default=0)
+        new_size = sum(self.segment_path(s).stat().st_size for s in self.segments())
+        return dropped, old_size - new_size
+
+    def _compact_tmp(self, segment: int) -> Path:
+        """Temporary path of a segment being written by compact()."""
+        return self.root / (_segment_name(segment) + '.tmp')
+
+    def close(self):
+        """Flush and close open segment and index files."""
+        if self._writer:
+            self.flush()
+            self._writer.close()
+            self._index_file.close()
+            self._writer = None
+            self._index_file = None
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def parse_archive(archive: PageArchive):
+    """
+    Parse every latest page in the archive, streaming.
+
+    Args:
+        archive: Open PageArchive
+
+    Yields:
+        PlayerData objects in archive order
+    """
+    from parser import parse_player_data
+
+    for player_id, text, fetch_time in archive.iter_pages():
+        try:
+            yield parse_player_data(text)
+        except Exception as e:
+            print(f"FAILED - Error parsing player {player_id}: {e}")
+
+
+def import_text_files(archive: PageArchive, file_paths: List[str]) -> int:
+    """
+    Import legacy player_<id>.txt files into the archive.
+
+    Args:
+        archive: Open PageArchive
+        file_paths: Paths of player_<id>.txt files
+
+    Returns:
+        Number of files imported
+    """
+    imported = 0
+
+    for file_path in file_paths:
+        match = re.search(r'player_(\d+)\.txt$', file_path)
+        if not match:
+            print(f"SKIP - Not a player_<id>.txt file: {file_path}")
+            continue
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+
+        archive.append(int(match.group(1)), text, fetch_time=os.path.getmtime(file_path))
+        imported += 1
+
+    return imported
+
+
+def main() -> int:
+    """
+    Archive command line: stats, compact, import, rebuild-index.
+
+    Returns:
+        0 on success, 1 on failure
+    """
+    arg_parser = argparse.ArgumentParser(description="Raw page archive tools")
+    arg_parser.add_argument('command', choices=['stats', 'compact', 'import', 'rebuild-index'])
+    arg_parser.add_argument('root', help="Archive directory")
+    arg_parser.add_argument('files', nargs='*', help="player_<id>.txt files (import)")
+    args = arg_parser.parse_args()
+
+    with PageArchive(args.root) as archive:
+        if args.command == 'import':
+            count = import_text_files(archive, args.files)
+            print(f"Import: OK - {count}/{len(args.files)} files")
+
+        elif args.command == 'compact':
+            dropped, reclaimed = archive.compact()
+            print(f"Compact: OK - dropped {dropped} versions, reclaimed {reclaimed} bytes")
+
+        elif args.command == 'rebuild-index':
+            count = archive.rebuild_index()
+            print(f"Rebuild: OK - {count} players indexed")
+
+        segments = archive.segments()
+        size = sum(archive.segment_path(s).stat().st_size for s in segments)
+        print(f"Players: {len(archive)}")
+        print(f"Segments: {len(segments)} ({size} bytes)")
+        print(f"Superseded versions: {archive.superseded}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Asyncio upload engine for Directus.
+Uploads players through a bounded in-flight window: each player's
+statistics are sent only after its player id exists, the producer is
+throttled by a bounded queue, and throughput/latency are reported.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Union
+
+from api_client import DirectusClient, player_statistics
+from rate_control import percentile
+
+
+class AsyncDirectusClient:
+    """
+    Awaitable DirectusClient.
+
+    Requests run on a dedicated thread pool sized to the concurrency
+    window and share the wrapped client's keep-alive connection pool,
+    so no extra HTTP dependency is needed.
+    """
+
+    def __init__(
+        self,
+        client: Optional[DirectusClient] = None,
+        concurrency: int = 8,
+        **client_kwargs
+    ):
+        """
+        Initialize async client.
+
+        Args:
+            client: DirectusClient to wrap (default: new client with pool_size=concurrency);
+                its pool_size should be at least concurrency
+            concurrency: Maximum requests in flight
+            **client_kwargs: Passed to DirectusClient when creating one
+        """
+        self.concurrency = concurrency
+        self._owns_client = client is None
+        self.client = client or DirectusClient(pool_size=concurrency, **client_kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='directus')
+
+    async def _call(self, func, *args):
+        """Run a blocking client call on the request thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def create_player(self, player_data: Dict[str, Any]) -> Optional[int]:
+        """Create a player record. See DirectusClient.create_player."""
+        return await self._call(self.client.create_player, player_data)
+
+    async def create_statistics(self, player_id: int, statistics: List[Dict[str, Any]]) -> bool:
+        """Create statistics for a player. See DirectusClient.create_statistics."""
+        return await self._call(self.client.create_statistics, player_id, statistics)
+
+    async def get_player_by_name(self, name: str) -> Optional[Dict]:
+        """Find player by name (cached, coalesced). See DirectusClient.get_player_by_name."""
+        return await self._call(self.client.get_player_by_name, name)
+
+    async def upload_player(self, player_data) -> bool:
+        """
+        Upload one PlayerData: player first, then its statistics.
+
+        Args:
+            player_data: PlayerData object
+
+        Returns:
+            True if the player and its statistics were created
+        """
+        player_id = await self.create_player(player_data.player.to_dict())
+        if not player_id:
+            return False
+
+        stats = player_statistics(player_data)
+        if stats and not await self.create_statistics(player_id, stats):
+            print(f"Warning: Failed to upload stats for {player_data.player.name}")
+            return False
+
+        return True
+
+    def close(self):
+        """Shut down the thread pool and close the client if we created it."""
+        self._executor.shutdown(wait=True)
+        if self._owns_client:
+            self.client.close()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        self.close()
+
+
+@dataclass
+class UploadReport:
+    """Throughput and latency of an upload run."""
+    uploaded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    concurrency: int = 0
+    latencies: List[float] = field(default_factory=list)
+    failed_names: List[str] = field(default_factory=list)
+    max_queue_depth: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Players per second."""
+        return (self.uploaded + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'uploaded': self.uploaded,
+            'failed': self.failed,
+            'elapsed': round(self.elapsed, 4),
+            'concurrency': self.concurrency,
+            'players_per_sec': round(self.throughput, 2),
+            'latency_p50': round(percentile(self.latencies, 50), 4),
+            'latency_p95': round(percentile(self.latencies, 95), 4),
+            'latency_p99': round(percentile(self.latencies, 99), 4),
+            'max_queue_depth': self.max_queue_depth,
+            'failed_names': self.failed_names
+        }
+
+
+async def upload_players_async(
+    players: Union[Iterable, AsyncIterable],
+    client: AsyncDirectusClient,
+    queue_size: Optional[int] = None
+) -> UploadReport:
+    """
+    Upload players with client.concurrency players in flight.
+
+    The producer feeds a bounded queue, so a fast producer (e.g. a
+    streaming parser) blocks instead of buffering the whole corpus.
+
+    Args:
+        players: Iterable or async iterable of PlayerData
+        client: AsyncDirectusClient instance
+        queue_size: Queue bound (default: 2 * concurrency)
+
+    Returns:
+        UploadReport with counts, throughput and per-player latency
+    """
+    concurrency = client.concurrency
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or 2 * concurrency)
+    report = UploadReport(concurrency=concurrency)
+    done = object()
+
+    async def produce():
+        if hasattr(players, '__aiter__'):
+            async for player_data in players:
+                await queue.put(player_data)
+                report.max_queue_depth = max(report.max_queue_depth, queue.qsize())
+        else:
+            for player_data in players:
+                await queue.put(player_data)
+                report.max_queue_depth = max(report.max_queue_depth, queue.qsize())
+
+        for _ in range(concurrency):
+            await queue.put(done)
+
+    async def work():
+        while True:
+            player_data = await queue.get()
+            if player_data is done:
+                return
+
+            start = time.perf_counter()
+            try:
+                ok = await client.upload_player(player_data)
+            except Exception as e:
+                print(f"FAILED - {player_data.player.name}: {e}")
+                ok = False
+            report.latencies.append(time.perf_counter() - start)
+
+            if ok:
+                report.uploaded += 1
+            else:
+                report.failed += 1
+                report.failed_names.append(player_data.player.name)
+
+    start = time.perf_counter()
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    report.elapsed = time.perf_counter() - start
+
+    return report
+
+
+def run_async_upload(
+    players: Iterable,
+    concurrency: int = 8,
+    client: Optional[DirectusClient] = None
+) -> UploadReport:
+    """
+    Upload players with the async engine from synchronous code.
+
+    Args:
+        players: Iterable of PlayerData
+        concurrency: Players in flight
+        client: DirectusClient to reuse (default: from environment)
+
+    Returns:
+        UploadReport
+    """
+    async def run():
+        async with AsyncDirectusClient(client, concurrency=concurrency) as async_client:
+            return await upload_players_async(players, async_client)
+
+    return asyncio.run(run())
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Upload benchmarks for api_client against the local mock Directus server.
+Run with: python bench_api.py [player_count] [--json results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import requests
+
+from api_client import (
+    DirectusClient, encode_body, iter_json_rows, player_statistics,
+    upload_player_data, upload_players_batch
+)
+from async_upload import run_async_upload
+from mock_directus import MockDirectusServer
+from models import Player, PlayerData, Season
+from outbox import Outbox, drain_outbox
+from sync import sync_players
+
+
+class FreshConnectionSession:
+    """
+    Session stand-in that opens a new connection per request.
+
+    Reproduces the old module-level requests.get/post behavior.
+    """
+
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return requests.request(method, url, headers=self.headers, **kwargs)
+
+    def close(self):
+        pass
+
+
+def make_players(count: int, seasons: int = 15) -> List[PlayerData]:
+    """
+    Build synthetic players.
+
+    Args:
+        count: Number of players
+        seasons: Season rows per player
+
+    Returns:
+        List of PlayerData objects
+    """
+    players = []
+
+    for i in range(count):
+        player = Player(
+            name=f"Player {i:05d}",
+            position="Center -- shoots L",
+            birth_date=f"Jan {i % 28 + 1} {1970 + i % 35}",
+            birth_place="Test City, ONT"
+        )
+        rows = [
+            Season(
+                season=f"{2000 + s}-{(s + 1) % 100:02d}",
+                team="Test Team",
+                league="NHL",
+                gp=82, g=s, a=2 * s, pts=3 * s, pim=10,
+                plus_minus=str(s - 5)
+            )
+            for s in range(seasons)
+        ]
+        players.append(PlayerData(player=player, seasons=rows))
+
+    return players
+
+
+def upload_sequential(players: List[PlayerData], client: DirectusClient):
+    """Upload players one at a time (two requests per player)."""
+    for player_data in players:
+        upload_player_data(player_data, client)
+
+
+def upload_batch(players: List[PlayerData], client: DirectusClient, chunk_size: int = 100):
+    """Upload players with chunked batch requests."""
+    upload_players_batch(players, client, chunk_size=chunk_size)
+
+
+def upload_async(players: List[PlayerData], client: DirectusClient, concurrency: int = 8):
+    """Upload players with the async engine."""
+    run_async_upload(players, concurrency=concurrency, client=client)
+
+
+def upload_sync(players: List[PlayerData], client: DirectusClient):
+    """Upload players with a diff-based sync (from empty)."""
+    sync_players(players, client)
+
+
+def upload_outbox(players: List[PlayerData], client: DirectusClient):
+    """Queue players in a temporary outbox and drain it until empty."""
+    with tempfile.TemporaryDirectory() as root:
+        with Outbox(Path(root) / 'outbox.db', backoff_base=0) as outbox:
+            outbox.enqueue_many(players)
+            while outbox.pending() and drain_outbox(outbox, client).batches:
+                pass
+
+
+def run_upload(
+    client: DirectusClient,
+    server: MockDirectusServer,
+    players: List[PlayerData],
+    upload=upload_sequential
+) -> Dict:
+    """
+    Upload players with the given upload function and measure.
+
+    Returns:
+        Dictionary with elapsed time, request, connection, error and
+        stored record counts, and request bytes
+    """
+    server.state.reset()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        upload(players, client)
+    elapsed = time.perf_counter() - start
+
+    metrics = server.state.metrics()
+    requests_made = metrics['requests']
+    return {
+        'elapsed': elapsed,
+        'requests': requests_made,
+        'connections': metrics['connections'],
+        'errors': sum(n for status, n in metrics['statuses'].items() if status >= 400),
+        'rate_limited': metrics['rate_limited'],
+        'stored': len(server.items('players')),
+        'bytes_sent': metrics['bytes_received'],
+        'per_request_ms': elapsed / max(requests_made, 1) * 1000,
+        'records_per_sec': len(players) / elapsed if elapsed else 0.0
+    }
+
+
+def bench_connection_pooling(count: int) -> Dict[str, Dict]:
+    """
+    Compare fresh connection per request against the pooled session.
+
+    Args:
+        count: Number of players to upload
+
+    Returns:
+        Results keyed by mode
+    """
+    players = make_players(count)
+    results = {}
+
+    with MockDirectusServer() as server:
+        client = DirectusClient(api_url=server.url, token=server.token)
+
+        legacy = DirectusClient(api_url=server.url, token=server.token)
+        legacy.session = FreshConnectionSession(legacy.headers)
+
+        results['fresh_connection'] = run_upload(legacy, server, players)
+        results['pooled_session'] = run_upload(client, server, players)
+
+        client.close()
+
+    return results
+
+
+def bench_batch_upload(count: int, chunk_sizes: tuple = (10, 50, 100)) -> Dict[str, Dict]:
+    """
+    Compare per-player upload against chunked batch upload.
+
+    Args:
+        count: Number of players to upload
+        chunk_sizes: Batch chunk sizes to try
+
+    Returns:
+        Results keyed by mode
+    """
+    players = make_players(count)
+    results = {}
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            results['per_player'] = run_upload(client, server, players)
+
+            for size in chunk_sizes:
+                results[f'batch_{size}'] = run_upload(
+                    client, server, players,
+                    upload=lambda p, c, size=size: upload_batch(p, c, chunk_size=size)
+                )
+
+            results['bulk_create'] = run_upload(
+                client, server, players,
+                upload=lambda p, c: c.bulk_create_players([x.player.to_dict() for x in p])
+            )
+            results['sync'] = run_upload(client, server, players, upload=upload_sync)
+            results['outbox'] = run_upload(client, server, players, upload=upload_outbox)
+
+    return results
+
+
+def bench_faults(
+    count: int,
+    error_rate: float = 0.05,
+    rate_limit: float = 0.0,
+    burst: int = 20,
+    latency: float = 0.0,
+    seed: int = 1
+) -> Dict[str, Dict]:
+    """
+    Run every upload path against a server injecting errors and/or rate limits.
+
+    'stored' shows how many players each path got in despite failures;
+    'errors' counts non-2xx responses the server sent.
+
+    Args:
+        count: Number of players to upload
+        error_rate: Fraction of requests answered 503
+        rate_limit: Server requests per second (0 = unlimited)
+        burst: Rate limit bucket size
+        latency: Simulated server latency per request in seconds
+        seed: Random seed for error injection
+
+    Returns:
+        Results keyed by mode
+    """
+    players = make_players(count)
+    results = {}
+
+    with MockDirectusServer(
+        latency=latency, error_rate=error_rate, rate_limit=rate_limit, burst=burst, seed=seed
+    ) as server:
+        with DirectusClient(api_url=server.url, token=server.token, pool_size=8, backoff_factor=0.01) as client:
+            uploads = {
+                'per_player': upload_sequential,
+                'batch_100': upload_batch,
+                'async_8': upload_async,
+                'sync': upload_sync,
+                'outbox': upload_outbox
+            }
+            for mode, upload in uploads.items():
+                results[mode] = run_upload(client, server, players, upload=upload)
+
+    return results
+
+
+def bench_async_upload(
+    count: int,
+    latency: float = 0.02,
+    windows: tuple = (1, 4, 16, 32)
+) -> Dict[str, Dict]:
+    """
+    Compare async upload windows against a server with simulated latency.
+
+    Args:
+        count: Number of players to upload
+        latency: Simulated server latency per request in seconds
+        windows: Concurrency windows to try
+
+    Returns:
+        Results keyed by mode
+    """
+    players = make_players(count)
+    results = {}
+
+    with MockDirectusServer(latency=latency) as server:
+        with DirectusClient(api_url=server.url, token=server.token, pool_size=max(windows)) as client:
+            results['sequential'] = run_upload(client, server, players)
+
+            for window in windows:
+                report = {}
+                results[f'async_{window}'] = run_upload(
+                    client, server, players,
+                    upload=lambda p, c, w=window: report.update(
+                        run_async_upload(p, concurrency=w, client=c).to_dict()
+                    )
+                )
+                results[f'async_{window}']['latency_p95'] = report['latency_p95']
+
+    return results
+
+
+def encode_legacy(groups: List[tuple]) -> bytes:
+    """Old statistics body: copy every row to add player_id, dump, encode."""
+    rows = []
+    for player_id, stats in groups:
+        rows.extend({**stat, 'player_id': player_id} for stat in stats)
+    return json.dumps(rows).encode('utf-8')
+
+
+def bench_payload_encoding(
+    count: int,
+    seasons: int = 25,
+    players_per_request: int = 20,
+    repeat: int = 5
+) -> Dict[str, Dict]:
+    """
+    Compare statistics request bodies: legacy copy+dumps against streamed
+    encoding, with and without gzip.
+
+    Client CPU (best of repeat) and peak memory are measured on the
+    encoding alone (the mock server shares this process); wire bytes are
+    what the server received.
+
+    Args:
+        count: Number of players
+        seasons: Season rows per player
+        players_per_request: Players whose statistics share one request
+        repeat: Encoding repetitions for CPU timing
+
+    Returns:
+        Results keyed by mode
+    """
+    players = make_players(count, seasons=seasons)
+    stats = [player_statistics(p) for p in players]
+    results = {}
+
+    modes = {
+        'legacy': (lambda g: encode_legacy(g), False),
+        'streamed': (lambda g: encode_body(iter_json_rows(g)), False),
+        'streamed_gzip': (lambda g: encode_body(iter_json_rows(g), compress=True), True)
+    }
+
+    with MockDirectusServer() as server:
+        for mode, (encode, compress) in modes.items():
+            with DirectusClient(api_url=server.url, token=server.token, compress=compress) as client:
+                player_ids = client.create_players([p.player.to_dict() for p in players])
+                groups = list(zip(player_ids, stats))
+                batches = [
+                    groups[i:i + players_per_request]
+                    for i in range(0, len(groups), players_per_request)
+                ]
+
+                cpu = float('inf')
+                for _ in range(repeat):
+                    started = time.process_time()
+                    for batch in batches:
+                        encode(batch)
+                    cpu = min(cpu, time.process_time() - started)
+
+                tracemalloc.start()
+                encode(batches[0])
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                server.state.reset()
+                start = time.perf_counter()
+                for batch in batches:
+                    if mode == 'legacy':
+                        client.create_statistics_rows(
+                            [{**stat, 'player_id': pid} for pid, rows in batch for stat in rows]
+                        )
+                    else:
+                        client.create_statistics_groups(batch)
+                elapsed = time.perf_counter() - start
+
+                metrics = server.state.metrics()
+                results[mode] = {
+                    'elapsed': elapsed,
+                    'requests': metrics['requests'],
+                    'rows': len(server.items('statistics')),
+                    'bytes_sent': metrics['bytes_received'],
+                    'encode_cpu_ms': cpu * 1000,
+                    'encode_peak_kb': peak / 1024
+                }
+
+    return results
+
+
+def print_encoding_results(title: str, results: Dict[str, Dict]):
+    """Print payload encoding results table (ASCII only)."""
+    print(f"\n=== {title} ===")
+    print(
+        f"{'mode':<14} {'rows':>7} {'requests':>9} {'wire bytes':>12} {'ratio':>7}"
+        f" {'encode ms':>10} {'peak KB':>8} {'time(s)':>8}"
+    )
+
+    base = results.get('legacy', {}).get('bytes_sent') or 1
+    for mode, r in results.items():
+        print(
+            f"{mode:<14} {r['rows']:>7} {r['requests']:>9} {r['bytes_sent']:>12}"
+            f" {r['bytes_sent'] / base:>7.3f} {r['encode_cpu_ms']:>10.1f} {r['encode_peak_kb']:>8.0f}"
+            f" {r['elapsed']:>8.2f}"
+        )
+
+
+def print_results(title: str, results: Dict[str, Dict]):
+    """Print benchmark results table (ASCII only)."""
+    print(f"\n=== {title} ===")
+    print(
+        f"{'mode':<14} {'time(s)':>8} {'requests':>9} {'conns':>6} {'errors':>7}"
+        f" {'stored':>7} {'ms/req':>8} {'rec/s':>9}"
+    )
+
+    for mode, r in results.items():
+        print(
+            f"{mode:<14} {r['elapsed']:>8.2f} {r['requests']:>9} {r['connections']:>6} {r['errors']:>7}"
+            f" {r['stored']:>7} {r['per_request_ms']:>8.2f} {r['records_per_sec']:>9.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run benchmarks."""
+    arg_parser = argparse.ArgumentParser(description="Directus upload benchmarks (mock server)")
+    arg_parser.add_argument('count', type=int, nargs='?', default=1000, help="Players per run")
+    arg_parser.add_argument('--json', metavar='PATH', help="Also write results as JSON")
+    args = arg_parser.parse_args(argv)
+    count = args.count
+
+    suites = [
+        (f"CONNECTION POOLING ({count} players)", bench_connection_pooling(count)),
+        (f"BATCH UPLOAD ({count} players)", bench_batch_upload(count)),
+        (f"ASYNC UPLOAD, 20ms SERVER LATENCY ({count} players)", bench_async_upload(count)),
+        (f"5% INJECTED 503s ({count} players)", bench_faults(count, error_rate=0.05)),
+        (
+            f"RATE LIMIT 200 req/s ({count // 5} players)",
+            bench_faults(count // 5, error_rate=0.0, rate_limit=200.0)
+        )
+    ]
+
+    for title, results in suites:
+        print_results(title, results)
+
+    encoding_title = f"STATISTICS PAYLOAD ENCODING ({count // 5} players x 25 seasons)"
+    encoding = bench_payload_encoding(count // 5)
+    print_encoding_results(encoding_title, encoding)
+    suites.append((encoding_title, encoding))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({title: results for title, results in suites}, f, indent=2)
+        print(f"\nResults: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Startup benchmarks: import time of pipeline.py per kind of run, measured
+with `python -X importtime` in fresh interpreters.
+Run with: python bench_startup.py [--repeat N] [--json results.json]
+"""
+import argparse
+import importlib.util
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HERE = Path(__file__).resolve().parent
+
+# Third-party packages that only the scrape and upload stages need
+HEAVY_PACKAGES = ('selenium', 'webdriver_manager', 'requests', 'urllib3')
+
+
+def _scenarios() -> Dict[str, List[str]]:
+    """Module lists imported by each kind of run."""
+    eager = ['pipeline', 'api_client', 'sync', 'outbox', 'build_graph', 'profiling']
+    if importlib.util.find_spec('selenium') is not None:
+        eager.append('scraper')
+
+    return {
+        'parse-only': ['pipeline'],
+        'upload': ['pipeline', 'api_client', 'sync'],
+        'eager (all stages)': eager
+    }
+
+
+def measure_imports(modules: List[str]) -> Dict[str, object]:
+    """
+    Import modules in a fresh interpreter under -X importtime.
+
+    Args:
+        modules: Module names to import (from this directory)
+
+    Returns:
+        Dictionary with total import microseconds, wall seconds, the
+        slowest top-level imports and heavy packages loaded
+    """
+    code = (
+        f"import sys; sys.path.insert(0, {str(HERE)!r}); "
+        f"import {', '.join(modules)}; "
+        f"print(','.join(m for m in {HEAVY_PACKAGES!r} if m in sys.modules))"
+    )
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=str(HERE)
+    )
+    wall = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # "import time: self [us] | cumulative | imported package"
+    top_level = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            top_level[name.strip()] = int(cumulative)
+
+    ours = {name: us for name, us in top_level.items() if name in modules}
+    return {
+        'import_us': sum(ours.values()),
+        'wall': wall,
+        'slowest': sorted(ours.items(), key=lambda item: item[1], reverse=True)[:5],
+        'heavy': [name for name in result.stdout.strip().split(',') if name]
+    }
+
+
+def bench_startup(repeat: int = 5) -> Dict[str, Dict[str, object]]:
+    """
+    Median import time and interpreter wall time per scenario.
+
+    Args:
+        repeat: Fresh interpreters per scenario
+
+    Returns:
+        Dictionary of scenario -> results
+    """
+    results = {}
+    for name, modules in _scenarios().items():
+        runs = [measure_imports(modules) for _ in range(repeat)]
+        results[name] = {
+            'modules': modules,
+            'import_ms': round(statistics.median(r['import_us'] for r in runs) / 1000, 2),
+            'wall_ms': round(statistics.median(r['wall'] for r in runs) * 1000, 1),
+            'heavy': runs[0]['heavy'],
+            'slowest': [(module, round(us / 1000, 2)) for module, us in runs[-1]['slowest']]
+        }
+    return results
+
+
+def print_startup_results(results: Dict[str, Dict[str, object]]):
+    """Print results table (ASCII only)."""
+    print("\n=== STARTUP (python -X importtime, median) ===")
+    print(f"{'scenario':<20} {'import ms':>10} {'wall ms':>9}  heavy packages loaded")
+    for name, r in results.items():
+        print(f"{name:<20} {r['import_ms']:>10.2f} {r['wall_ms']:>9.1f}  {', '.join(r['heavy']) or '-'}")
+
+    baseline = results.get('eager (all stages)')
+    parse_only = results.get('parse-only')
+    if baseline and parse_only and baseline['import_ms']:
+        ratio = parse_only['import_ms'] / baseline['import_ms']
+        print(f"\nParse-only import time: {ratio:.0%} of eager")
+
+    for name, r in results.items():
+        slowest = ', '.join(f"{module} {ms:.1f}ms" for module, ms in r['slowest'])
+        print(f"  {name}: {slowest}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run benchmarks."""
+    arg_parser = argparse.ArgumentParser(description="pipeline.py startup benchmarks")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per scenario")
+    arg_parser.add_argument('--json', metavar='PATH', help="Also write results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    results = bench_startup(args.repeat)
+    print_startup_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
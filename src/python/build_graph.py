@@ -0,0 +1,461 @@
+"""
+Incremental build graph for the data pipeline:
+
+    raw page -> parsed record -> JSON shard -> uploaded record
+
+Each node is fingerprinted by the content hash of its input and the
+version (source hash) of the code that builds it. A run rebuilds only
+nodes whose fingerprint changed or whose output went missing, and
+reports how much time the skipped nodes would have cost.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models import PlayerData
+from parser import parse_player_data
+from export import update_players
+from shards import DATA_DIR, assign_slugs, content_hash
+
+# Node kinds, in build order
+PARSE = 'parse'
+SHARD = 'shard'
+UPLOAD = 'upload'
+KINDS = (PARSE, SHARD, UPLOAD)
+
+_HERE = Path(__file__).resolve().parent
+
+# Source files each kind of node depends on
+CODE_FILES = {
+    PARSE: ('parser.py', 'models.py'),
+    SHARD: ('export.py', 'shards.py', 'models.py'),
+    UPLOAD: ('api_client.py', 'sync.py', 'models.py')
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    output TEXT,
+    output_hash TEXT,
+    duration REAL NOT NULL DEFAULT 0,
+    built REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_kind ON nodes (kind);
+"""
+
+
+def code_version(kind: str) -> str:
+    """
+    Hash of the source files that build a kind of node.
+
+    Args:
+        kind: PARSE, SHARD or UPLOAD
+
+    Returns:
+        Short SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for name in CODE_FILES[kind]:
+        digest.update(name.encode('utf-8'))
+        digest.update((_HERE / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class NodeRecord:
+    """Last successful build of a node."""
+    key: str
+    kind: str
+    input_hash: str
+    code_version: str
+    output: Optional[str]
+    output_hash: Optional[str]
+    duration: float
+
+
+@dataclass
+class BuildReport:
+    """What a run built, skipped and saved."""
+    dry_run: bool = False
+    built: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+    skipped: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+    rebuilt: List[Tuple[str, str]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    time_spent: float = 0.0
+    time_saved: float = 0.0
+    manifest_written: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True if every stale node was rebuilt."""
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'dry_run': self.dry_run,
+            'built': self.built,
+            'skipped': self.skipped,
+            'rebuilt': [{'key': key, 'reason': reason} for key, reason in self.rebuilt],
+            'removed': self.removed,
+            'errors': self.errors,
+            'time_spent': round(self.time_spent, 4),
+            'time_saved': round(self.time_saved, 4),
+            'manifest_written': self.manifest_written
+        }
+
+
+class BuildState:
+    """SQLite store of node fingerprints and outputs."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the state database.
+
+        Args:
+            path: Database file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+    def get(self, key: str) -> Optional[NodeRecord]:
+        """Stored record for key, or None."""
+        row = self.conn.execute(
+            "SELECT key, kind, input_hash, code_version, output, output_hash, duration"
+            " FROM nodes WHERE key = ?", (key,)
+        ).fetchone()
+        return NodeRecord(*row) if row else None
+
+    def put(self, record: NodeRecord):
+        """Insert or replace a node record."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO nodes"
+                " (key, kind, input_hash, code_version, output, output_hash, duration, built)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (record.key, record.kind, record.input_hash, record.code_version,
+                 record.output, record.output_hash, record.duration, time.time())
+            )
+
+    def keys(self, kind: str) -> List[str]:
+        """All stored keys of a kind."""
+        return [row[0] for row in self.conn.execute("SELECT key FROM nodes WHERE kind = ?", (kind,))]
+
+    def delete(self, keys: Iterable[str]):
+        """Forget nodes."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM nodes WHERE key = ?", [(key,) for key in keys])
+
+    def close(self):
+        """Close the database."""
+        self.conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class BuildGraph:
+    """Decides which nodes are stale and records rebuilt ones."""
+
+    def __init__(self, state: BuildState, dry_run: bool = False):
+        """
+        Initialize graph.
+
+        Args:
+            state: Fingerprint store
+            dry_run: Report stale nodes without building or recording them
+        """
+        self.state = state
+        self.dry_run = dry_run
+        self.report = BuildReport(dry_run=dry_run)
+        self.versions = {kind: code_version(kind) for kind in KINDS}
+
+    def check(
+        self,
+        key: str,
+        kind: str,
+        input_hash: str,
+        output_ok: Optional[Callable[[NodeRecord], bool]] = None
+    ) -> Tuple[Optional[NodeRecord], Optional[str]]:
+        """
+        Compare a node against its last build.
+
+        Args:
+            key: Node key (e.g. 'shard:kadri')
+            kind: Node kind
+            input_hash: Content hash of the node's input
+            output_ok: Verifies the built output still exists
+
+        Returns:
+            (stored record, reason it is stale or None if fresh)
+        """
+        record = self.state.get(key)
+        if record is None:
+            return None, 'new'
+        if record.input_hash != input_hash:
+            return record, 'input changed'
+        if record.code_version != self.versions[kind]:
+            return record, 'code changed'
+        if output_ok is not None and not output_ok(record):
+            return record, 'output missing'
+        return record, None
+
+    def skip(self, record: NodeRecord):
+        """Count a fresh node and the time it saved."""
+        self.report.skipped[record.kind] += 1
+        self.report.time_saved += record.duration
+
+    def record(
+        self,
+        key: str,
+        kind: str,
+        input_hash: str,
+        reason: str,
+        duration: float,
+        output: Optional[str] = None,
+        output_hash: Optional[str] = None
+    ) -> NodeRecord:
+        """Count a rebuilt node and store its new fingerprint (unless dry run)."""
+        self.report.built[kind] += 1
+        self.report.rebuilt.append((key, reason))
+        self.report.time_spent += duration
+
+        record = NodeRecord(key, kind, input_hash, self.versions[kind], output, output_hash, duration)
+        if not self.dry_run:
+            self.state.put(record)
+        return record
+
+    def node(
+        self,
+        key: str,
+        kind: str,
+        input_hash: str,
+        build: Callable[[], Tuple[Optional[str], Optional[str]]],
+        output_ok: Optional[Callable[[NodeRecord], bool]] = None
+    ) -> NodeRecord:
+        """
+        Return a fresh node, rebuilding it if stale.
+
+        Args:
+            key: Node key
+            kind: Node kind
+            input_hash: Content hash of the node's input
+            build: Builds the node, returning (output, output_hash)
+            output_ok: Verifies the built output still exists
+
+        Returns:
+            Stored or rebuilt NodeRecord
+        """
+        record, reason = self.check(key, kind, input_hash, output_ok)
+        if reason is None:
+            self.skip(record)
+            return record
+
+        start = time.perf_counter()
+        output, output_hash = build()
+        return self.record(key, kind, input_hash, reason, time.perf_counter() - start, output, output_hash)
+
+
+def _read_manifest(path: Path) -> dict:
+    """Parsed manifest.json, or {} if there is none yet."""
+    return json.loads(path.read_text(encoding='utf-8')) if path.exists() else {}
+
+
+def run_incremental(
+    pages: Iterable[str],
+    data_dir: Optional[str] = None,
+    state_path: str = 'build_state.db',
+    client=None,
+    dry_run: bool = False,
+    workers: Optional[int] = 1
+) -> BuildReport:
+    """
+    Bring shards, manifest and (optionally) Directus up to date with pages.
+
+    Only stale shards are written, with export.update_players: their
+    entries are merged into the existing manifest, and the options the
+    data directory was last exported with (bundles, hashed names, name
+    indexes, compression) are kept. Each shard node records its own
+    export time; each upload node is recorded unless one of its
+    player's writes failed (the sync reads only those players' remote
+    records).
+
+    Args:
+        pages: Raw player page texts
+        data_dir: Game data directory holding manifest.json and players/
+            (default: src/data)
+        state_path: Build state database
+        client: DirectusClient for the upload nodes (None skips uploads)
+        dry_run: List stale nodes without writing files or uploading
+        workers: Export worker processes when shards are stale (None:
+            CPU count)
+
+    Returns:
+        BuildReport
+    """
+    data_dir = Path(data_dir) if data_dir is not None else DATA_DIR
+    players_dir = data_dir / 'players'
+
+    with BuildState(state_path) as state:
+        graph = BuildGraph(state, dry_run=dry_run)
+        report = graph.report
+
+        # raw page -> parsed record (content addressed, so order and
+        # position of a page in its source do not matter)
+        parsed: List[Tuple[PlayerData, str]] = []
+        for text in pages:
+            raw_hash = content_hash(text)
+
+            def build_parse(text=text):
+                player_data = parse_player_data(text)
+                if not player_data.player.name or player_data.player.name == "Unknown":
+                    return None, None
+                output = json.dumps(player_data.to_shard_dict(), separators=(',', ':'), ensure_ascii=False)
+                return output, content_hash(output)
+
+            try:
+                record = graph.node(f'{PARSE}:{raw_hash[:16]}', PARSE, raw_hash, build_parse)
+            except Exception as e:
+                report.errors.append(f"{PARSE}:{raw_hash[:16]}: {type(e).__name__}: {e}")
+                continue
+
+            if record.output:
+                parsed.append((PlayerData.from_shard_dict(json.loads(record.output)), record.output_hash))
+
+        # parsed record -> JSON shard. Stale shards are merged in by the
+        # exporter, which keeps the manifest's hashes, bundles and name
+        # indexes in step; a shard is fresh only while its file holds
+        # the recorded content and the manifest lists it
+        slugs = assign_slugs([player for player, _ in parsed])
+        manifest_path = data_dir / 'manifest.json'
+        listed = {entry.get('id'): entry for entry in _read_manifest(manifest_path).get('players', [])}
+
+        def shard_ok(record, slug):
+            path = players_dir / (record.output or f'{slug}.json')
+            return (
+                slug in listed and path.exists()
+                and content_hash(path.read_text(encoding='utf-8')) == record.output_hash
+            )
+
+        stale_shards = []
+        for (_, parsed_hash), slug in zip(parsed, slugs):
+            key = f'{SHARD}:{slug}'
+            record, reason = graph.check(key, SHARD, parsed_hash, lambda record, slug=slug: shard_ok(record, slug))
+            if reason is None:
+                graph.skip(record)
+            else:
+                stale_shards.append((key, slug, parsed_hash, reason))
+
+        # Shards built earlier whose pages are gone; hand-made shards are kept
+        current = {f'{SHARD}:{slug}' for slug in slugs}
+        stale = [key for key in state.keys(SHARD) if key not in current]
+        report.removed.extend(stale)
+
+        if dry_run:
+            for key, _, parsed_hash, reason in stale_shards:
+                graph.record(key, SHARD, parsed_hash, reason, 0.0)
+        elif stale_shards or stale:
+            by_slug = {slug: player for (player, _), slug in zip(parsed, slugs)}
+            try:
+                export_report = update_players(
+                    [(slug, by_slug[slug]) for _, slug, _, _ in stale_shards], data_dir=str(data_dir),
+                    workers=workers, drop=[key.split(':', 1)[1] for key in stale],
+                    indexed=list(by_slug.items())
+                )
+            except (OSError, ValueError) as e:
+                report.errors.append(f"{SHARD}: {type(e).__name__}: {e}")
+            else:
+                report.errors.extend(f"{SHARD}:{error}" for error in export_report.errors)
+                report.manifest_written = export_report.manifest_written
+
+                # Failed shards are missing from the manifest and stay stale
+                listed = {entry.get('id'): entry for entry in _read_manifest(manifest_path).get('players', [])}
+                for key, slug, parsed_hash, reason in stale_shards:
+                    entry = listed.get(slug)
+                    if entry and entry.get('hash'):
+                        graph.record(
+                            key, SHARD, parsed_hash, reason, export_report.shard_seconds.get(slug, 0.0),
+                            entry['file'][len('players/'):], entry['hash']
+                        )
+
+                state.delete(stale)
+                state.delete(f'{UPLOAD}:{key.split(":", 1)[1]}' for key in stale)
+
+        # parsed record -> uploaded record (one sync for all stale players)
+        if client is not None:
+            stale_uploads = []
+            for (player, parsed_hash), slug in zip(parsed, slugs):
+                key = f'{UPLOAD}:{slug}'
+                record, reason = graph.check(key, UPLOAD, parsed_hash)
+                if reason is None:
+                    graph.skip(record)
+                else:
+                    stale_uploads.append((key, parsed_hash, reason, player))
+
+            if dry_run:
+                for key, parsed_hash, reason, _ in stale_uploads:
+                    graph.record(key, UPLOAD, parsed_hash, reason, 0.0)
+            elif stale_uploads:
+                from sync import player_key, sync_players
+
+                start = time.perf_counter()
+                sync_report = sync_players([player for *_, player in stale_uploads], client, scoped=True)
+                share = (time.perf_counter() - start) / len(stale_uploads)
+                report.errors.extend(f"{UPLOAD}: {error}" for error in sync_report.errors)
+
+                # Players whose writes all went through are not uploaded again
+                for key, parsed_hash, reason, player in stale_uploads:
+                    if sync_report.player_ok(player_key(player.player.to_dict())):
+                        graph.record(key, UPLOAD, parsed_hash, reason, share)
+
+        return report
+
+
+def print_build_report(report: BuildReport, limit: int = 20):
+    """Print built/skipped counts, rebuilt nodes and time saved (ASCII only)."""
+    title = "BUILD PLAN (dry run)" if report.dry_run else "INCREMENTAL BUILD"
+    print(f"\n=== {title} ===")
+    print(f"{'node':<8} {'rebuild' if report.dry_run else 'built':>8} {'fresh':>8}")
+    for kind in KINDS:
+        print(f"{kind:<8} {report.built[kind]:>8} {report.skipped[kind]:>8}")
+
+    for key, reason in report.rebuilt[:limit]:
+        print(f"  {'would rebuild' if report.dry_run else 'rebuilt'} {key} ({reason})")
+    if len(report.rebuilt) > limit:
+        print(f"  ... {len(report.rebuilt) - limit} more")
+    for key in report.removed[:limit]:
+        print(f"  {'would remove' if report.dry_run else 'removed'} {key}")
+    for error in report.errors:
+        print(f"FAILED - {error}")
+
+    if not report.dry_run:
+        print(f"Time spent: {report.time_spent:.2f}s")
+    print(f"Time saved: {report.time_saved:.2f}s (last build time of fresh nodes)")
+
+
+if __name__ == "__main__":
+    # Example usage: plan a build of the sample data file without writing
+    import tempfile
+    from parser import split_player_sections
+
+    sample = _HERE.parent.parent / 'archive' / 'data_player.txt'
+    if sample.exists():
+        pages = split_player_sections(sample.read_text(encoding='utf-8'))
+        with tempfile.TemporaryDirectory() as root:
+            print_build_report(run_incremental(pages, data_dir=root, state_path=f"{root}/state.db"))
+            print_build_report(run_incremental(pages, data_dir=root, state_path=f"{root}/state.db"))
@@ -0,0 +1,416 @@
+"""
+Player ID discovery crawler for HockeyDB roster pages.
+Walks team/season roster pages, extracts player IDs and queues them
+in a prioritized frontier that feeds the scraper.
+"""
+import hashlib
+import heapq
+import math
+import re
+import time
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urldefrag
+
+import requests
+
+from rate_control import AdaptiveRateController, parse_retry_after
+
+
+# Player pages: ".../ihdb/stats/pdisplay.php?pid=96607"
+PLAYER_LINK_RE = re.compile(r'pdisplay\.php\?pid=(\d+)')
+
+# Team/season roster and league season pages
+ROSTER_LINK_RE = re.compile(
+    r'href=["\']([^"\']*(?:/stte/|/ihdb/stats/leagues/|roster)[^"\']*)["\']',
+    re.IGNORECASE
+)
+
+
+class IdBitmap:
+    """
+    Compact seen-set over the numeric player ID space.
+
+    One bit per ID: 10 million IDs fit in 1.25 MB. Grows on demand.
+    """
+
+    def __init__(self, max_id: int = 1_000_000):
+        """
+        Initialize bitmap.
+
+        Args:
+            max_id: Initial highest ID covered (bitmap grows past it)
+        """
+        self._bits = bytearray(max_id // 8 + 1)
+        self._count = 0
+
+    def _ensure(self, value: int):
+        """Grow the bitmap to cover value."""
+        needed = value // 8 + 1
+        if needed > len(self._bits):
+            self._bits.extend(bytes(max(needed - len(self._bits), len(self._bits))))
+
+    def add(self, value: int) -> bool:
+        """
+        Mark ID as seen.
+
+        Args:
+            value: Non-negative player ID
+
+        Returns:
+            True if the ID was new, False if already seen
+        """
+        if value < 0:
+            raise ValueError(f"Player ID must be non-negative: {value}")
+
+        self._ensure(value)
+        byte, mask = value >> 3, 1 << (value & 7)
+
+        if self._bits[byte] & mask:
+            return False
+
+        self._bits[byte] |= mask
+        self._count += 1
+        return True
+
+    def __contains__(self, value: int) -> bool:
+        byte = value >> 3
+        if value < 0 or byte >= len(self._bits):
+            return False
+        return bool(self._bits[byte] & (1 << (value & 7)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array."""
+        return len(self._bits)
+
+
+class BloomFilter:
+    """
+    Bloom filter for string keys (roster page URLs).
+
+    Sized from expected item count and target false-positive rate.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Initialize Bloom filter.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false-positive rate at capacity
+        """
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2)) or 8
+        self.num_bits = bits
+        self.num_hashes = max(1, round(bits / capacity * math.log(2)))
+        self._bits = bytearray(bits // 8 + 1)
+        self._count = 0
+
+    def _positions(self, key: str) -> Iterator[int]:
+        """Bit positions for key (double hashing over one blake2b digest)."""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """
+        Add key to the filter.
+
+        Args:
+            key: String key
+
+        Returns:
+            True if the key was (probably) new, False if already present
+        """
+        new = False
+        for pos in self._positions(key):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                new = True
+
+        if new:
+            self._count += 1
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(key)
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array."""
+        return len(self._bits)
+
+
+class PlayerFrontier:
+    """
+    Prioritized queue of discovered player IDs.
+
+    Each ID is queued at most once (deduped by an IdBitmap).
+    Higher priority IDs are popped first; ties pop in discovery order.
+    """
+
+    def __init__(self, seen: Optional[IdBitmap] = None):
+        """
+        Initialize frontier.
+
+        Args:
+            seen: Seen-set to dedupe against (default: new IdBitmap)
+        """
+        self.seen = seen if seen is not None else IdBitmap()
+        self._heap: List[Tuple[float, int, int]] = []
+        self._seq = 0
+
+    def push(self, player_id: int, priority: float = 0.0) -> bool:
+        """
+        Queue player ID if not seen before.
+
+        Args:
+            player_id: HockeyDB player ID
+            priority: Larger values are scraped first
+
+        Returns:
+            True if queued, False if duplicate
+        """
+        if not self.seen.add(player_id):
+            return False
+
+        heapq.heappush(self._heap, (-priority, self._seq, player_id))
+        self._seq += 1
+        return True
+
+    def pop(self) -> Optional[int]:
+        """Pop highest priority player ID, or None if empty."""
+        if not self._heap:
+            return None
+        return heapq.heappop(self._heap)[2]
+
+    def pop_batch(self, size: int) -> List[int]:
+        """Pop up to size player IDs in priority order."""
+        batch = []
+        while self._heap and len(batch) < size:
+            batch.append(heapq.heappop(self._heap)[2])
+        return batch
+
+    def drain(self) -> Iterator[int]:
+        """Yield player IDs until the frontier is empty."""
+        while self._heap:
+            yield heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+def extract_player_ids(html: str) -> List[int]:
+    """
+    Extract player IDs from page HTML, in page order.
+
+    Args:
+        html: Roster page HTML
+
+    Returns:
+        List of player IDs (may contain duplicates)
+    """
+    return [int(pid) for pid in PLAYER_LINK_RE.findall(html)]
+
+
+def extract_roster_links(html: str, base_url: str) -> List[str]:
+    """
+    Extract absolute roster page links from page HTML.
+
+    Args:
+        html: Page HTML
+        base_url: URL of the page (for relative links)
+
+    Returns:
+        List of absolute URLs without fragments
+    """
+    return [
+        urldefrag(urljoin(base_url, href))[0]
+        for href in ROSTER_LINK_RE.findall(html)
+    ]
+
+
+class RosterCrawler:
+    """Breadth-first crawler over roster pages that fills a PlayerFrontier."""
+
+    def __init__(
+        self,
+        seed_urls: Iterable[str],
+        frontier: Optional[PlayerFrontier] = None,
+        fetch: Optional[Callable[[str], Optional[str]]] = None,
+        max_pages: int = 10_000,
+        max_depth: int = 3,
+        timeout: int = 10,
+        rate_controller: Optional[AdaptiveRateController] = None
+    ):
+        """
+        Initialize crawler.
+
+        Args:
+            seed_urls: Team/season roster URLs to start from
+            frontier: Frontier to push player IDs into (default: new PlayerFrontier)
+            fetch: Function url -> HTML or None (default: HTTP GET)
+            max_pages: Maximum roster pages to fetch
+            max_depth: Maximum link depth from the seeds
+            timeout: HTTP timeout in seconds for the default fetcher
+            rate_controller: Adaptive rate controller for the default fetcher
+        """
+        self.frontier = frontier if frontier is not None else PlayerFrontier()
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.rate = rate_controller or AdaptiveRateController(initial_rate=2.0)
+        self.pages_seen = BloomFilter(capacity=max(max_pages, 1000))
+        self.pages_fetched = 0
+        self.pages_failed = 0
+        self._session: Optional[requests.Session] = None
+        self._fetch = fetch or self._http_fetch
+        self._pages: deque = deque()
+
+        for url in seed_urls:
+            if self.pages_seen.add(url):
+                self._pages.append((url, 0))
+
+    def _http_fetch(self, url: str) -> Optional[str]:
+        """Fetch page HTML over a shared keep-alive session."""
+        if self._session is None:
+            self._session = requests.Session()
+
+        self.rate.acquire()
+        start = time.monotonic()
+
+        try:
+            response = self._session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            self.rate.record_timeout(time.monotonic() - start)
+            print(f"FAILED - Error fetching {url}: {e}")
+            return None
+
+        self.rate.record(
+            time.monotonic() - start,
+            status=response.status_code,
+            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+        )
+
+        try:
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            print(f"FAILED - Error fetching {url}: {e}")
+            return None
+
+    def priority(self, player_id: int, page_url: str, depth: int) -> float:
+        """
+        Priority of a newly discovered player ID.
+
+        Players found closer to the seeds are scraped first.
+        Override for other policies (e.g. most recent seasons first).
+        """
+        return -float(depth)
+
+    def crawl_page(self) -> int:
+        """
+        Fetch the next roster page and process its links.
+
+        Returns:
+            Number of new player IDs queued, or -1 if no pages are left
+        """
+        if not self._pages or self.pages_fetched + self.pages_failed >= self.max_pages:
+            return -1
+
+        url, depth = self._pages.popleft()
+        html = self._fetch(url)
+
+        if html is None:
+            self.pages_failed += 1
+            return 0
+
+        self.pages_fetched += 1
+
+        queued = 0
+        for player_id in extract_player_ids(html):
+            if self.frontier.push(player_id, self.priority(player_id, url, depth)):
+                queued += 1
+
+        if depth < self.max_depth:
+            for link in extract_roster_links(html, url):
+                if self.pages_seen.add(link):
+                    self._pages.append((link, depth + 1))
+
+        return queued
+
+    def crawl(self) -> int:
+        """
+        Crawl until no pages are left or max_pages is reached.
+
+        Returns:
+            Number of player IDs in the frontier
+        """
+        while self.crawl_page() >= 0:
+            pass
+
+        print(
+            f"Crawl: OK - {self.pages_fetched} pages, {len(self.frontier.seen)} player IDs"
+            f" ({self.pages_failed} failed)"
+        )
+        return len(self.frontier)
+
+    def iter_player_ids(self, batch_size: int = 1) -> Iterator[int]:
+        """
+        Crawl lazily, yielding player IDs as the frontier fills.
+
+        Pages are fetched only when the frontier holds fewer than
+        batch_size IDs, so scraping can start before the crawl ends.
+
+        Args:
+            batch_size: Frontier low-water mark before fetching more pages
+
+        Yields:
+            Player IDs in priority order
+        """
+        while True:
+            while len(self.frontier) < batch_size and self.crawl_page() >= 0:
+                pass
+
+            player_id = self.frontier.pop()
+            if player_id is None:
+                return
+            yield player_id
+
+    def close(self):
+        """Close the HTTP session."""
+        if self._session:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+if __name__ == "__main__":
+    import sys
+    from scraper import scrape_players_concurrent
+
+    # Example usage: python crawler.py <roster_url> [<roster_url> ...]
+    seeds = sys.argv[1:] or ["https://www.hockeydb.com/stte/tampa-bay-lightning-7963.html"]
+
+    with RosterCrawler(seeds, max_pages=50, max_depth=1) as crawler:
+        results = scrape_players_concurrent(crawler.iter_player_ids(batch_size=8), workers=4)
+        print(f"Scraped {len(results)} players")
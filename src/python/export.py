@@ -0,0 +1,739 @@
+#!/usr/bin/env python3
+"""
+Game data exporter: parsed players -> src/data/players/<slug>.json shards
+plus manifest.json, replacing the hand workflow (data-entry.js,
+archive/generate_data.py).
+
+Serialization and hashing run in a process pool, chunk by chunk; a shard
+is rewritten (atomically) only when its content hash differs from the
+file on disk, so re-exporting 10k players touches only the changed ones.
+
+Optionally players are also packed into N size-balanced bundles
+(bundles/bundle-<n>.json, a JSON array of shards) so the game fetches
+many players per request; manifest entries then carry bundle and offset.
+With compress=True every file also gets .gz/.br variants (precompress.py).
+
+Manifest entries record each file's hash, size and last_modified. With
+hashed=True the hash is also part of the file name (kadri.3f9c0a1b2d4e.json),
+so shards and bundles can be cached forever and only manifest.json needs
+revalidating.
+
+With autocomplete=True the player-name prefix index (name_index.py) is
+written as autocomplete.json, with fuzzy=True the typo-tolerant trigram
+index (fuzzy.py) as fuzzy.json; both are listed in the manifest.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from models import PlayerData
+from fuzzy import build_fuzzy_index
+from name_index import index_players
+from precompress import CompressReport, precompress_tree, print_compress_report
+from shards import DATA_DIR, assign_slugs, manifest_entry, shard_json, write_atomic, write_manifest
+
+WRITTEN = 'written'
+UNCHANGED = 'unchanged'
+FAILED = 'failed'
+
+# Hex digits of the content hash used in file names
+NAME_HASH_LENGTH = 12
+
+# Name index files export_players can write
+INDEX_NAMES = ('autocomplete', 'fuzzy')
+
+
+@dataclass
+class ShardResult:
+    """One shard as exported by a worker."""
+    slug: str
+    status: str
+    file: str = ''
+    hash: str = ''
+    size: int = 0
+    error: str = ''
+    packed: Optional[str] = None
+    seconds: float = 0.0
+
+
+@dataclass
+class ExportReport:
+    """Outcome of one export."""
+    written: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    removed: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    bundles_written: List[str] = field(default_factory=list)
+    bundles_unchanged: int = 0
+    manifest_written: bool = False
+    indexes_written: List[str] = field(default_factory=list)
+    bytes_written: int = 0
+    seconds: float = 0.0
+    workers: int = 1
+    compressed: Optional[CompressReport] = None
+    shard_seconds: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if every shard (and variant) was exported."""
+        return not self.errors and (self.compressed is None or self.compressed.ok)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'written': self.written,
+            'unchanged': self.unchanged,
+            'removed': self.removed,
+            'errors': self.errors,
+            'bundles_written': self.bundles_written,
+            'bundles_unchanged': self.bundles_unchanged,
+            'manifest_written': self.manifest_written,
+            'indexes_written': self.indexes_written,
+            'bytes_written': self.bytes_written,
+            'seconds': round(self.seconds, 4),
+            'workers': self.workers,
+            'compressed': self.compressed.to_dict() if self.compressed else None
+        }
+
+
+def _file_matches(path: Path, data: bytes, digest: str) -> bool:
+    """True if path holds exactly data (size checked before hashing)."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return hashlib.sha256(path.read_bytes()).hexdigest() == digest
+    except OSError:
+        return False
+
+
+def _write_if_changed(path: Path, data: bytes, digest: str) -> bool:
+    """
+    Atomically write data to path unless the file already holds it.
+
+    Returns:
+        True if the file was written
+    """
+    if _file_matches(path, data, digest):
+        return False
+    write_atomic(path, data)
+    return True
+
+
+def file_name(stem: str, digest: str, hashed: bool) -> str:
+    """<stem>.json, or <stem>.<hash>.json when names are content-hashed."""
+    return f'{stem}.{digest[:NAME_HASH_LENGTH]}.json' if hashed else f'{stem}.json'
+
+
+def _export_chunk(
+    items: List[Tuple[str, PlayerData]],
+    players_dir: str,
+    compact: bool = False,
+    hashed: bool = False
+) -> List[ShardResult]:
+    """
+    Serialize shards and write the ones whose content changed.
+
+    Runs in a worker process.
+
+    Args:
+        items: (slug, player) pairs
+        players_dir: Directory of the shard files
+        compact: Also return each shard as compact JSON (for bundles)
+        hashed: Put the content hash in file names
+
+    Returns:
+        ShardResult per item
+    """
+    results = []
+    for slug, player in items:
+        start = time.perf_counter()
+        try:
+            shard = player.to_shard_dict()
+            data = shard_json(shard).encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            name = file_name(slug, digest, hashed)
+            written = _write_if_changed(Path(players_dir) / name, data, digest)
+            results.append(ShardResult(
+                slug, WRITTEN if written else UNCHANGED, name, digest, len(data),
+                packed=json.dumps(shard, separators=(',', ':'), ensure_ascii=False) if compact else None,
+                seconds=time.perf_counter() - start
+            ))
+        except (OSError, TypeError, ValueError) as e:
+            results.append(ShardResult(slug, FAILED, error=f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _export_shards(
+    items: List[Tuple[str, PlayerData]],
+    players_dir: Path,
+    workers: Optional[int],
+    chunk_size: int,
+    compact: bool,
+    hashed: bool
+) -> Tuple[ExportReport, Dict[str, ShardResult], Dict[str, str]]:
+    """
+    Serialize and write shards in a process pool.
+
+    Returns:
+        (report with shard counts, slug -> ShardResult of exported shards,
+        slug -> compact shard JSON when compact)
+    """
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks)) or 1
+    report = ExportReport(workers=workers)
+
+    if workers == 1:
+        results = [_export_chunk(chunk, str(players_dir), compact, hashed) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _export_chunk, chunks, [str(players_dir)] * len(chunks),
+                [compact] * len(chunks), [hashed] * len(chunks)
+            ))
+
+    shards: Dict[str, ShardResult] = {}
+    packed: Dict[str, str] = {}
+    for result in (result for chunk in results for result in chunk):
+        if result.status == FAILED:
+            report.errors.append(f"{result.slug}: {result.error}")
+            continue
+        shards[result.slug] = result
+        report.shard_seconds[result.slug] = result.seconds
+        if result.packed is not None:
+            packed[result.slug] = result.packed
+        if result.status == WRITTEN:
+            report.written.append(result.slug)
+            report.bytes_written += result.size
+        else:
+            report.unchanged += 1
+    return report, shards, packed
+
+
+def balance_bundles(sizes: List[int], count: int) -> List[int]:
+    """
+    Split items into at most count contiguous, size-balanced bundles.
+
+    Each item goes to the bundle its size midpoint falls in, so bundles
+    differ by at most one item's size and keep input order.
+
+    Args:
+        sizes: Serialized size of each item
+        count: Bundles wanted
+
+    Returns:
+        Bundle number per item (0..k-1, no empty bundles)
+    """
+    total = sum(sizes)
+    if not sizes or count < 1 or total == 0:
+        return [0] * len(sizes)
+
+    assigned = []
+    position = 0
+    for size in sizes:
+        assigned.append(min(count - 1, int((position + size / 2) * count / total)))
+        position += size
+
+    # Renumber so a huge item cannot leave a gap
+    numbers = {bundle: n for n, bundle in enumerate(sorted(set(assigned)))}
+    return [numbers[bundle] for bundle in assigned]
+
+
+def _last_modified() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def _write_bundles(
+    data_dir: Path,
+    slugs: List[str],
+    packed: Dict[str, str],
+    count: int,
+    report: ExportReport,
+    hashed: bool = False,
+    previous: Optional[List[dict]] = None
+) -> Tuple[Dict[str, Tuple[int, int]], List[dict]]:
+    """
+    Write bundle files and remove ones no longer used.
+
+    Args:
+        data_dir: Game data directory
+        slugs: Exported slugs in manifest order
+        packed: slug -> compact shard JSON (failed shards missing)
+        count: Bundles wanted (0 removes all bundles)
+        report: ExportReport to update
+        hashed: Put the content hash in file names
+        previous: Bundle entries of the current manifest (keeps
+            last_modified of unchanged bundles)
+
+    Returns:
+        (slug -> (bundle, offset), bundle manifest entries)
+    """
+    slugs = [slug for slug in slugs if slug in packed] if count else []
+    sizes = [len(packed[slug].encode('utf-8')) for slug in slugs]
+    assigned = balance_bundles(sizes, count)
+
+    members: List[List[str]] = [[] for _ in range(len(set(assigned)))]
+    for slug, number in zip(slugs, assigned):
+        members[number].append(slug)
+
+    previous_hashes = {entry.get('hash'): entry.get('last_modified') for entry in previous or []}
+    locations = {}
+    entries = []
+    for number, bundle_slugs in enumerate(members):
+        for offset, slug in enumerate(bundle_slugs):
+            locations[slug] = (number, offset)
+        data = ('[' + ','.join(packed[slug] for slug in bundle_slugs) + ']\n').encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        name = 'bundles/' + file_name(f'bundle-{number}', digest, hashed)
+        if _write_if_changed(data_dir / name, data, digest):
+            report.bundles_written.append(name)
+            report.bytes_written += len(data)
+        else:
+            report.bundles_unchanged += 1
+        entries.append({
+            'file': name,
+            'players': len(bundle_slugs),
+            'hash': digest,
+            'size': len(data),
+            'last_modified': previous_hashes.get(digest) or _last_modified()
+        })
+
+    current = {entry['file'] for entry in entries}
+    bundles_dir = data_dir / 'bundles'
+    if bundles_dir.is_dir():
+        for path in sorted(bundles_dir.glob('bundle-*.json')):
+            name = f'bundles/{path.name}'
+            if name not in current:
+                path.unlink()
+                report.removed.append(name[:-len('.json')])
+
+    return locations, entries
+
+
+def _write_name_indexes(
+    data_dir: Path,
+    slugs: List[str],
+    players: List[PlayerData],
+    kept: List[dict],
+    report: ExportReport,
+    wanted: List[str],
+    hashed: bool = False
+) -> Dict[str, dict]:
+    """
+    Write the name index files and remove ones no longer used.
+
+    Args:
+        data_dir: Game data directory
+        slugs: Slug per player
+        players: Exported players
+        kept: Manifest entries kept from earlier exports (indexed with
+            popularity 0)
+        report: ExportReport to update
+        wanted: Indexes to write ('autocomplete', 'fuzzy'); the others
+            are removed
+        hashed: Put the content hash in file names
+
+    Returns:
+        Index name -> manifest entry (file, hash, size)
+    """
+    entries = {}
+    if wanted:
+        prefix_index = index_players(players, slugs, [(e['id'], e.get('name', e['id'])) for e in kept])
+        for name in wanted:
+            index = build_fuzzy_index(prefix_index) if name == 'fuzzy' else prefix_index
+            data = (json.dumps(index, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            entries[name] = {'file': file_name(name, digest, hashed), 'hash': digest, 'size': len(data)}
+            if _write_if_changed(data_dir / entries[name]['file'], data, digest):
+                report.indexes_written.append(entries[name]['file'])
+                report.bytes_written += len(data)
+
+    current = {entry['file'] for entry in entries.values()}
+    for name in INDEX_NAMES:
+        for path in sorted(data_dir.glob(f'{name}.*json')):
+            if path.name not in current:
+                path.unlink()
+                report.removed.append(path.stem)
+    return entries
+
+
+def export_options(data_dir: Optional[str] = None) -> dict:
+    """
+    export_players options the data directory was last exported with,
+    read back from its manifest, so a partial re-export keeps bundles,
+    hashed names, name indexes and precompressed variants.
+
+    Args:
+        data_dir: Game data directory (default: src/data)
+
+    Returns:
+        {"bundles", "compress", "hashed", "autocomplete", "fuzzy"}
+    """
+    data_dir = Path(data_dir) if data_dir is not None else DATA_DIR
+    manifest_path = data_dir / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8')) if manifest_path.exists() else {}
+
+    files = manifest.get('players', []) + (manifest.get('bundles') or [])
+    files += [manifest[name] for name in INDEX_NAMES if name in manifest]
+    return {
+        'bundles': len(manifest.get('bundles') or []),
+        'compress': manifest_path.with_name(manifest_path.name + '.gz').exists(),
+        'hashed': any(
+            entry.get('hash') and entry.get('file', '').endswith(f".{entry['hash'][:NAME_HASH_LENGTH]}.json")
+            for entry in files
+        ),
+        'autocomplete': 'autocomplete' in manifest,
+        'fuzzy': 'fuzzy' in manifest
+    }
+
+
+def export_players(
+    players: List[PlayerData],
+    data_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    prune: bool = False,
+    drop: Iterable[str] = (),
+    bundles: int = 0,
+    compress: bool = False,
+    hashed: bool = False,
+    autocomplete: bool = False,
+    fuzzy: bool = False
+) -> ExportReport:
+    """
+    Write one shard per player and the manifest listing them.
+
+    Args:
+        players: Parsed players (slugs are assigned with assign_slugs)
+        data_dir: Game data directory holding manifest.json and players/
+            (default: src/data)
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        chunk_size: Players serialized per worker task
+        prune: Remove shards and manifest entries of players not exported
+            (default keeps them, e.g. hand-made entries)
+        drop: Slugs of players not exported whose shards and manifest
+            entries are removed even without prune
+        bundles: Also pack exported players into this many size-balanced
+            bundles (0: no bundles, existing ones are removed)
+        compress: Also write .gz (and .br) variants of every data file,
+            regenerating only those whose source changed
+        hashed: Content-hashed file names for shards and bundles (files
+            they replace are removed)
+        autocomplete: Also write the player-name prefix index
+            (autocomplete.json, see name_index.py)
+        fuzzy: Also write the typo-tolerant name index (fuzzy.json, see
+            fuzzy.py)
+
+    Returns:
+        ExportReport
+    """
+    start = time.perf_counter()
+    data_dir = Path(data_dir) if data_dir is not None else DATA_DIR
+    players_dir = data_dir / 'players'
+    players_dir.mkdir(parents=True, exist_ok=True)
+
+    slugs = assign_slugs(players)
+    report, shards, packed = _export_shards(
+        list(zip(slugs, players)), players_dir, workers, chunk_size, bundles > 0, hashed
+    )
+
+    # Manifest: exported players in input order, then kept entries
+    manifest_path = data_dir / 'manifest.json'
+    exported = set(slugs)
+    existing: Dict = {}
+    if manifest_path.exists():
+        existing = json.loads(manifest_path.read_text(encoding='utf-8'))
+
+    # Files replaced by an exported shard (previous hashed or unhashed
+    # name), those of dropped players and, with prune, of all players
+    # not exported; a failed shard keeps its old file
+    failed = exported - set(shards)
+    dropped = set(drop) - exported
+    current = {result.file for result in shards.values()}
+    for path in sorted(players_dir.glob('*.json')):
+        slug = path.name.split('.', 1)[0]
+        if path.name in current or slug in failed or (slug not in (exported | dropped) and not prune):
+            continue
+        path.unlink()
+        report.removed.append(path.stem)
+
+    if prune:
+        kept = []
+    else:
+        # Kept entries are served from their own shard files
+        kept = [
+            {key: value for key, value in entry.items() if key not in ('bundle', 'offset')}
+            for entry in existing.get('players', []) if entry.get('id') not in (exported | dropped)
+        ]
+
+    locations, bundle_entries = _write_bundles(
+        data_dir, slugs, packed, bundles, report, hashed, existing.get('bundles')
+    )
+
+    previous = {entry.get('id'): entry for entry in existing.get('players', [])}
+    entries = []
+    for slug, player in zip(slugs, players):
+        if slug not in shards:
+            continue
+        result = shards[slug]
+        unchanged = previous.get(slug, {}).get('hash') == result.hash
+        entry = manifest_entry(slug, player.player.name)
+        entry['file'] = f'players/{result.file}'
+        entry['hash'] = result.hash
+        entry['size'] = result.size
+        entry['last_modified'] = (unchanged and previous[slug].get('last_modified')) or _last_modified()
+        if slug in locations:
+            entry['bundle'], entry['offset'] = locations[slug]
+        entries.append(entry)
+
+    exported_players = [player for slug, player in zip(slugs, players) if slug in shards]
+    wanted = [name for name, enabled in zip(INDEX_NAMES, (autocomplete, fuzzy)) if enabled]
+    index_entries = _write_name_indexes(
+        data_dir, [entry['id'] for entry in entries], exported_players, kept, report, wanted, hashed
+    )
+
+    report.manifest_written = write_manifest(
+        entries + kept, manifest_path, bundle_entries or None, index_entries
+    )
+
+    if compress:
+        changed = [players_dir / shards[slug].file for slug in report.written]
+        changed += [data_dir / name for name in report.bundles_written]
+        changed += [data_dir / name for name in report.indexes_written]
+        if report.manifest_written:
+            changed.append(manifest_path)
+        report.compressed = precompress_tree(data_dir, changed=changed)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _patch_bundles(
+    data_dir: Path,
+    entries: List[dict],
+    previous: List[dict],
+    packed: Dict[str, str],
+    removed: Dict[int, List[str]],
+    added: List[str],
+    report: ExportReport,
+    hashed: bool
+) -> List[dict]:
+    """
+    Rewrite only the bundles holding updated, dropped or added players.
+
+    Unchanged members are copied from the bundle file; nothing is
+    rebalanced. Offsets in entries are updated in place.
+
+    Args:
+        data_dir: Game data directory
+        entries: Manifest player entries after the update
+        previous: Bundle entries of the current manifest
+        packed: slug -> compact shard JSON of updated and added players
+        removed: Bundle number -> slugs dropped from it
+        added: Slugs of new players (appended to the last bundle)
+        report: ExportReport to update
+        hashed: Put the content hash in file names
+
+    Returns:
+        Bundle manifest entries
+    """
+    bundles = [dict(entry) for entry in previous]
+    last = len(bundles) - 1
+    members: Dict[int, List[dict]] = {}
+    for entry in entries:
+        if isinstance(entry.get('bundle'), int) and 0 <= entry['bundle'] <= last:
+            members.setdefault(entry['bundle'], []).append(entry)
+
+    affected = {entry['bundle'] for entry in entries if entry.get('id') in packed and 'bundle' in entry}
+    affected |= set(removed)
+    if added:
+        affected.add(last)
+    by_id = {entry['id']: entry for entry in entries}
+
+    def member(stored: list, entry: dict) -> str:
+        # Copied from the bundle, or from the player's shard if the bundle is gone
+        if entry['offset'] < len(stored):
+            shard = stored[entry['offset']]
+        else:
+            shard = json.loads((data_dir / entry['file']).read_text(encoding='utf-8'))
+        return json.dumps(shard, separators=(',', ':'), ensure_ascii=False)
+
+    for number in sorted(affected):
+        old_path = data_dir / bundles[number]['file']
+        stored = json.loads(old_path.read_text(encoding='utf-8')) if old_path.exists() else []
+        bundle_entries = sorted(members.get(number, []), key=lambda entry: entry['offset'])
+        parts = [packed.get(entry['id']) or member(stored, entry) for entry in bundle_entries]
+        if number == last:
+            for slug in added:
+                by_id[slug]['bundle'] = number
+                bundle_entries.append(by_id[slug])
+                parts.append(packed[slug])
+        for offset, entry in enumerate(bundle_entries):
+            entry['offset'] = offset
+
+        data = ('[' + ','.join(parts) + ']\n').encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        name = 'bundles/' + file_name(f'bundle-{number}', digest, hashed)
+        if _write_if_changed(data_dir / name, data, digest):
+            report.bundles_written.append(name)
+            report.bytes_written += len(data)
+            bundles[number]['last_modified'] = _last_modified()
+        else:
+            report.bundles_unchanged += 1
+        if name != bundles[number]['file'] and old_path.exists():
+            old_path.unlink()
+            report.removed.append(bundles[number]['file'][:-len('.json')])
+        bundles[number].update({'file': name, 'players': len(bundle_entries), 'hash': digest, 'size': len(data)})
+
+    return bundles
+
+
+def update_players(
+    items: List[Tuple[str, PlayerData]],
+    data_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    drop: Iterable[str] = (),
+    indexed: Optional[List[Tuple[str, PlayerData]]] = None
+) -> ExportReport:
+    """
+    Rewrite the shards of some players and merge them into the manifest.
+
+    Unlike export_players, only the given players are serialized; every
+    other manifest entry, shard and bundle is left as it is, so the cost
+    follows the number of players changed. The layout the data
+    directory was exported with (export_options) is kept: bundles
+    holding an updated or dropped player are rewritten (new players are
+    appended to the last bundle, nothing is rebalanced), name indexes
+    are rebuilt and changed files get fresh .gz/.br variants.
+
+    Args:
+        items: (slug, player) pairs to write; slugs must come from
+            assign_slugs over all current players
+        data_dir: Game data directory (default: src/data)
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        chunk_size: Players serialized per worker task
+        drop: Slugs whose shards and manifest entries are removed
+        indexed: (slug, player) of all current players, ranked in the
+            name indexes (default: items; other entries rank last)
+
+    Returns:
+        ExportReport (shard_seconds holds each shard's own cost)
+    """
+    start = time.perf_counter()
+    data_dir = Path(data_dir) if data_dir is not None else DATA_DIR
+    players_dir = data_dir / 'players'
+    players_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = data_dir / 'manifest.json'
+    existing = json.loads(manifest_path.read_text(encoding='utf-8')) if manifest_path.exists() else {}
+    options = export_options(str(data_dir))
+    bundled = bool(existing.get('bundles'))
+
+    report, shards, packed = _export_shards(
+        list(items), players_dir, workers, chunk_size, bundled, options['hashed']
+    )
+    exported = {slug for slug, _ in items}
+    dropped = set(drop) - exported
+
+    # Old files of rewritten and dropped players; a failed shard keeps its file
+    current = {result.file for result in shards.values()}
+    for slug in sorted(set(shards) | dropped):
+        for path in sorted(players_dir.glob(f'{slug}.*')):
+            if path.name.split('.', 1)[0] == slug and path.suffix == '.json' and path.name not in current:
+                path.unlink()
+                report.removed.append(path.stem)
+
+    def updated(entry: dict, slug: str, name: str) -> dict:
+        result = shards[slug]
+        unchanged = entry.get('hash') == result.hash
+        entry = {**entry, 'id': slug, 'name': name, 'file': f'players/{result.file}'}
+        entry['hash'] = result.hash
+        entry['size'] = result.size
+        entry['last_modified'] = (unchanged and entry.get('last_modified')) or _last_modified()
+        return entry
+
+    names = {slug: player.player.name for slug, player in items}
+    entries = []
+    removed: Dict[int, List[str]] = {}
+    listed = set()
+    for entry in existing.get('players', []):
+        slug = entry.get('id')
+        listed.add(slug)
+        if slug in dropped:
+            if 'bundle' in entry:
+                removed.setdefault(entry['bundle'], []).append(slug)
+            continue
+        entries.append(updated(entry, slug, names[slug]) if slug in shards else entry)
+    added = [slug for slug, _ in items if slug in shards and slug not in listed]
+    entries += [updated(manifest_entry(slug, names[slug]), slug, names[slug]) for slug in added]
+
+    bundle_entries = None
+    if bundled:
+        bundle_entries = _patch_bundles(
+            data_dir, entries, existing['bundles'], packed, removed, added, report, options['hashed']
+        )
+
+    ids = {entry['id'] for entry in entries}
+    ranked = [(slug, player) for slug, player in (indexed if indexed is not None else items) if slug in ids]
+    ranked_ids = {slug for slug, _ in ranked}
+    wanted = [name for name in INDEX_NAMES if options[name]]
+    index_entries = _write_name_indexes(
+        data_dir, [slug for slug, _ in ranked], [player for _, player in ranked],
+        [entry for entry in entries if entry['id'] not in ranked_ids], report, wanted, options['hashed']
+    )
+
+    report.manifest_written = write_manifest(entries, manifest_path, bundle_entries, index_entries)
+
+    if options['compress']:
+        changed = [players_dir / shards[slug].file for slug in report.written]
+        changed += [data_dir / name for name in report.bundles_written]
+        changed += [data_dir / name for name in report.indexes_written]
+        if report.manifest_written:
+            changed.append(manifest_path)
+        report.compressed = precompress_tree(data_dir, changed=changed)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_export_report(report: ExportReport, limit: int = 20):
+    """Print written/unchanged/removed shard counts (ASCII only)."""
+    print("\n=== EXPORT ===")
+    print(f"Shards written: {len(report.written)} ({report.bytes_written} bytes)")
+    for slug in report.written[:limit]:
+        print(f"  wrote {slug}")
+    if len(report.written) > limit:
+        print(f"  ... {len(report.written) - limit} more")
+    print(f"Shards unchanged: {report.unchanged}")
+    if report.bundles_written or report.bundles_unchanged:
+        print(f"Bundles written: {len(report.bundles_written)}, unchanged: {report.bundles_unchanged}")
+    for slug in report.removed:
+        print(f"  removed {slug}.json")
+    for error in report.errors:
+        print(f"FAILED - {error}")
+    for name in report.indexes_written:
+        print(f"Name index written: {name}")
+    print(f"Manifest: {'written' if report.manifest_written else 'unchanged'}")
+    print(f"Time: {report.seconds:.2f}s ({report.workers} workers)")
+    if report.compressed is not None:
+        print_compress_report(report.compressed)
+
+
+if __name__ == "__main__":
+    # Example usage: export the sample data file twice; the second run
+    # writes nothing
+    import tempfile
+    from parser import load_data_file
+
+    sample = Path(__file__).resolve().parent.parent.parent / 'archive' / 'data_player.txt'
+    if sample.exists():
+        sample_players = load_data_file(str(sample))
+        with tempfile.TemporaryDirectory() as root:
+            print_export_report(export_players(sample_players, data_dir=root, bundles=2, hashed=True))
+            print_export_report(export_players(sample_players, data_dir=root, bundles=2, hashed=True))
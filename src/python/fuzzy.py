@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Typo-tolerant player-name matching.
+
+Every player is indexed under keys folded with name_index.fold_name
+("Holmström" and "Holmstrom" are equal): the full name and the name from
+each later word on, so "holmstrom" matches "Tomas Holmström". Each key
+is listed under every trigram (3-letter window) of " <key> ".
+
+One edit (insert, delete, replace, or swap of adjacent letters) changes
+at most 4 trigrams, so a key within k edits of the query shares at least
+len(query trigrams) - 4k of them. Keys are stored shortest first, so
+only postings of keys within k of the query length are counted; the few
+keys over the bound are verified with a bounded edit distance.
+
+The exported artifact (fuzzy.json) holds the players, keys and
+delta-encoded postings; src/utils/NameIndex.js (FuzzyIndex) reads the
+same file.
+"""
+import bisect
+import itertools
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from name_index import fold_name, name_keys
+
+FUZZY_VERSION = 1
+
+# Edits allowed by folded length: shorter names must match more closely
+TYPO_LENGTHS = ((5, 0), (10, 1))
+MAX_TYPOS = 2
+
+# Trigrams one edit can change (a swap touches 4 windows)
+GRAMS_PER_EDIT = 4
+
+
+def max_typos(length: int) -> int:
+    """
+    Edits a guess of this folded length may contain (same as maxTypos
+    in NameIndex.js).
+
+    Args:
+        length: Length of the folded name
+
+    Returns:
+        0 below 5 characters, 1 below 10, otherwise 2
+    """
+    for below, typos in TYPO_LENGTHS:
+        if length < below:
+            return typos
+    return MAX_TYPOS
+
+
+def trigrams(folded: str) -> Set[str]:
+    """
+    Distinct trigrams of a folded name, padded with one space per side.
+
+    Args:
+        folded: Folded name (fold_name)
+
+    Returns:
+        Trigrams ("kadri" -> {" ka", "kad", "adr", "dri", "ri "})
+    """
+    padded = f' {folded} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance counting a swap of adjacent letters as one edit
+    (optimal string alignment), stopping once it must exceed limit.
+
+    Bit-parallel (Myers, with Hyyro's transposition step): one column
+    of the distance table per character of b, kept as bit vectors.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance of interest
+
+    Returns:
+        Distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a or not b:
+        return max(len(a), len(b))
+
+    # peq[c]: bit i set where a[i] == c
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+
+    vp, vn, d0, pm_previous = mask, 0, 0, 0
+    score = len(a)
+    remaining = len(b)
+    for c in b:
+        pm = peq.get(c, 0)
+        swap = ((~d0 & pm) << 1) & pm_previous
+        d0 = ((((pm & vp) + vp) ^ vp) | pm | vn | swap) & mask
+        hp = (vn | ~(d0 | vp)) & mask
+        hn = d0 & vp
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        remaining -= 1
+        # Each remaining character lowers the distance by at most one
+        if score - remaining > limit:
+            return limit + 1
+        x = ((hp << 1) | 1) & mask
+        vn = x & d0
+        vp = ((hn << 1) | ~(x | d0)) & mask
+        pm_previous = pm
+    return min(score, limit + 1)
+
+
+def build_fuzzy_index(prefix_index: dict) -> dict:
+    """
+    Build the trigram artifact for the players of a prefix index.
+
+    Args:
+        prefix_index: Artifact from name_index.build_prefix_index or
+            index_players (players most popular first)
+
+    Returns:
+        {"version", "players": [[id, name]], "keys": folded names from
+        each word on, shortest first, "refs": player number per key,
+        "grams": {trigram: delta-encoded key numbers}}
+    """
+    players = prefix_index['players']
+    pairs = sorted(
+        (key, number)
+        for number, (_, name) in enumerate(players)
+        for key in name_keys(name)
+    )
+    pairs.sort(key=lambda pair: len(pair[0]))
+
+    postings: Dict[str, List[int]] = {}
+    for key_number, (key, _) in enumerate(pairs):
+        for gram in trigrams(key):
+            postings.setdefault(gram, []).append(key_number)
+
+    grams = {}
+    for gram, numbers in sorted(postings.items()):
+        grams[gram] = [numbers[0]] + [b - a for a, b in zip(numbers, numbers[1:])]
+
+    return {
+        'version': FUZZY_VERSION,
+        'players': players,
+        'keys': [key for key, _ in pairs],
+        'refs': [number for _, number in pairs],
+        'grams': grams
+    }
+
+
+class FuzzyIndex:
+    """Lookup over a build_fuzzy_index artifact."""
+
+    def __init__(self, data: dict):
+        """
+        Args:
+            data: Artifact from build_fuzzy_index (or its JSON)
+        """
+        self.players = data['players']
+        self.keys = data['keys']
+        self.refs = data['refs']
+        # Key numbers are grouped by length: starts[n] is the first key
+        # at least n characters long
+        lengths = [len(key) for key in self.keys]
+        self.starts = [bisect.bisect_left(lengths, n) for n in range((lengths[-1] if lengths else 0) + 2)]
+        self.sizes = [len(trigrams(key)) for key in self.keys]  # distinct trigrams per key
+        self.postings: Dict[str, List[int]] = {}
+        for gram, deltas in data['grams'].items():
+            self.postings[gram] = list(itertools.accumulate(deltas))
+
+    def _length_range(self, length: int, typos: int) -> Tuple[int, int]:
+        """Key numbers [first, end) of keys within typos of length."""
+        last = len(self.starts) - 1
+        return self.starts[min(max(length - typos, 0), last)], self.starts[min(length + typos + 1, last)]
+
+    def match(
+        self,
+        query: str,
+        limit: int = 5,
+        max_distance: Optional[int] = None
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Players whose name (or its end from any word) is within
+        max_distance edits of query, closest and most popular first.
+
+        Args:
+            query: User input (folded here)
+            limit: Maximum results
+            max_distance: Edits allowed (default: max_typos of the query)
+
+        Returns:
+            (id, name, distance) triples
+        """
+        folded = fold_name(query)
+        if not folded:
+            return []
+        typos = max_typos(len(folded)) if max_distance is None else max_distance
+        first, end = self._length_range(len(folded), typos)
+
+        grams = trigrams(folded)
+        needed = len(grams) - GRAMS_PER_EDIT * typos
+        if needed > 0:
+            windows = []
+            for gram in grams:
+                numbers = self.postings.get(gram, ())
+                windows.append(numbers[bisect.bisect_left(numbers, first):bisect.bisect_left(numbers, end)])
+            windows.sort(key=len)
+            counts = Counter(itertools.chain.from_iterable(windows))
+            # A key sharing needed trigrams has one of the rarest
+            # len - needed + 1, so only those keys are checked
+            probe = set(itertools.chain.from_iterable(windows[:len(windows) - needed + 1]))
+            # The bound holds from the key's side too
+            slack = GRAMS_PER_EDIT * typos
+            candidates: Iterable[int] = [
+                number for number in probe
+                if counts[number] >= needed and counts[number] + slack >= self.sizes[number]
+            ]
+        else:
+            # Too short for the trigram bound: verify every key of a fitting length
+            candidates = range(first, end)
+
+        best: Dict[int, int] = {}
+        for key_number in candidates:
+            distance = edit_distance(folded, self.keys[key_number], typos)
+            player = self.refs[key_number]
+            if distance <= typos and distance < best.get(player, typos + 1):
+                best[player] = distance
+
+        found = sorted((distance, player) for player, distance in best.items())[:limit]
+        return [(self.players[n][0], self.players[n][1], distance) for distance, n in found]
+
+
+if __name__ == "__main__":
+    # Example usage
+    from name_index import build_prefix_index
+
+    index = FuzzyIndex(build_fuzzy_index(build_prefix_index([
+        ('oreilly', "Ryan O'Reilly", 1200),
+        ('holmstrom', 'Tomas Holmström', 1400),
+        ('kadri', 'Nazem Kadri', 1100),
+        ('hossa', 'Marian Hossa', 1700)
+    ])))
+    for query in ['tomas holmstrom', 'holmstorm', 'ryan oreily', 'nazem kardi', 'hosa']:
+        print(f"{query} -> {index.match(query)}")
@@ -0,0 +1,189 @@
+"""
+Client-side lookup cache with TTL, LRU eviction and single-flight loading.
+Concurrent lookups of the same key share one load; invalidation drops both
+the cached value and any load in flight so stale results are not stored.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LookupCache:
+    """Thread-safe TTL + LRU cache with request coalescing."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum cached entries (least recently used evicted first)
+            ttl: Seconds an entry stays fresh
+            clock: Time source (monotonic seconds)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return a fresh cached value without loading.
+
+        Args:
+            key: Cache key
+            default: Returned when key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._fresh(key)
+            return default if entry is None else entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return cached value, or load it once for all concurrent callers.
+
+        A loader result of None (e.g. a failed request) is returned but not
+        cached. Loader exceptions propagate to every waiting caller.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # Invalidated while loading: hand the value to waiters, don't store it
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                if value is not None:
+                    self._store(key, value)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop key and detach any load in flight for it.
+
+        Returns:
+            True if a cached entry was removed
+        """
+        with self._lock:
+            self._inflight.pop(key, None)
+            return self._entries.pop(key, None) is not None
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Drop every entry for which predicate(key, value) is true.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        """Drop all entries and detach loads in flight."""
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0
+            }
+
+    def _fresh(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """Fresh entry for key (marked recently used), or None. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Hashable, value: Any):
+        """Insert entry and enforce max_size. Caller holds the lock."""
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+if __name__ == "__main__":
+    # Example usage
+    cache = LookupCache(max_size=2, ttl=60)
+
+    print(cache.get_or_load('a', lambda: 1))
+    print(cache.get_or_load('a', lambda: 2))
+    cache.put('b', 3)
+    cache.put('c', 4)
+    print(cache.get('a'))
+    print(cache.stats())
@@ -0,0 +1,406 @@
+"""
+Process-wide metrics registry: counters, gauges and latency histograms.
+Modules register their metrics on REGISTRY at import time; a run ends by
+writing a JSON snapshot and a Prometheus text-format file so throughput
+can be compared across runs.
+"""
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; suits both page fetches (~1-5s) and API calls (~1-100ms)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    """Prometheus sample value."""
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render {a="x",b="y"} (empty string for no labels)."""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+class Metric:
+    """Base class: a named metric with optional labels."""
+
+    type = 'untyped'
+
+    def __init__(self, name: str, help: str = '', labelnames: Sequence[str] = ()):
+        """
+        Initialize metric.
+
+        Args:
+            name: Metric name (e.g. 'scraper_pages_fetched_total')
+            help: One-line description
+            labelnames: Label names every sample must provide
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        """Label values in labelnames order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(sample name, labels, value) rows for export."""
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in sorted(self._values.items())]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-label-set values for the JSON snapshot."""
+        with self._lock:
+            return [
+                {'labels': self._labels(key), 'value': value}
+                for key, value in sorted(self._values.items())
+            ]
+
+    def clear(self):
+        """Drop all recorded values."""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        """Add amount (must be >= 0)."""
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current count for labels (0 if never incremented)."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        """Set current value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_max(self, value: float, **labels):
+        """Set value if it is higher than the current one (high-water mark)."""
+        key = self._key(labels)
+        with self._lock:
+            if value > self._values.get(key, -math.inf):
+                self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        """Add amount."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        """Subtract amount."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        """Current value for labels (0 if never set)."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets."""
+
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help: str = '',
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """
+        Initialize histogram.
+
+        Args:
+            name: Metric name (e.g. 'directus_request_seconds')
+            help: One-line description
+            labelnames: Label names every sample must provide
+            buckets: Upper bounds, ascending (+Inf is added)
+        """
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            entry['counts'][index] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        """Number of observations for labels."""
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            return entry['count'] if entry else 0
+
+    def _cumulative(self, entry: Dict[str, Any]) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) pairs including +Inf."""
+        total = 0
+        rows = []
+        for bound, count in zip(self.buckets + (math.inf,), entry['counts']):
+            total += count
+            rows.append((bound, total))
+        return rows
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Bucket, sum and count rows for export."""
+        rows = []
+        with self._lock:
+            for key, entry in sorted(self._values.items()):
+                labels = self._labels(key)
+                for bound, total in self._cumulative(entry):
+                    rows.append((f'{self.name}_bucket', {**labels, 'le': _format_value(bound)}, total))
+                rows.append((f'{self.name}_sum', labels, entry['sum']))
+                rows.append((f'{self.name}_count', labels, entry['count']))
+        return rows
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-label-set count, sum, mean and cumulative buckets."""
+        with self._lock:
+            return [
+                {
+                    'labels': self._labels(key),
+                    'count': entry['count'],
+                    'sum': round(entry['sum'], 6),
+                    'mean': round(entry['sum'] / entry['count'], 6) if entry['count'] else 0.0,
+                    'buckets': {_format_value(bound): total for bound, total in self._cumulative(entry)}
+                }
+                for key, entry in sorted(self._values.items())
+            ]
+
+
+class MetricsRegistry:
+    """Named collection of metrics with JSON and Prometheus export."""
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _register(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> Metric:
+        """Return the metric called name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as {metric.type} {list(metric.labelnames)}")
+            return metric
+
+    def counter(self, name: str, help: str = '', labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str = '', labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = '',
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Registered metric by name, or None."""
+        with self._lock:
+            return self._metrics.get(name)
+
+    def metrics(self) -> List[Metric]:
+        """All metrics sorted by name."""
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def reset(self):
+        """Clear every metric's values (registrations are kept)."""
+        for metric in self.metrics():
+            metric.clear()
+        self.started_at = time.time()
+
+    def snapshot(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        JSON-serializable view of all metrics.
+
+        Args:
+            extra: Additional top-level fields (e.g. run arguments)
+
+        Returns:
+            Dictionary with timestamps and per-metric values
+        """
+        now = time.time()
+        data = {
+            'generated_at': round(now, 3),
+            'uptime': round(now - self.started_at, 3),
+            'metrics': {
+                metric.name: {'type': metric.type, 'help': metric.help, 'values': metric.snapshot()}
+                for metric in self.metrics()
+            }
+        }
+        if extra:
+            data.update(extra)
+        return data
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics():
+            if metric.help:
+                lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Write JSON snapshot (atomically).
+
+        Returns:
+            True if written, False on error
+        """
+        return _write_atomic(path, json.dumps(self.snapshot(extra), indent=2))
+
+    def write_prometheus(self, path: str) -> bool:
+        """
+        Write Prometheus text file (atomically, safe for textfile collectors).
+
+        Returns:
+            True if written, False on error
+        """
+        return _write_atomic(path, self.to_prometheus())
+
+
+def _write_atomic(path: str, content: str) -> bool:
+    """Write content to a temp file and rename it over path."""
+    path = Path(path)
+    tmp = path.with_name(f'.{path.name}.tmp')
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp, path)
+        return True
+
+    except OSError as e:
+        print(f"Error writing {path}: {e}")
+        return False
+
+
+# Default registry shared by scraper, parser, api_client and pipeline
+REGISTRY = MetricsRegistry()
+
+
+def write_metrics(
+    directory: str,
+    prefix: str = 'pipeline_metrics',
+    registry: MetricsRegistry = REGISTRY,
+    extra: Optional[Dict[str, Any]] = None
+) -> Dict[str, str]:
+    """
+    Write directory/<prefix>.json and directory/<prefix>.prom.
+
+    Args:
+        directory: Output directory
+        prefix: File name without extension
+        registry: Registry to export
+        extra: Additional top-level JSON fields
+
+    Returns:
+        Dictionary of format -> written path
+    """
+    written = {}
+    json_path = str(Path(directory) / f'{prefix}.json')
+    prom_path = str(Path(directory) / f'{prefix}.prom')
+
+    if registry.write_json(json_path, extra):
+        written['json'] = json_path
+    if registry.write_prometheus(prom_path):
+        written['prometheus'] = prom_path
+
+    return written
+
+
+if __name__ == "__main__":
+    # Example usage
+    registry = MetricsRegistry()
+    pages = registry.counter('pages_fetched_total', 'Pages fetched', ['status'])
+    latency = registry.histogram('fetch_seconds', 'Page fetch latency', buckets=(0.1, 0.5, 1.0))
+    depth = registry.gauge('queue_depth', 'Items waiting')
+
+    pages.inc(status='ok')
+    pages.inc(status='ok')
+    pages.inc(status='failed')
+    for value in (0.05, 0.3, 0.7, 2.0):
+        latency.observe(value)
+    depth.set(3)
+
+    print(registry.to_prometheus())
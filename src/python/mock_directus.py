@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the subset of the Directus REST API used by api_client.
+In-memory collections served over HTTP/1.1 keep-alive, for tests and
+benchmarks without a live CMS.
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+# Query filter: filter[field][_op]=value
+FILTER_PARAM_RE = re.compile(r'^filter\[(\w+)\]\[(_\w+)\]$')
+
+# Fields that must be non-empty on create, per collection
+REQUIRED_FIELDS = {
+    'players': ('name',),
+    'statistics': ('player_id', 'season')
+}
+
+
+class MockDirectusState:
+    """In-memory collections, fault settings and request/connection counters."""
+
+    def __init__(
+        self,
+        token: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        rate_limit: float = 0.0,
+        burst: int = 10,
+        seed: Optional[int] = None,
+        accept_gzip: bool = True,
+        lost_responses: int = 0
+    ):
+        """
+        Initialize empty state.
+
+        Args:
+            token: Bearer token the server accepts
+            latency: Seconds to wait before handling each request
+            jitter: Extra random latency, uniform in [0, jitter] seconds
+            error_rate: Fraction of requests answered with error_status
+            error_status: Status code of injected errors
+            rate_limit: Requests per second before answering 429 (0 = unlimited)
+            burst: Token bucket size for rate_limit
+            seed: Random seed for jitter and error injection
+            accept_gzip: Accept gzip request bodies (else answer 415)
+            lost_responses: Next successful writes to apply and then close
+                without answering (a timeout after the server committed)
+        """
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.accept_gzip = accept_gzip
+        self.lost_responses = lost_responses
+        self.random = random.Random(seed)
+        self.collections: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.next_id: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.requests = 0
+        self.connections = 0
+        self.statuses: Counter = Counter()
+        self.injected_errors = 0
+        self.rate_limited = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+
+    def reset(self):
+        """Drop all items and counters."""
+        with self.lock:
+            self.collections = {}
+            self.next_id = {}
+            self._reset_counters()
+
+    def delay(self) -> float:
+        """Seconds to wait before handling the next request."""
+        if not self.jitter:
+            return self.latency
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+    def admit(self) -> Optional[tuple]:
+        """
+        Apply rate limit and error injection to a request.
+
+        Returns:
+            None to handle the request, or (status, retry_after) to reject it
+        """
+        with self.lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_limit)
+                self._refilled = now
+                if self._tokens < 1:
+                    self.rate_limited += 1
+                    return 429, max(1, math.ceil((1 - self._tokens) / self.rate_limit))
+                self._tokens -= 1
+
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.injected_errors += 1
+                return self.error_status, None
+
+        return None
+
+    def lose_response(self) -> bool:
+        """True if the response to a write just applied should be dropped."""
+        with self.lock:
+            if self.lost_responses <= 0:
+                return False
+            self.lost_responses -= 1
+            return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters snapshot."""
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'connections': self.connections,
+                'statuses': dict(self.statuses),
+                'injected_errors': self.injected_errors,
+                'rate_limited': self.rate_limited,
+                'bytes_received': self.bytes_received,
+                'bytes_sent': self.bytes_sent
+            }
+
+    def insert(self, collection: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert item, assigning the next id. Caller holds the lock."""
+        items = self.collections.setdefault(collection, {})
+        item_id = self.next_id.get(collection, 1)
+        self.next_id[collection] = item_id + 1
+
+        stored = {**item, 'id': item_id}
+        items[item_id] = stored
+        return stored
+
+
+class UnsupportedEncoding(Exception):
+    """Request body uses a Content-Encoding the server does not accept."""
+
+
+def _matches(item: Dict[str, Any], filters: List[tuple]) -> bool:
+    """Check item against (field, op, value) filters."""
+    for field, op, value in filters:
+        actual = item.get(field)
+        actual_str = '' if actual is None else str(actual)
+
+        if op == '_eq' and actual_str != value:
+            return False
+        if op == '_neq' and actual_str == value:
+            return False
+        if op == '_in' and actual_str not in value.split(','):
+            return False
+        if op in ('_gt', '_gte', '_lt', '_lte'):
+            if actual is None:
+                return False
+            try:
+                left, right = float(actual), float(value)
+            except ValueError:
+                left, right = actual_str, value
+            if op == '_gt' and not left > right:
+                return False
+            if op == '_gte' and not left >= right:
+                return False
+            if op == '_lt' and not left < right:
+                return False
+            if op == '_lte' and not left <= right:
+                return False
+    return True
+
+
+def _query_filters(query_filter: Dict[str, Any]) -> Optional[List[tuple]]:
+    """
+    Convert a JSON filter {field: {op: value}} to (field, op, value) tuples.
+
+    Returns:
+        Filter tuples, or None if the filter is not in that form
+    """
+    filters = []
+    for field, ops in query_filter.items():
+        if not isinstance(ops, dict):
+            return None
+        for op, value in ops.items():
+            if isinstance(value, list):
+                value = ','.join(str(v) for v in value)
+            filters.append((field, op, '' if value is None else str(value)))
+    return filters
+
+
+class MockDirectusHandler(BaseHTTPRequestHandler):
+    """Request handler for /items/<collection>[/<id>]."""
+
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self) -> MockDirectusState:
+        return self.server.state
+
+    def setup(self):
+        """Count new TCP connections."""
+        super().setup()
+        # Headers and body go out in separate writes; avoid Nagle stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.state.lock:
+            self.state.connections += 1
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+        pass
+
+    def _send_json(self, status: int, payload: Optional[Any] = None, headers: Optional[Dict[str, str]] = None):
+        """Send JSON response with Content-Length (keeps connection alive)."""
+        if self.command != 'GET' and status < 300 and self.state.lose_response():
+            self.close_connection = True
+            return
+
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        with self.state.lock:
+            self.state.statuses[status] += 1
+            self.state.bytes_sent += len(body)
+
+        self.send_response(status)
+        if body:
+            self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        """Send Directus-style error payload."""
+        self._send_json(status, {'errors': [{'message': message}]}, headers)
+
+    def _read_raw(self) -> bytes:
+        """Read the raw request body."""
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        with self.state.lock:
+            self.state.bytes_received += length
+        return raw
+
+    def _read_body(self) -> Optional[Any]:
+        """
+        Read and decode JSON request body (gzip Content-Encoding supported).
+
+        Raises:
+            UnsupportedEncoding: Body encoding not accepted
+            ValueError: Body is not valid JSON
+        """
+        raw = self._read_raw()
+        if not raw:
+            return None
+
+        encoding = (self.headers.get('Content-Encoding') or 'identity').lower()
+        if encoding == 'gzip' and self.state.accept_gzip:
+            try:
+                raw = zlib.decompress(raw, 31)
+            except zlib.error as e:
+                raise ValueError(e)
+        elif encoding != 'identity':
+            raise UnsupportedEncoding(encoding)
+
+        return json.loads(raw.decode('utf-8'))
+
+    def _route(self):
+        """
+        Parse path and query.
+
+        Returns:
+            (collection, item_id, query params) or None if not an items path
+        """
+        parts = urlsplit(self.path)
+        match = re.match(r'^/items/(\w+)(?:/(\d+))?/?$', parts.path)
+        if not match:
+            return None
+
+        item_id = int(match.group(2)) if match.group(2) else None
+        return match.group(1), item_id, parse_qsl(parts.query)
+
+    def _handle(self, method: str):
+        """Authenticate, route and dispatch a request."""
+        with self.state.lock:
+            self.state.requests += 1
+
+        delay = self.state.delay()
+        if delay:
+            time.sleep(delay)
+
+        rejected = self.state.admit()
+        if rejected is not None:
+            status, retry_after = rejected
+            self._read_raw()
+            if status == 429:
+                self._send_error(429, 'Too many requests.', {'Retry-After': str(retry_after)})
+            else:
+                self._send_error(status, 'Injected failure.')
+            return
+
+        if self.headers.get('Authorization') != f'Bearer {self.state.token}':
+            self._read_body()
+            self._send_error(401, 'Invalid user credentials.')
+            return
+
+        route = self._route()
+        if route is None:
+            self._read_body()
+            self._send_error(404, f'Route {self.path} does not exist.')
+            return
+
+        collection, item_id, params = route
+
+        try:
+            body = self._read_body()
+        except UnsupportedEncoding as e:
+            self._send_error(415, f'Unsupported Content-Encoding "{e}".')
+            return
+        except ValueError:
+            self._send_error(400, 'Invalid JSON body.')
+            return
+
+        handler = getattr(self, f'_{method.lower()}')
+        handler(collection, item_id, params, body)
+
+    def _get(self, collection, item_id, params, body):
+        filters = []
+        limit, offset, fields, sort = 100, 0, None, None
+        for key, value in params:
+            match = FILTER_PARAM_RE.match(key)
+            if match:
+                filters.append((match.group(1), match.group(2), value))
+            elif key == 'limit':
+                limit = int(value)
+            elif key == 'offset':
+                offset = int(value)
+            elif key == 'fields':
+                fields = value.split(',')
+            elif key == 'sort':
+                sort = value
+
+        stop = None if limit == -1 else offset + limit
+
+        with self.state.lock:
+            items = self.state.collections.get(collection, {})
+
+            if item_id is not None:
+                item = dict(items[item_id]) if item_id in items else None
+            else:
+                matched = (item for item in items.values() if _matches(item, filters))
+
+                # Items are stored in id order; other sorts need the full match set
+                if sort and sort != 'id':
+                    field = sort.lstrip('-')
+                    matched = sorted(matched, key=lambda item: (item.get(field) is None, item.get(field)),
+                                     reverse=sort.startswith('-'))
+
+                # Copy only the requested page
+                result = [dict(item) for item in itertools.islice(matched, offset, stop)]
+
+        if item_id is not None:
+            if item is None:
+                self._send_error(403, "You don't have permission to access this.")
+            else:
+                self._send_json(200, {'data': item})
+            return
+
+        if fields and fields != ['*']:
+            result = [{f: item.get(f) for f in fields} for item in result]
+
+        self._send_json(200, {'data': result})
+
+    def _post(self, collection, item_id, params, body):
+        if item_id is not None or not isinstance(body, (dict, list)):
+            self._send_error(400, 'Invalid payload.')
+            return
+
+        # Batches are atomic: one invalid item rejects the whole request
+        batch = body if isinstance(body, list) else [body]
+        required = REQUIRED_FIELDS.get(collection, ())
+        for item in batch:
+            missing = [f for f in required if not isinstance(item, dict) or item.get(f) in (None, '')]
+            if missing:
+                self._send_error(400, f'Validation failed for field "{missing[0]}".')
+                return
+
+        with self.state.lock:
+            if isinstance(body, list):
+                data = [self.state.insert(collection, item) for item in body]
+            else:
+                data = self.state.insert(collection, body)
+
+        self._send_json(200, {'data': data})
+
+    def _patch(self, collection, item_id, params, body):
+        # Batch forms: [{id, ...}, ...] or {"keys": [...], "data": {...}}
+        if item_id is None and isinstance(body, list):
+            updates = [(item.get('id'), item) for item in body if isinstance(item, dict)]
+        elif item_id is None and isinstance(body, dict) and 'keys' in body:
+            updates = [(key, body.get('data') or {}) for key in body['keys']]
+        elif item_id is not None and isinstance(body, dict):
+            updates = [(item_id, body)]
+        else:
+            self._send_error(400, 'Invalid payload.')
+            return
+
+        with self.state.lock:
+            items = self.state.collections.get(collection, {})
+            missing = [key for key, _ in updates if key not in items]
+            data = []
+            if not missing:
+                for key, changes in updates:
+                    items[key].update({k: v for k, v in changes.items() if k != 'id'})
+                    data.append(dict(items[key]))
+
+        if missing:
+            self._send_error(403, "You don't have permission to access this.")
+        else:
+            self._send_json(200, {'data': data[0] if item_id is not None else data})
+
+    def _delete(self, collection, item_id, params, body):
+        # Batch forms: [id, ...], {"keys": [...]} or {"query": {"filter": {...}}}
+        query_filter = None
+        if item_id is not None:
+            keys = [item_id]
+        elif isinstance(body, list):
+            keys = body
+        elif isinstance(body, dict) and 'keys' in body:
+            keys = body['keys']
+        elif isinstance(body, dict) and isinstance((body.get('query') or {}).get('filter'), dict):
+            query_filter = _query_filters(body['query']['filter'])
+            if query_filter is None:
+                self._send_error(400, 'Invalid query filter.')
+                return
+        else:
+            self._send_error(400, 'Invalid payload.')
+            return
+
+        with self.state.lock:
+            items = self.state.collections.get(collection, {})
+            if query_filter is not None:
+                keys = [key for key, item in items.items() if _matches(item, query_filter)]
+            missing = [key for key in keys if key not in items]
+            if not missing:
+                for key in keys:
+                    del items[key]
+
+        if missing:
+            self._send_error(403, "You don't have permission to access this.")
+        else:
+            self._send_json(204)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class MockDirectusServer:
+    """Threaded mock Directus server on a local port."""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        token: str = 'mock-token',
+        latency: float = 0.0,
+        **faults
+    ):
+        """
+        Initialize server (not started).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = any free port)
+            token: Bearer token the server accepts
+            latency: Simulated per-request server latency in seconds
+            **faults: jitter, error_rate, error_status, rate_limit, burst,
+                seed, accept_gzip, lost_responses (see MockDirectusState)
+        """
+        self.token = token
+        self.httpd = ThreadingHTTPServer((host, port), MockDirectusHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = MockDirectusState(token, latency, **faults)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def state(self) -> MockDirectusState:
+        return self.httpd.state
+
+    @property
+    def url(self) -> str:
+        """Base URL for DirectusClient(api_url=...)."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockDirectusServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def items(self, collection: str) -> List[Dict[str, Any]]:
+        """Snapshot of all items in a collection."""
+        with self.state.lock:
+            return list(self.state.collections.get(collection, {}).values())
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+
+
+if __name__ == "__main__":
+    # Example usage: python mock_directus.py [port] [--latency 0.02] [--error-rate 0.05]
+    arg_parser = argparse.ArgumentParser(description="Local mock Directus items API")
+    arg_parser.add_argument('port', type=int, nargs='?', default=8055)
+    arg_parser.add_argument('--token', default='mock-token')
+    arg_parser.add_argument('--latency', type=float, default=0.0, help="Seconds per request")
+    arg_parser.add_argument('--jitter', type=float, default=0.0, help="Extra random seconds per request")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests failed")
+    arg_parser.add_argument('--error-status', type=int, default=503)
+    arg_parser.add_argument('--rate-limit', type=float, default=0.0, help="Requests per second (0 = off)")
+    arg_parser.add_argument('--burst', type=int, default=10)
+    arg_parser.add_argument('--seed', type=int)
+    arg_parser.add_argument('--no-gzip', action='store_true', help="Reject gzip request bodies (415)")
+    args = arg_parser.parse_args()
+
+    server = MockDirectusServer(
+        port=args.port, token=args.token, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status,
+        rate_limit=args.rate_limit, burst=args.burst, seed=args.seed,
+        accept_gzip=not args.no_gzip
+    )
+    print(f"Mock Directus: {server.url} (token: {server.token})")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
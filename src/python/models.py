@@ -111,3 +111,27 @@ class PlayerData:
     player: Player
     seasons: List[Season] = field(default_factory=list)
     goalie_stats: List[GoalieStats] = field(default_factory=list)
+
+    def to_shard_dict(self) -> dict:
+        """
+        Convert to the game's per-player JSON shard format.
+
+        Player fields are flattened to the top level; seasons keep the
+        model's short keys (gp, g, a, pts, pim, ...). Season fields are
+        flat, so their __dict__ is copied instead of asdict's deep copy.
+        """
+        data = self.player.to_dict()
+        data['seasons'] = [dict(vars(season)) for season in self.seasons]
+        if self.goalie_stats:
+            data['goalie_stats'] = [dict(vars(stats)) for stats in self.goalie_stats]
+        return data
+
+    @classmethod
+    def from_shard_dict(cls, data: dict) -> 'PlayerData':
+        """Rebuild PlayerData from a shard dictionary."""
+        player_fields = {key: data.get(key) for key in Player.__dataclass_fields__}
+        return cls(
+            player=Player(**player_fields),
+            seasons=[Season(**season) for season in data.get('seasons') or []],
+            goalie_stats=[GoalieStats(**stats) for stats in data.get('goalie_stats') or []]
+        )
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Player-name prefix index for autocomplete.
+
+Names are folded (accents, apostrophes and case removed: "Ryan O'Reilly"
+-> "ryan oreilly", "Pitea" and "Piteå" -> "pitea"), and every name is
+indexed from each word on, so typing a last name finds the player. The
+exported artifact is a sorted key array plus the player each key
+belongs to; players are stored in popularity order, so ranking a
+prefix range is sorting small integers. Lists for 1-2 letter prefixes
+are precomputed. src/utils/NameIndex.js reads the same file.
+"""
+import bisect
+import heapq
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from models import PlayerData
+
+INDEX_VERSION = 1
+
+# Prefixes up to this length get a precomputed top list
+TOP_PREFIX_LENGTH = 2
+TOP_SIZE = 10
+
+# Letters NFKD does not decompose into an ASCII base letter
+_SPECIAL_LETTERS = str.maketrans({
+    'ø': 'o', 'æ': 'ae', 'œ': 'oe', 'ß': 'ss', 'đ': 'd',
+    'ð': 'd', 'ł': 'l', 'þ': 'th', 'ı': 'i'
+})
+# Dropped without splitting the word: O'Reilly, J.T.
+_JOINERS = re.compile(r"['‘’`´.]")
+_SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+
+def fold_name(name: str) -> str:
+    """
+    Fold a name for matching (same rules as foldName in NameIndex.js).
+
+    Lowercase, accents removed, apostrophes and periods dropped, any
+    other punctuation or whitespace run becomes one space.
+
+    Args:
+        name: Player name or user input
+
+    Returns:
+        Folded name ("Tomas Holmström" -> "tomas holmstrom")
+    """
+    text = name.lower().translate(_SPECIAL_LETTERS)
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    text = _JOINERS.sub('', text)
+    return _SEPARATORS.sub(' ', text).strip()
+
+
+def name_keys(name: str) -> List[str]:
+    """
+    Index keys of a name: the folded name from each word on.
+
+    Args:
+        name: Player name
+
+    Returns:
+        Keys ("Ryan O'Reilly" -> ["ryan oreilly", "oreilly"])
+    """
+    words = fold_name(name).split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+def popularity(player_data: PlayerData) -> int:
+    """
+    Ranking score: NHL games played plus points, regular season and
+    playoffs (goalies: games played).
+
+    Args:
+        player_data: Parsed player
+
+    Returns:
+        Score (0 for players without NHL games)
+    """
+    score = 0
+    for season in player_data.seasons:
+        if season.league == 'NHL':
+            score += season.gp + season.pts + season.playoff_gp + season.playoff_pts
+    for stats in player_data.goalie_stats:
+        if stats.league == 'NHL':
+            score += stats.gp
+    return score
+
+
+def build_prefix_index(players: Iterable[Tuple[str, str, float]]) -> dict:
+    """
+    Build the autocomplete index.
+
+    Args:
+        players: (id, display name, popularity) per player
+
+    Returns:
+        {"version", "players": [[id, name]] most popular first,
+        "keys": sorted folded keys, "refs": player index per key,
+        "top": {prefix: player indices} for short prefixes}
+    """
+    ranked = sorted(players, key=lambda p: (-p[2], fold_name(p[1]), p[0]))
+
+    pairs = sorted(
+        (key, number)
+        for number, (_, name, _) in enumerate(ranked)
+        for key in name_keys(name)
+    )
+
+    members: Dict[str, Set[int]] = {}
+    for key, number in pairs:
+        for length in range(1, min(TOP_PREFIX_LENGTH, len(key)) + 1):
+            members.setdefault(key[:length], set()).add(number)
+    top = {prefix: heapq.nsmallest(TOP_SIZE, numbers) for prefix, numbers in sorted(members.items())}
+
+    return {
+        'version': INDEX_VERSION,
+        'players': [[player_id, name] for player_id, name, _ in ranked],
+        'keys': [key for key, _ in pairs],
+        'refs': [number for _, number in pairs],
+        'top': top
+    }
+
+
+class PrefixIndex:
+    """Lookup over a build_prefix_index artifact."""
+
+    def __init__(self, data: dict):
+        """
+        Args:
+            data: Artifact from build_prefix_index (or its JSON)
+        """
+        self.players = data['players']
+        self.keys = data['keys']
+        self.refs = data['refs']
+        self.top = data.get('top', {})
+
+    def search(self, query: str, limit: int = TOP_SIZE) -> List[Tuple[str, str]]:
+        """
+        Players with a name word starting with query, most popular first.
+
+        Args:
+            query: User input (folded here)
+            limit: Maximum results
+
+        Returns:
+            (id, name) pairs
+        """
+        prefix = fold_name(query)
+        if not prefix:
+            return []
+
+        if prefix in self.top and limit <= TOP_SIZE:
+            numbers = self.top[prefix][:limit]
+        else:
+            found = set()
+            i = bisect.bisect_left(self.keys, prefix)
+            while i < len(self.keys) and self.keys[i].startswith(prefix):
+                found.add(self.refs[i])
+                i += 1
+            numbers = sorted(found)[:limit]
+
+        return [tuple(self.players[number]) for number in numbers]
+
+
+def index_players(
+    players: List[PlayerData],
+    ids: List[str],
+    extra: Optional[Iterable[Tuple[str, str]]] = None
+) -> dict:
+    """
+    Prefix index of parsed players ranked by popularity.
+
+    Args:
+        players: Parsed players
+        ids: Player id (slug) per player
+        extra: (id, name) of players without parsed data (ranked last)
+
+    Returns:
+        Index artifact (see build_prefix_index)
+    """
+    entries = [(player_id, p.player.name, popularity(p)) for player_id, p in zip(ids, players)]
+    entries += [(player_id, name, 0) for player_id, name in extra or []]
+    return build_prefix_index(entries)
+
+
+if __name__ == "__main__":
+    # Example usage
+    index = PrefixIndex(build_prefix_index([
+        ('oreilly', "Ryan O'Reilly", 1200),
+        ('holmstrom', 'Tomas Holmström', 1400),
+        ('kadri', 'Nazem Kadri', 1100),
+        ('hossa', 'Marian Hossa', 1700)
+    ]))
+    for query in ['ho', "o'r", 'holmström', 'na']:
+        print(f"{ascii(query)} -> {index.search(query)}")
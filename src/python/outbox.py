@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""
+Durable upload outbox for Directus.
+Parsed players are queued in a local SQLite database (WAL mode) and
+drained in batches, in the foreground or by a background worker. Each
+operation carries an idempotency key (the player's natural key, name and
+birth date), so a player is queued once however often its stats change:
+re-enqueueing new content replaces the payload and sends it again.
+Operations interrupted mid-flight, and updates of players already
+uploaded, are reconciled against Directus on replay so nothing is
+created twice and the latest statistics replace the old ones.
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api_client import DirectusClient, upload_record, upload_records_batch
+from sync import changed_fields, player_key
+
+# Operation states
+PENDING = 'pending'
+INFLIGHT = 'inflight'
+DONE = 'done'
+DEAD = 'dead'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT,
+    payload TEXT NOT NULL,
+    content TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    player_id INTEGER,
+    last_error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_ready ON outbox (status, next_attempt, seq);
+"""
+
+
+def idempotency_key(payload: Dict[str, Any]) -> str:
+    """
+    Key of an upload operation: the player's natural key, so changed
+    statistics update the same operation instead of queueing a new one.
+
+    Args:
+        payload: {'player': {...}, 'statistics': [...]}
+
+    Returns:
+        SHA-256 hex digest of the player's (name, birth date)
+    """
+    canonical = json.dumps(player_key(payload['player']), separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    """
+    Hash of an operation's payload (detects changed content).
+
+    Args:
+        payload: {'player': {...}, 'statistics': [...]}
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON payload
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class OutboxItem:
+    """A claimed outbox operation."""
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+    player_id: Optional[int] = None
+    content: Optional[str] = None
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.payload['player'].get('name')
+
+    @property
+    def is_replay(self) -> bool:
+        """True if an earlier attempt (or upload) may have reached the server."""
+        return self.attempts > 1 or self.player_id is not None
+
+
+class Outbox:
+    """SQLite-backed queue of pending player uploads."""
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 10,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Open (or create) the outbox.
+
+        Operations left in flight by a crashed process are returned to
+        pending and will be reconciled before being resent.
+
+        Args:
+            path: SQLite database file
+            max_attempts: Attempts before an operation is marked dead
+            backoff_base: Retry delay base in seconds (doubles per attempt)
+            backoff_max: Maximum retry delay in seconds
+            clock: Time source (epoch seconds)
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if 'content' not in columns:
+            self._rekey()
+
+        self.recovered = self._execute(
+            "UPDATE outbox SET status = ? WHERE status = ?", (PENDING, INFLIGHT)
+        ).rowcount
+
+    def _rekey(self):
+        """
+        Upgrade an outbox keyed by payload hash to player keys.
+
+        Of several operations for one player the latest is kept; it
+        inherits an earlier operation's player id, so it is reconciled
+        (replay) instead of creating the player again.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN content TEXT")
+            latest: Dict[str, list] = {}
+            superseded = []
+            for seq, payload, player_id in self._conn.execute(
+                "SELECT seq, payload, player_id FROM outbox ORDER BY seq"
+            ).fetchall():
+                payload = json.loads(payload)
+                key = idempotency_key(payload)
+                previous = latest.get(key)
+                if previous is not None:
+                    superseded.append((previous[0],))
+                    player_id = player_id or previous[2]
+                latest[key] = [seq, content_hash(payload), player_id]
+
+            self._conn.executemany("DELETE FROM outbox WHERE seq = ?", superseded)
+            self._conn.executemany(
+                "UPDATE outbox SET key = ?, content = ?, player_id = ? WHERE seq = ?",
+                [(key, content, player_id, seq) for key, (seq, content, player_id) in latest.items()]
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Run one statement in its own transaction."""
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def enqueue(self, player_data) -> bool:
+        """
+        Queue one player upload.
+
+        Returns:
+            True if queued (or its payload changed), False if an identical
+            operation already exists
+        """
+        return self.enqueue_many([player_data]) == 1
+
+    def enqueue_many(self, players: Iterable) -> int:
+        """
+        Queue player uploads in one transaction.
+
+        A player already queued (same idempotency key) with the same
+        payload is ignored, so re-running the parse stage does not queue
+        duplicates. A changed payload replaces the queued one: a done or
+        dead operation returns to pending, and one in flight is sent
+        again once its current attempt completes.
+
+        Args:
+            players: PlayerData objects
+
+        Returns:
+            Number of operations newly queued or updated
+        """
+        now = self.clock()
+        rows = []
+        for player_data in players:
+            payload = upload_record(player_data)
+            rows.append((
+                idempotency_key(payload), payload['player'].get('name'),
+                json.dumps(payload), content_hash(payload), now, now
+            ))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO outbox (key, name, payload, content, created, updated)"
+                    " VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET"
+                    " name = excluded.name, payload = excluded.payload, content = excluded.content,"
+                    " attempts = CASE WHEN status = 'dead' THEN 0 ELSE attempts END,"
+                    " next_attempt = CASE WHEN status = 'dead' THEN 0 ELSE next_attempt END,"
+                    " status = CASE WHEN status = 'inflight' THEN status ELSE 'pending' END,"
+                    " updated = excluded.updated"
+                    " WHERE content IS NOT excluded.content",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def claim(self, limit: int = 50) -> List[OutboxItem]:
+        """
+        Mark up to limit ready operations in flight and return them.
+
+        The attempt counter is committed before anything is sent, so a
+        crash after this point is detected as a replay on restart.
+
+        Args:
+            limit: Maximum operations to claim
+
+        Returns:
+            Claimed items in queue order
+        """
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT seq, key, payload, attempts, player_id, content FROM outbox"
+                    " WHERE status = ? AND next_attempt <= ? ORDER BY seq LIMIT ?",
+                    (PENDING, now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, attempts = attempts + 1, updated = ? WHERE seq = ?",
+                    [(INFLIGHT, now, row[0]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [
+            OutboxItem(
+                key=key, payload=json.loads(payload), attempts=attempts + 1,
+                player_id=player_id, content=content
+            )
+            for _, key, payload, attempts, player_id, content in rows
+        ]
+
+    def checkpoint(self, key: str, player_id: int):
+        """Record the created player id of an in-flight operation."""
+        self._execute(
+            "UPDATE outbox SET player_id = ?, updated = ? WHERE key = ?",
+            (player_id, self.clock(), key)
+        )
+
+    def complete(self, key: str, player_id: Optional[int] = None, content: Optional[str] = None):
+        """
+        Mark an operation done.
+
+        Args:
+            key: Idempotency key
+            player_id: Uploaded player's id
+            content: content_hash of the payload that was sent; if the
+                payload was replaced meanwhile, the operation returns to
+                pending to send the new one
+        """
+        self._execute(
+            "UPDATE outbox SET status = CASE WHEN content IS ? THEN ? ELSE ? END,"
+            " next_attempt = 0, player_id = COALESCE(?, player_id),"
+            " last_error = NULL, updated = ? WHERE key = ?",
+            (content, DONE, PENDING, player_id, self.clock(), key)
+        )
+
+    def fail(self, key: str, error: str, player_id: Optional[int] = None):
+        """
+        Return an operation to pending with exponential backoff.
+
+        After max_attempts the operation is marked dead instead.
+
+        Args:
+            key: Idempotency key
+            error: Failure description
+            player_id: Player id if the player was created (skips it on retry)
+        """
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM outbox WHERE key = ?", (key,)).fetchone()
+            attempts = row[0] if row else 0
+            status = DEAD if attempts >= self.max_attempts else PENDING
+            delay = min(self.backoff_max, self.backoff_base * 2 ** max(attempts - 1, 0))
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, next_attempt = ?, last_error = ?,"
+                " player_id = COALESCE(?, player_id), updated = ? WHERE key = ?",
+                (status, now + delay, error, player_id, now, key)
+            )
+
+    def retry_dead(self) -> int:
+        """Return dead operations to pending. Returns count."""
+        return self._execute(
+            "UPDATE outbox SET status = ?, attempts = 0, next_attempt = 0 WHERE status = ?",
+            (PENDING, DEAD)
+        ).rowcount
+
+    def purge_done(self) -> int:
+        """Delete completed operations. Returns count."""
+        return self._execute("DELETE FROM outbox WHERE status = ?", (DONE,)).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of operations per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = {PENDING: 0, INFLIGHT: 0, DONE: 0, DEAD: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def ready(self) -> int:
+        """Operations in flight or ready to send now (not backing off)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = ? OR (status = ? AND next_attempt <= ?)",
+                (INFLIGHT, PENDING, self.clock())
+            ).fetchone()[0]
+
+    def pending(self) -> int:
+        """Operations not yet done or dead."""
+        counts = self.counts()
+        return counts[PENDING] + counts[INFLIGHT]
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+@dataclass
+class DrainReport:
+    """Outcome of draining the outbox."""
+    uploaded: int = 0
+    failed: int = 0
+    reconciled: int = 0
+    batches: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'uploaded': self.uploaded,
+            'failed': self.failed,
+            'reconciled': self.reconciled,
+            'batches': self.batches,
+            'errors': self.errors
+        }
+
+
+def _find_player(
+    client: DirectusClient,
+    player: Dict[str, Any],
+    player_id: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Remote player with player_id, else one matching name and birth date, if any."""
+    if player_id is not None:
+        filters = {'id': player_id}
+    else:
+        filters = {f: player.get(f) for f in ('name', 'birth_date') if player.get(f) is not None}
+    matches = client.list_items('players', filters=filters, limit=1)
+    if matches is None:
+        raise ConnectionError("player lookup failed")
+    if not matches and player_id is not None:
+        return _find_player(client, player)
+    return matches[0] if matches else None
+
+
+def _replay(item: OutboxItem, outbox: Outbox, client: DirectusClient) -> Optional[int]:
+    """
+    Upload an operation that may have partly reached the server, or
+    update a player uploaded before.
+
+    The player is looked up before being created (and patched if its
+    fields changed); its statistics are then made to match the payload
+    with replace_statistics, so a replay sends nothing already there
+    and changed stats replace the old rows.
+
+    Returns:
+        Player id
+
+    Raises:
+        ConnectionError: If a request failed (operation stays pending)
+    """
+    player = item.payload['player']
+    statistics = item.payload['statistics']
+
+    remote = _find_player(client, player, item.player_id)
+    if remote is None:
+        player_id = client.create_player(player)
+        if not player_id:
+            raise ConnectionError("player create failed")
+    else:
+        player_id = remote['id']
+        changes = changed_fields(player, remote)
+        if changes and not client.update_player(player_id, changes):
+            raise ConnectionError("player update failed")
+    outbox.checkpoint(item.key, player_id)
+
+    if statistics and not client.replace_statistics(player_id, statistics):
+        raise ConnectionError("statistics replace failed")
+
+    return player_id
+
+
+def drain_outbox(
+    outbox: Outbox,
+    client: DirectusClient,
+    batch_size: int = 50,
+    max_batches: Optional[int] = None,
+    stop: Optional[threading.Event] = None
+) -> DrainReport:
+    """
+    Upload ready operations in batches until none are ready.
+
+    First attempts go through upload_records_batch; replays of
+    operations that may have reached the server, and updates of players
+    uploaded before, are reconciled one by one so each player is
+    created exactly once and ends up with the latest statistics. A batch
+    whose outcome is unknown (timeout, dropped connection) is never
+    re-POSTed: its operations fail and come back as replays.
+
+    Args:
+        outbox: Outbox instance
+        client: DirectusClient instance
+        batch_size: Operations claimed per batch
+        max_batches: Stop after this many batches (default: no limit)
+        stop: Event that ends draining after the current batch
+
+    Returns:
+        DrainReport
+    """
+    report = DrainReport()
+
+    while max_batches is None or report.batches < max_batches:
+        if stop is not None and stop.is_set():
+            break
+
+        items = outbox.claim(batch_size)
+        if not items:
+            break
+        report.batches += 1
+
+        fresh = [item for item in items if not item.is_replay]
+        replays = [item for item in items if item.is_replay]
+
+        if fresh:
+            results = upload_records_batch([item.payload for item in fresh], client)
+            for item, result in zip(fresh, results):
+                if result.ok:
+                    outbox.complete(item.key, result.player_id, item.content)
+                    report.uploaded += 1
+                else:
+                    outbox.fail(item.key, result.error, result.player_id)
+                    report.failed += 1
+                    report.errors.append(f"{item.name}: {result.error}")
+
+        for item in replays:
+            try:
+                player_id = _replay(item, outbox, client)
+            except ConnectionError as e:
+                outbox.fail(item.key, str(e))
+                report.failed += 1
+                report.errors.append(f"{item.name}: {e}")
+                continue
+            outbox.complete(item.key, player_id, item.content)
+            report.reconciled += 1
+
+    return report
+
+
+class OutboxWorker:
+    """Background thread that drains the outbox as operations arrive."""
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        client: DirectusClient,
+        batch_size: int = 50,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize worker (not started).
+
+        Args:
+            outbox: Outbox instance
+            client: DirectusClient instance
+            batch_size: Operations per batch
+            poll_interval: Seconds between polls when the outbox is idle
+        """
+        self.outbox = outbox
+        self.client = client
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.report = DrainReport()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'OutboxWorker':
+        """Start draining in a background thread."""
+        self._thread = threading.Thread(target=self._run, name='outbox-worker', daemon=True)
+        self._thread.start()
+        return self
+
+    def notify(self):
+        """Wake the worker after enqueueing."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                drained = drain_outbox(self.outbox, self.client, self.batch_size, stop=self._stop)
+            except Exception as e:
+                print(f"Outbox worker error: {e}")
+                drained = DrainReport()
+
+            self.report.uploaded += drained.uploaded
+            self.report.failed += drained.failed
+            self.report.reconciled += drained.reconciled
+            self.report.batches += drained.batches
+            self.report.errors.extend(drained.errors)
+
+            self._wake.wait(self.poll_interval)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no operations are ready or in flight.
+
+        Operations backing off after a failure do not count as ready.
+
+        Returns:
+            True if idle before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if not self.outbox.ready():
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self.notify()
+            time.sleep(0.05)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish the current batch and stop."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+
+
+def main() -> int:
+    """
+    Outbox command line: status, drain, retry-dead, purge.
+
+    Returns:
+        0 on success, 1 if operations remain pending or dead
+    """
+    arg_parser = argparse.ArgumentParser(description="Durable Directus upload outbox")
+    arg_parser.add_argument('command', choices=['status', 'drain', 'retry-dead', 'purge'])
+    arg_parser.add_argument('path', help="Outbox database file")
+    arg_parser.add_argument('--batch-size', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    with Outbox(args.path) as outbox:
+        if outbox.recovered:
+            print(f"Recovered {outbox.recovered} interrupted operations")
+
+        if args.command == 'drain':
+            with DirectusClient() as client:
+                report = drain_outbox(outbox, client, args.batch_size)
+            print(
+                f"Drain: uploaded {report.uploaded}, reconciled {report.reconciled},"
+                f" failed {report.failed} in {report.batches} batches"
+            )
+
+        elif args.command == 'retry-dead':
+            print(f"Retry: {outbox.retry_dead()} operations returned to pending")
+
+        elif args.command == 'purge':
+            print(f"Purge: {outbox.purge_done()} completed operations deleted")
+
+        counts = outbox.counts()
+        for status, count in counts.items():
+            print(f"{status}: {count}")
+
+    return 0 if counts[PENDING] + counts[DEAD] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
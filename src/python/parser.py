@@ -3,8 +3,17 @@ Parser for hockey player text data.
 Extracts player information and statistics from HockeyDB text format.
 """
 import re
+import time
 from typing import List, Tuple, Optional
 from models import Player, Season, GoalieStats, PlayerData
+from metrics import REGISTRY
+
+PLAYERS_PARSED = REGISTRY.counter('parser_players_total', 'Player pages parsed', ['kind'])
+ROWS_PARSED = REGISTRY.counter('parser_rows_total', 'Statistics rows parsed', ['table'])
+PARSE_SECONDS = REGISTRY.histogram(
+    'parser_seconds', 'Time to parse one player page',
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+)
 
 
 def _safe_int(value: str, default: int = 0) -> int:
@@ -294,6 +303,7 @@ def parse_player_data(text: str) -> PlayerData:
     Returns:
         PlayerData object with player info and statistics
     """
+    start = time.perf_counter()
     lines = text.strip().split('\n')
 
     player = parse_player_info(lines)
@@ -303,15 +313,21 @@ def parse_player_data(text: str) -> PlayerData:
 
     if is_goalie:
         goalie_stats = parse_goalie_stats(lines)
-        return PlayerData(player=player, goalie_stats=goalie_stats)
+        ROWS_PARSED.inc(len(goalie_stats), table='goalie_stats')
+        result = PlayerData(player=player, goalie_stats=goalie_stats)
     else:
         seasons = parse_season_stats(lines)
-        return PlayerData(player=player, seasons=seasons)
+        ROWS_PARSED.inc(len(seasons), table='seasons')
+        result = PlayerData(player=player, seasons=seasons)
 
+    PLAYERS_PARSED.inc(kind='goalie' if is_goalie else 'skater')
+    PARSE_SECONDS.observe(time.perf_counter() - start)
+    return result
 
-def parse_multiple_players(text: str) -> List[PlayerData]:
+
+def split_player_sections(text: str) -> List[str]:
     """
-    Parse multiple players from single text file.
+    Split a multi-player text file into one text section per player.
 
     Players are separated by detecting name lines followed by position lines.
 
@@ -319,9 +335,8 @@ def parse_multiple_players(text: str) -> List[PlayerData]:
         text: Text containing multiple players
 
     Returns:
-        List of PlayerData objects
+        Player text sections in file order
     """
-    players = []
     lines = text.strip().split('\n')
 
     # Find player boundaries by detecting position lines
@@ -335,7 +350,7 @@ def parse_multiple_players(text: str) -> List[PlayerData]:
                     player_starts.append(j)
                     break
 
-    # Parse each player section
+    sections = []
     for i, start_idx in enumerate(player_starts):
         # Determine end of this player's data
         if i + 1 < len(player_starts):
@@ -343,10 +358,25 @@ def parse_multiple_players(text: str) -> List[PlayerData]:
         else:
             end_idx = len(lines)
 
-        # Extract player section
-        player_lines = lines[start_idx:end_idx]
-        player_text = '\n'.join(player_lines)
+        sections.append('\n'.join(lines[start_idx:end_idx]))
+
+    return sections
+
+
+def parse_multiple_players(text: str) -> List[PlayerData]:
+    """
+    Parse multiple players from single text file.
+
+    Args:
+        text: Text containing multiple players
 
+    Returns:
+        List of PlayerData objects
+    """
+    players = []
+
+    # Parse each player section
+    for player_text in split_player_sections(text):
         try:
             player_data = parse_player_data(player_text)
             if player_data.player.name and player_data.player.name != "Unknown":
@@ -2,19 +2,33 @@
 """
 Complete hockey data pipeline: scrape -> parse -> upload
 Comprehensive script following one-execution principle.
+
+Scraping (selenium) and upload (requests) modules are imported only when
+their stage runs, so parse-only runs start fast and need neither installed.
 """
 import sys
 import os
-from typing import List
+import argparse
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, List, Optional
 from pathlib import Path
 
 # Add src/python to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from models import PlayerData
-from parser import load_data_file, parse_player_data
-from scraper import HockeyDBScraper
-from api_client import DirectusClient, upload_player_data
+from parser import load_data_file, parse_player_data, split_player_sections
+from archive import PageArchive
+from stages import PipelineReport, Stage, StagedPipeline, print_stage_report
+from metrics import REGISTRY, write_metrics
+from profiling import StageProfiler, print_profile_report
+
+if TYPE_CHECKING:
+    from build_graph import BuildReport
+
+RUN_SECONDS = REGISTRY.gauge('pipeline_run_seconds', 'Wall time of the pipeline run')
+RUN_EXIT_CODE = REGISTRY.gauge('pipeline_exit_code', 'Pipeline exit code (0=success)')
 
 
 def validate_environment() -> bool:
@@ -51,6 +65,8 @@ def scrape_players(player_ids: List[int], output_dir: str = '.') -> bool:
     print("\n=== SCRAPING PLAYERS ===")
 
     try:
+        from scraper import HockeyDBScraper
+
         with HockeyDBScraper(headless=True) as scraper:
             success_count = 0
 
@@ -102,12 +118,18 @@ def parse_data_file(file_path: str) -> List[PlayerData]:
         return []
 
 
-def upload_data(players: List[PlayerData]) -> bool:
+def upload_data(
+    players: List[PlayerData],
+    sync: bool = False,
+    delete_missing: bool = False
+) -> bool:
     """
     Upload player data to Directus.
 
     Args:
         players: List of PlayerData objects
+        sync: Diff against existing records instead of creating all
+        delete_missing: In sync mode, delete remote players not in players
 
     Returns:
         True if all successful, False otherwise
@@ -117,15 +139,21 @@ def upload_data(players: List[PlayerData]) -> bool:
     if not validate_environment():
         return False
 
+    if sync:
+        return sync_data(players, delete_missing)
+
     try:
-        client = DirectusClient()
-        success_count = 0
+        from api_client import DirectusClient, upload_players_batch
 
-        for player_data in players:
-            if upload_player_data(player_data, client):
+        with DirectusClient() as client:
+            results = upload_players_batch(players, client)
+
+        success_count = 0
+        for result in results:
+            if result.ok:
                 success_count += 1
             else:
-                print(f"FAILED - {player_data.player.name}")
+                print(f"FAILED - {result.name}: {result.error}")
 
         print(f"\nUpload: OK - {success_count}/{len(players)} players")
         return success_count == len(players)
@@ -135,29 +163,478 @@ def upload_data(players: List[PlayerData]) -> bool:
         return False
 
 
-def main() -> int:
+def sync_data(players: List[PlayerData], delete_missing: bool = False) -> bool:
+    """
+    Sync player data to Directus, writing only what changed.
+
+    Args:
+        players: List of PlayerData objects
+        delete_missing: Delete remote players not in players
+
+    Returns:
+        True if all writes succeeded, False otherwise
+    """
+    try:
+        from api_client import DirectusClient
+        from sync import sync_players
+
+        with DirectusClient() as client:
+            report = sync_players(players, client, delete_missing=delete_missing)
+
+        for error in report.errors:
+            print(f"FAILED - {error}")
+
+        status = "OK" if report.ok else "FAILED"
+        print(f"\nSync: {status} - {report.write_requests} write requests")
+        return report.ok
+
+    except Exception as e:
+        print(f"\nSync: FAILED - {e}")
+        return False
+
+
+def queue_data(players: List[PlayerData], outbox_path: str) -> bool:
+    """
+    Queue player data in the durable outbox, then drain it if Directus is configured.
+
+    Players stay queued across runs until uploaded, so an unavailable
+    API does not lose parsed data.
+
+    Args:
+        players: List of PlayerData objects
+        outbox_path: Outbox database file
+
+    Returns:
+        True if the players were queued, False otherwise
+    """
+    print("\n=== QUEUEING UPLOADS ===")
+
+    try:
+        from outbox import Outbox, drain_outbox
+
+        with Outbox(outbox_path) as outbox:
+            if outbox.recovered:
+                print(f"Recovered {outbox.recovered} interrupted uploads")
+
+            added = outbox.enqueue_many(players)
+            print(f"Queued: {added} new or changed, {len(players) - added} already queued")
+
+            if os.getenv('DIRECTUS_TOKEN'):
+                from api_client import DirectusClient
+
+                with DirectusClient() as client:
+                    report = drain_outbox(outbox, client)
+                for error in report.errors:
+                    print(f"FAILED - {error}")
+                print(f"Drained: {report.uploaded} uploaded, {report.reconciled} reconciled")
+
+            print(f"Outbox: {outbox.pending()} pending, {outbox.counts()['dead']} dead")
+        return True
+
+    except Exception as e:
+        print(f"Queue: FAILED - {e}")
+        return False
+
+
+def export_data(
+    players: List[PlayerData],
+    data_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    prune: bool = False,
+    bundles: int = 0,
+    compress: bool = False,
+    hashed: bool = False,
+    autocomplete: bool = False,
+    fuzzy: bool = False
+) -> bool:
+    """
+    Write game data shards and manifest.json for parsed players.
+
+    Args:
+        players: List of PlayerData objects
+        data_dir: Game data directory (default: src/data)
+        workers: Serialization worker processes (default: CPU count)
+        prune: Remove shards of players not in this export
+        bundles: Also pack players into this many bundles (0: none)
+        compress: Also write precompressed .gz/.br variants
+        hashed: Content-hashed shard and bundle file names
+        autocomplete: Also write the name prefix index (autocomplete.json)
+        fuzzy: Also write the typo-tolerant name index (fuzzy.json)
+
+    Returns:
+        True if every shard was exported, False otherwise
+    """
+    try:
+        from export import export_players, print_export_report
+
+        report = export_players(
+            players, data_dir=data_dir, workers=workers, prune=prune,
+            bundles=bundles, compress=compress, hashed=hashed,
+            autocomplete=autocomplete, fuzzy=fuzzy
+        )
+    except (ImportError, OSError, ValueError) as e:
+        print(f"Export: FAILED - {e}")
+        return False
+
+    print_export_report(report)
+    return report.ok
+
+
+def run_staged(
+    player_ids: Optional[Iterable[int]] = None,
+    archive_dir: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    scrape_workers: int = 2,
+    parse_workers: int = 1,
+    upload_workers: int = 1,
+    queue_size: int = 32,
+    upload_batch_size: int = 50,
+    profiler: Optional[StageProfiler] = None
+) -> PipelineReport:
+    """
+    Scrape, parse and upload concurrently through bounded queues.
+
+    Pages come from scraping player_ids, or from a page archive (no
+    scraping). Upload runs only when DIRECTUS_TOKEN is set.
+
+    Args:
+        player_ids: HockeyDB player IDs to scrape
+        archive_dir: PageArchive directory to read pages from instead
+        output_dir: Also save scraped pages here as player_<id>.txt
+        scrape_workers: Concurrent browsers
+        parse_workers: Parser threads
+        upload_workers: Concurrent upload batches
+        queue_size: Bound of each inter-stage queue
+        upload_batch_size: Players per upload batch
+        profiler: Profiles each stage's function calls (CPU only)
+
+    Returns:
+        PipelineReport with per-stage utilization; failed scrapes and
+        failed uploads are counted as stage errors
+    """
+    print("\n=== STAGED PIPELINE ===")
+
+    wrap = profiler.wrap if profiler is not None else (lambda name, func: func)
+    stages = []
+    closers = []
+
+    if archive_dir:
+        archive = PageArchive(archive_dir)
+        closers.append(archive)
+        source = (text for _, text, _ in archive.iter_pages())
+    else:
+        from rate_control import AdaptiveRateController
+        from scraper import HockeyDBScraper
+
+        rate = AdaptiveRateController()
+        local = threading.local()
+        lock = threading.Lock()
+
+        def scrape(player_id: int) -> str:
+            scraper = getattr(local, 'scraper', None)
+            if scraper is None:
+                scraper = HockeyDBScraper(headless=True)
+                local.scraper = scraper
+                with lock:
+                    closers.append(scraper)
+
+            rate.acquire()
+            content = scraper.scrape_player_by_id(player_id)
+            rate.record(scraper.last_load_time, error=not content)
+            if not content:
+                raise RuntimeError(f"player {player_id}: no page scraped")
+
+            if output_dir:
+                scraper.save_to_file(content, f"{output_dir}/player_{player_id}.txt")
+            return content
+
+        source = player_ids or []
+        stages.append(Stage('scrape', wrap('scrape', scrape), workers=scrape_workers, queue_size=queue_size))
+
+    def parse(text: str) -> Optional[PlayerData]:
+        player_data = parse_player_data(text)
+        return player_data if player_data.player.name else None
+
+    stages.append(Stage('parse', wrap('parse', parse), workers=parse_workers, queue_size=queue_size))
+
+    client = None
+    if os.getenv('DIRECTUS_TOKEN'):
+        from api_client import DirectusClient, upload_players_batch
+
+        client = DirectusClient(pool_size=max(upload_workers, 1) * 2)
+        closers.append(client)
+        stages.append(Stage(
+            'upload', wrap('upload', lambda batch: upload_players_batch(batch, client)),
+            workers=upload_workers, queue_size=queue_size, batch_size=upload_batch_size,
+            failure=lambda result: None if result.ok else f"{result.name}: {result.error}"
+        ))
+    else:
+        print("Upload stage skipped (set DIRECTUS_TOKEN to enable)")
+
+    try:
+        report = StagedPipeline(stages, collect=True).run(source)
+    finally:
+        for closer in closers:
+            closer.close()
+
+    print_stage_report(report)
+
+    if client is not None:
+        ok = sum(1 for result in report.results if result.ok)
+        print(f"Upload: {ok}/{len(report.results)} players")
+    else:
+        print(f"Parsed: {len(report.results)} players")
+
+    return report
+
+
+def build_incremental(
+    data_file: str,
+    archive_dir: Optional[str] = None,
+    data_dir: Optional[str] = None,
+    state_path: str = 'build_state.db',
+    dry_run: bool = False
+) -> 'BuildReport':
+    """
+    Rebuild only stale parsed records, shards and uploads.
+
+    Args:
+        data_file: Player data text file (used when archive_dir is None)
+        archive_dir: PageArchive directory to read pages from instead
+        data_dir: Game data directory for shards and manifest (default: src/data)
+        state_path: Build state database
+        dry_run: List what would be rebuilt without doing it
+
+    Returns:
+        BuildReport
+    """
+    from build_graph import print_build_report, run_incremental
+
+    print("\n=== INCREMENTAL BUILD ===")
+
+    if archive_dir:
+        with PageArchive(archive_dir) as archive:
+            pages = [text for _, text, _ in archive.iter_pages()]
+    else:
+        with open(data_file, 'r', encoding='utf-8') as f:
+            pages = split_player_sections(f.read())
+    print(f"Pages: {len(pages)}")
+
+    client = None
+    if os.getenv('DIRECTUS_TOKEN'):
+        from api_client import DirectusClient
+
+        client = DirectusClient()
+    else:
+        print("Upload nodes skipped (set DIRECTUS_TOKEN to enable)")
+
+    try:
+        report = run_incremental(pages, data_dir=data_dir, state_path=state_path, client=client, dry_run=dry_run)
+    finally:
+        if client is not None:
+            client.close()
+
+    print_build_report(report)
+    return report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (default: sys.argv[1:])
+
+    Returns:
+        Parsed arguments
+    """
+    arg_parser = argparse.ArgumentParser(description="Hockey data pipeline: scrape -> parse -> upload")
+    arg_parser.add_argument(
+        '--data-file',
+        default="C:\\Users\\Xena\\source\\repos\\hockeyGame\\data_player.txt",
+        help="Player data text file to parse"
+    )
+    arg_parser.add_argument(
+        '--sync', action='store_true',
+        help="Diff against existing Directus records instead of creating all"
+    )
+    arg_parser.add_argument(
+        '--delete-missing', action='store_true',
+        help="With --sync, delete Directus players not in the data file"
+    )
+    arg_parser.add_argument(
+        '--outbox', metavar='PATH',
+        help="Queue uploads in a durable outbox database and drain it"
+    )
+
+    arg_parser.add_argument(
+        '--metrics-dir', metavar='DIR',
+        help="Write pipeline_metrics.json and pipeline_metrics.prom here (default: not written)"
+    )
+    arg_parser.add_argument('--no-metrics', action='store_true', help="Do not write metrics files")
+    arg_parser.add_argument(
+        '--profile', action='store_true',
+        help="Profile each stage with cProfile and tracemalloc"
+    )
+    arg_parser.add_argument('--profile-dir', default='profile', help="Directory for profile output")
+    arg_parser.add_argument('--profile-top', type=int, default=20, help="Hotspots kept per stage")
+
+    incremental = arg_parser.add_argument_group("incremental mode (rebuild only what changed)")
+    incremental.add_argument(
+        '--incremental', action='store_true',
+        help="Parse, write shards and upload only pages whose content or code changed"
+    )
+    incremental.add_argument('--dry-run', action='store_true', help="List what would be rebuilt and exit")
+    incremental.add_argument('--build-state', default='build_state.db', help="Build state database")
+    incremental.add_argument('--data-dir', help="Game data directory (default: src/data)")
+
+    export = arg_parser.add_argument_group("game data export (src/data/players/*.json + manifest.json)")
+    export.add_argument('--export', action='store_true', help="Write shards for parsed players (unchanged ones are skipped)")
+    export.add_argument('--export-workers', type=int, help="Serialization worker processes (default: CPU count)")
+    export.add_argument('--prune', action='store_true', help="With --export, remove shards of players not exported")
+    export.add_argument(
+        '--bundles', type=int, default=0, metavar='N',
+        help="With --export, also pack players into N size-balanced bundles (fewer requests in the game)"
+    )
+    export.add_argument(
+        '--compress', action='store_true',
+        help="With --export, write .gz (and .br) variants of every data file and print a size report"
+    )
+    export.add_argument(
+        '--hashed-names', action='store_true',
+        help="With --export, put content hashes in shard/bundle file names (cacheable forever)"
+    )
+    export.add_argument(
+        '--autocomplete', action='store_true',
+        help="With --export, also write the player-name prefix index for autocomplete"
+    )
+    export.add_argument(
+        '--fuzzy', action='store_true',
+        help="With --export, also write the typo-tolerant (trigram) player-name index"
+    )
+
+    staged = arg_parser.add_argument_group("staged mode (scrape/parse/upload run concurrently)")
+    staged.add_argument('--player-ids', type=int, nargs='+', metavar='ID', help="Scrape these player IDs")
+    staged.add_argument('--archive', metavar='DIR', help="Read pages from a page archive instead of scraping")
+    staged.add_argument('--output-dir', help="Also save scraped pages to this directory")
+    staged.add_argument('--scrape-workers', type=int, default=2)
+    staged.add_argument('--parse-workers', type=int, default=1)
+    staged.add_argument('--upload-workers', type=int, default=1)
+    staged.add_argument('--queue-size', type=int, default=32, help="Bound of each inter-stage queue")
+    return arg_parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """
     Main pipeline execution.
 
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+
+    Returns:
+        0 on success, 1 on failure
+    """
+    args = parse_args(argv)
+    profiler = StageProfiler(args.profile_dir, top_n=args.profile_top, enabled=args.profile)
+    start = time.perf_counter()
+
+    try:
+        exit_code = run_pipeline(args, profiler)
+    finally:
+        RUN_SECONDS.set(round(time.perf_counter() - start, 3))
+
+    if profiler.enabled:
+        report_path = profiler.write_report()
+        print_profile_report(profiler)
+        if report_path:
+            print(f"Profile: {report_path}")
+
+    RUN_EXIT_CODE.set(exit_code)
+    if args.metrics_dir and not args.no_metrics:
+        written = write_metrics(args.metrics_dir, extra={'argv': sys.argv[1:] if argv is None else argv})
+        for path in written.values():
+            print(f"Metrics: {path}")
+
+    return exit_code
+
+
+def run_pipeline(args: argparse.Namespace, profiler: StageProfiler) -> int:
+    """
+    Run the pipeline selected by parsed command line arguments.
+
+    Args:
+        args: Namespace from parse_args
+        profiler: Stage profiler (disabled unless --profile)
+
     Returns:
         0 on success, 1 on failure
     """
     print("=== HOCKEY DATA PIPELINE ===\n")
 
-    # Configuration
-    data_file = "C:\\Users\\Xena\\source\\repos\\hockeyGame\\data_player.txt"
+    if args.incremental or args.dry_run:
+        with profiler.stage('build'):
+            report = build_incremental(
+                args.data_file,
+                archive_dir=args.archive,
+                data_dir=args.data_dir,
+                state_path=args.build_state,
+                dry_run=args.dry_run
+            )
+        print("\n=== PIPELINE FAILED ===" if not report.ok else "\n=== PIPELINE COMPLETE ===")
+        return 0 if report.ok else 1
+
+    if args.player_ids or args.archive:
+        # Stages overlap, so memory (and from Python 3.12 CPU hotspots) is
+        # reported for the run as a whole
+        with profiler.stage('staged'):
+            report = run_staged(
+                player_ids=args.player_ids,
+                archive_dir=args.archive,
+                output_dir=args.output_dir,
+                scrape_workers=args.scrape_workers,
+                parse_workers=args.parse_workers,
+                upload_workers=args.upload_workers,
+                queue_size=args.queue_size,
+                profiler=profiler
+            )
+        failed = any(stage.errors for stage in report.stages)
+        print("\n=== PIPELINE FAILED ===" if failed else "\n=== PIPELINE COMPLETE ===")
+        return 1 if failed else 0
 
     # Step 1: Parse data file
-    players = parse_data_file(data_file)
+    with profiler.stage('parse'):
+        players = parse_data_file(args.data_file)
 
     if not players:
         print("\n=== PIPELINE FAILED ===")
         print("No players parsed from data file")
         return 1
 
-    # Step 2: Upload to Directus (optional - requires environment vars)
-    if os.getenv('DIRECTUS_TOKEN'):
-        if not upload_data(players):
+    # Step 2: Write game data files (optional)
+    if args.export:
+        with profiler.stage('export'):
+            exported = export_data(
+                players, data_dir=args.data_dir, workers=args.export_workers,
+                prune=args.prune, bundles=args.bundles, compress=args.compress, hashed=args.hashed_names,
+                autocomplete=args.autocomplete, fuzzy=args.fuzzy
+            )
+        if not exported:
+            print("\n=== PIPELINE FAILED ===")
+            print("Export failed")
+            return 1
+
+    # Step 3: Upload to Directus (optional - requires environment vars)
+    if args.outbox:
+        with profiler.stage('queue'):
+            queued = queue_data(players, args.outbox)
+        if not queued:
+            print("\n=== PIPELINE FAILED ===")
+            print("Queueing failed")
+            return 1
+    elif os.getenv('DIRECTUS_TOKEN'):
+        with profiler.stage('upload'):
+            uploaded = upload_data(players, sync=args.sync, delete_missing=args.delete_missing)
+        if not uploaded:
             print("\n=== PIPELINE FAILED ===")
             print("Upload failed")
             return 1
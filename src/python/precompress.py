@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Precompressed variants of the game's static data files: <file>.gz, and
+<file>.br when the brotli package is installed, at maximum compression,
+so the web server can serve them as-is (nginx gzip_static/brotli_static)
+instead of compressing each response.
+
+A variant carries its source's modification time and is regenerated
+only when the source was rewritten or that time no longer matches.
+"""
+import gzip
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from shards import DATA_DIR, write_atomic
+
+try:
+    import brotli
+except ImportError:  # optional: .br variants are skipped
+    brotli = None
+
+VARIANTS = ('.gz', '.br')
+
+
+def _gzip(data: bytes) -> bytes:
+    """gzip at level 9 with a fixed header time (reproducible output)."""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    """Brotli at quality 11 tuned for text."""
+    return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+
+
+def encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Variant suffix -> compressor for the libraries available."""
+    available = {'.gz': _gzip}
+    if brotli is not None:
+        available['.br'] = _brotli
+    return available
+
+
+@dataclass
+class CompressedFile:
+    """Sizes of one source file and its variants."""
+    path: str
+    size: int
+    variants: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class CompressReport:
+    """Outcome of one precompression pass."""
+    files: List[CompressedFile] = field(default_factory=list)
+    written: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    removed: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if every variant was written."""
+        return not self.errors
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        """Source and variant bytes per group (top-level directory or file)."""
+        groups: Dict[str, Dict[str, int]] = {}
+        for item in self.files:
+            group = item.path.split('/', 1)[0] if '/' in item.path else item.path
+            sizes = groups.setdefault(group, {'files': 0, 'size': 0})
+            sizes['files'] += 1
+            sizes['size'] += item.size
+            for suffix, size in item.variants.items():
+                sizes[suffix] = sizes.get(suffix, 0) + size
+        return groups
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'totals': self.totals(),
+            'written': self.written,
+            'unchanged': self.unchanged,
+            'removed': self.removed,
+            'errors': self.errors,
+            'seconds': round(self.seconds, 4)
+        }
+
+
+def _fresh(variant: Path, mtime_ns: int) -> Optional[int]:
+    """Size of variant if it carries the source's mtime, else None."""
+    try:
+        stat = variant.stat()
+    except OSError:
+        return None
+    return stat.st_size if stat.st_mtime_ns == mtime_ns else None
+
+
+def precompress_file(path: Path, root: Path, force: bool, report: CompressReport) -> CompressedFile:
+    """
+    Bring the variants of one file up to date.
+
+    Args:
+        path: Source file
+        root: Directory paths are reported relative to
+        force: Regenerate even if the variants look fresh
+        report: CompressReport to update
+
+    Returns:
+        CompressedFile with source and variant sizes
+    """
+    stat = path.stat()
+    item = CompressedFile(path.relative_to(root).as_posix(), stat.st_size)
+    data = None
+
+    for suffix, compress in encoders().items():
+        variant = path.with_name(path.name + suffix)
+        size = None if force else _fresh(variant, stat.st_mtime_ns)
+        if size is not None:
+            report.unchanged += 1
+            item.variants[suffix] = size
+            continue
+
+        if data is None:
+            data = path.read_bytes()
+        compressed = compress(data)
+        write_atomic(variant, compressed)
+        os.utime(variant, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        report.written.append(item.path + suffix)
+        item.variants[suffix] = len(compressed)
+
+    # Variants that can no longer be regenerated must not go stale
+    for suffix in VARIANTS:
+        variant = path.with_name(path.name + suffix)
+        if suffix not in item.variants and variant.exists() and _fresh(variant, stat.st_mtime_ns) is None:
+            variant.unlink()
+            report.removed.append(item.path + suffix)
+
+    return item
+
+
+def precompress_tree(
+    root: Optional[str] = None,
+    changed: Iterable[str] = (),
+    pattern: str = '**/*.json'
+) -> CompressReport:
+    """
+    Write .gz/.br variants for every matching file under root.
+
+    Variants whose source file is gone are removed.
+
+    Args:
+        root: Directory to scan (default: src/data)
+        changed: Files rewritten since their variants were made (always
+            regenerated, whatever their modification time)
+        pattern: Glob of source files
+
+    Returns:
+        CompressReport
+    """
+    start = time.perf_counter()
+    root = Path(root) if root is not None else DATA_DIR
+    changed = {Path(path).resolve() for path in changed}
+    report = CompressReport()
+
+    for path in sorted(root.glob(pattern)):
+        if not path.is_file() or path.name.startswith('.'):
+            continue
+        try:
+            report.files.append(precompress_file(path, root, path.resolve() in changed, report))
+        except OSError as e:
+            report.errors.append(f"{path.relative_to(root).as_posix()}: {e}")
+
+    for suffix in VARIANTS:
+        for variant in sorted(root.glob(pattern + suffix)):
+            if not variant.with_name(variant.name[:-len(suffix)]).exists():
+                variant.unlink()
+                report.removed.append(variant.relative_to(root).as_posix())
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_compress_report(report: CompressReport):
+    """Print source vs compressed sizes per group (ASCII only)."""
+    print("\n=== PRECOMPRESSED ===")
+    suffixes = list(encoders())
+    header = f"{'group':<16} {'files':>6} {'bytes':>10}"
+    for suffix in suffixes:
+        header += f" {suffix:>10} {'ratio':>6}"
+    print(header)
+
+    totals = report.totals()
+    overall = {'files': 0, 'size': 0}
+    for group, sizes in sorted(totals.items()) + [('total', overall)]:
+        if group != 'total':
+            for key, value in sizes.items():
+                overall[key] = overall.get(key, 0) + value
+        row = f"{group:<16} {sizes['files']:>6} {sizes['size']:>10}"
+        for suffix in suffixes:
+            size = sizes.get(suffix, 0)
+            ratio = size / sizes['size'] if sizes['size'] else 0
+            row += f" {size:>10} {ratio:>6.1%}"
+        print(row)
+
+    if brotli is None:
+        print("(.br skipped: pip install brotli)")
+    print(f"Variants written: {len(report.written)}, unchanged: {report.unchanged}")
+    for path in report.removed:
+        print(f"  removed {path}")
+    for error in report.errors:
+        print(f"FAILED - {error}")
+
+
+if __name__ == "__main__":
+    # Deploy step: python precompress.py [data_dir] brings every variant
+    # in line with the data files just pulled (exit 1 on errors)
+    report = precompress_tree(sys.argv[1] if len(sys.argv) > 1 else None)
+    print_compress_report(report)
+    sys.exit(0 if report.ok else 1)
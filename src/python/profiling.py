@@ -0,0 +1,384 @@
+"""
+Per-stage profiling: cProfile CPU hotspots and tracemalloc allocation
+sites and peak memory for each pipeline stage.
+
+A disabled StageProfiler hands back a shared no-op context and the
+unwrapped functions, so leaving profiling off costs nothing; cProfile,
+pstats and tracemalloc are imported only once profiling is enabled.
+
+From Python 3.12 cProfile is built on sys.monitoring: only one profiler
+can be enabled in the process, and it sees every thread. Wrapped worker
+functions then only count calls and wall time, and their CPU hotspots
+are reported under the stage() that encloses the run.
+"""
+import io
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Shared no-op context returned while profiling is off
+_DISABLED = nullcontext()
+
+# cProfile profiles only the thread that enabled it (before 3.12)
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+
+def _ignored_frames() -> tuple:
+    """tracemalloc filters for frames that only describe the profiler itself."""
+    import tracemalloc
+
+    return (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, contextmanager.__code__.co_filename),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>')
+    )
+
+
+@dataclass
+class StageProfile:
+    """Profiling results for one stage."""
+    name: str
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_memory: int = 0
+    hotspots: List[Dict[str, Any]] = field(default_factory=list)
+    allocations: List[Dict[str, Any]] = field(default_factory=list)
+    prof_path: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'calls': self.calls,
+            'wall': round(self.wall, 4),
+            'cpu': round(self.cpu, 4),
+            'peak_memory': self.peak_memory,
+            'hotspots': self.hotspots,
+            'allocations': self.allocations,
+            'prof_path': self.prof_path
+        }
+
+
+class StageProfiler:
+    """Collects cProfile and tracemalloc data per named stage."""
+
+    def __init__(
+        self,
+        output_dir: str = 'profile',
+        top_n: int = 20,
+        enabled: bool = True,
+        trace_frames: int = 1
+    ):
+        """
+        Initialize profiler.
+
+        Args:
+            output_dir: Directory for .prof files, hotspot text and JSON report
+            top_n: Hotspots and allocation sites kept per stage
+            enabled: False makes stage() and wrap() no-ops
+            trace_frames: Stack frames stored per allocation by tracemalloc
+        """
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.enabled = enabled
+        self.trace_frames = trace_frames
+
+        self.stages: Dict[str, StageProfile] = {}
+        self._profiles: Dict[str, list] = {}
+        self._memory_stack: List[Dict[str, Any]] = []
+        self._started_tracing = False
+        self._active = threading.local()
+        self._lock = threading.Lock()
+
+    def _record(self, name: str) -> StageProfile:
+        """StageProfile for name, created on first use. Caller holds the lock."""
+        profile = self.stages.get(name)
+        if profile is None:
+            profile = self.stages[name] = StageProfile(name=name)
+            self._profiles[name] = []
+        return profile
+
+    def stage(self, name: str):
+        """
+        Context manager profiling CPU and memory of a block as stage name.
+
+        Entering the same name again accumulates into the same stage.
+        Memory is traced process-wide, so stages should not overlap in
+        time; use wrap() for stages running in worker threads.
+
+        Args:
+            name: Stage name (used in file names)
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str):
+        import cProfile
+        import tracemalloc
+
+        ignored = _ignored_frames()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+
+        # Fold the enclosing stage's peak in before resetting it
+        if self._memory_stack:
+            outer = self._memory_stack[-1]
+            outer['peak'] = max(outer['peak'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+        before = tracemalloc.take_snapshot().filter_traces(ignored)
+        memory = {'base': tracemalloc.get_traced_memory()[0], 'peak': 0}
+        self._memory_stack.append(memory)
+
+        # One cProfile per thread: a nested stage counts toward the outer one
+        profile = None
+        if not getattr(self._active, 'profiling', False):
+            profile = cProfile.Profile()
+            self._active.profiling = True
+
+        start = time.perf_counter()
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is active (3.12+ allows one per
+                # process); it already sees this block
+                profile = None
+                self._active.profiling = False
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._active.profiling = False
+            wall = time.perf_counter() - start
+
+            memory['peak'] = max(memory['peak'], tracemalloc.get_traced_memory()[1])
+            self._memory_stack.pop()
+            if self._memory_stack:
+                outer = self._memory_stack[-1]
+                outer['peak'] = max(outer['peak'], memory['peak'])
+
+            after = tracemalloc.take_snapshot().filter_traces(ignored)
+            allocations = [
+                {
+                    'site': str(diff.traceback),
+                    'size': diff.size_diff,
+                    'count': diff.count_diff
+                }
+                for diff in after.compare_to(before, 'lineno')
+                if diff.size_diff > 0
+            ][:self.top_n]
+
+            with self._lock:
+                record = self._record(name)
+                record.calls += 1
+                record.wall += wall
+                record.peak_memory = max(record.peak_memory, memory['peak'] - memory['base'])
+                record.allocations = _merge_allocations(record.allocations, allocations, self.top_n)
+                if profile is not None:
+                    self._profiles[name].append(profile)
+
+            if not self._memory_stack and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """
+        Profile every call of func as stage name, in whichever thread calls it.
+
+        Each calling thread gets its own cProfile; they are merged in the
+        report. From Python 3.12 (one process-wide profiler) calls and
+        wall time are counted, and CPU time shows up in the enclosing
+        stage() instead. Memory is not attributed (tracemalloc is
+        process-wide).
+
+        Args:
+            name: Stage name
+            func: Function to profile
+
+        Returns:
+            Profiled function, or func itself when profiling is off
+        """
+        if not self.enabled:
+            return func
+
+        import cProfile
+
+        local = threading.local()
+
+        def counted(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                wall = time.perf_counter() - start
+                with self._lock:
+                    record = self._record(name)
+                    record.calls += 1
+                    record.wall += wall
+
+        if not PER_THREAD_PROFILES:
+            return counted
+
+        def profiled(*args, **kwargs):
+            if getattr(self._active, 'profiling', False):
+                return func(*args, **kwargs)
+
+            profile = getattr(local, 'profile', None)
+            if profile is None:
+                profile = local.profile = cProfile.Profile()
+                with self._lock:
+                    self._record(name)
+                    self._profiles[name].append(profile)
+
+            self._active.profiling = True
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._active.profiling = False
+                wall = time.perf_counter() - start
+                with self._lock:
+                    record = self.stages[name]
+                    record.calls += 1
+                    record.wall += wall
+
+        return profiled
+
+    def _stats(self, name: str):
+        """Merged pstats.Stats for a stage, or None if nothing was profiled."""
+        import pstats
+
+        profiles = self._profiles.get(name) or []
+        if not profiles:
+            return None
+
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def write_report(self) -> Optional[str]:
+        """
+        Write <stage>.prof, <stage>_hotspots.txt and profile_report.json.
+
+        Returns:
+            Path of the JSON report, or None if disabled or on error
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+            for name, record in self.stages.items():
+                stats = self._stats(name)
+                if stats is None:
+                    continue
+
+                record.cpu = stats.total_tt
+                record.hotspots = _hotspots(stats, self.top_n)
+
+                prof_path = self.output_dir / f'{name}.prof'
+                stats.dump_stats(str(prof_path))
+                record.prof_path = str(prof_path)
+
+                text = io.StringIO()
+                stats.stream = text
+                stats.sort_stats('tottime').print_stats(self.top_n)
+                stats.sort_stats('cumulative').print_stats(self.top_n)
+                (self.output_dir / f'{name}_hotspots.txt').write_text(text.getvalue(), encoding='utf-8')
+
+            report_path = self.output_dir / 'profile_report.json'
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump({name: record.to_dict() for name, record in self.stages.items()}, f, indent=2)
+            return str(report_path)
+
+        except OSError as e:
+            print(f"Error writing profile report: {e}")
+            return None
+
+
+def _hotspots(stats, top_n: int) -> List[Dict[str, Any]]:
+    """Functions with the most self time in a pstats.Stats."""
+    import pstats
+
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top_n]
+    return [
+        {
+            'function': pstats.func_std_string(func),
+            'calls': nc,
+            'tottime': round(tt, 6),
+            'cumtime': round(ct, 6)
+        }
+        for func, (cc, nc, tt, ct, callers) in rows
+    ]
+
+
+def _merge_allocations(
+    current: List[Dict[str, Any]],
+    new: List[Dict[str, Any]],
+    top_n: int
+) -> List[Dict[str, Any]]:
+    """Sum allocation sites across stage entries and keep the largest."""
+    merged: Dict[str, Dict[str, Any]] = {row['site']: dict(row) for row in current}
+    for row in new:
+        entry = merged.setdefault(row['site'], {'site': row['site'], 'size': 0, 'count': 0})
+        if entry is not row:
+            entry['size'] += row['size']
+            entry['count'] += row['count']
+    return sorted(merged.values(), key=lambda row: row['size'], reverse=True)[:top_n]
+
+
+def print_profile_report(profiler: StageProfiler, hotspots: int = 3):
+    """Print per-stage CPU, peak memory and top hotspots (ASCII only)."""
+    if not profiler.enabled:
+        return
+
+    print("\n=== PROFILE ===")
+    print(f"{'stage':<10} {'calls':>6} {'wall(s)':>9} {'cpu(s)':>9} {'peak MB':>9}")
+    for record in profiler.stages.values():
+        print(
+            f"{record.name:<10} {record.calls:>6} {record.wall:>9.3f} {record.cpu:>9.3f}"
+            f" {record.peak_memory / 1e6:>9.2f}"
+        )
+
+    for record in profiler.stages.values():
+        if record.hotspots:
+            print(f"\n{record.name} hotspots (self time):")
+            for row in record.hotspots[:hotspots]:
+                print(f"  {row['tottime']:>8.3f}s {row['calls']:>8} {row['function']}")
+        if record.allocations:
+            print(f"{record.name} allocation sites:")
+            for row in record.allocations[:hotspots]:
+                print(f"  {row['size'] / 1e3:>8.1f} KB {row['count']:>8} {row['site']}")
+
+
+if __name__ == "__main__":
+    # Example usage
+    profiler = StageProfiler(output_dir='profile', top_n=10)
+
+    encoded = json.dumps([{'season': f"{2000 + i % 25}", 'gp': i} for i in range(100000)])
+
+    with profiler.stage('decode'):
+        rows = json.loads(encoded)
+
+    with profiler.stage('encode'):
+        encoded = json.dumps(rows, indent=2)
+
+    print(f"Report: {profiler.write_report()}")
+    print_profile_report(profiler)
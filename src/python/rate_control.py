@@ -0,0 +1,214 @@
+"""
+Adaptive request rate control for scraping.
+AIMD controller: raises the request rate additively while latency and
+error rate stay under thresholds, cuts it multiplicatively on 429/5xx,
+timeouts or slow responses, and honors Retry-After.
+
+Decisions look only at the most recent responses (decision_window), and
+slow responses cut the rate at most once per decision window, so after a
+slow burst the rate recovers as soon as responses are fast again.
+"""
+import math
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+
+# Statuses that mean "slow down"
+BACKOFF_STATUSES = {429, 500, 502, 503, 504}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Sample values (any order)
+        pct: Percentile in [0, 100]
+
+    Returns:
+        Percentile value, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Delay in seconds, or None if missing/invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateController:
+    """Thread-safe AIMD request rate controller."""
+
+    def __init__(
+        self,
+        initial_rate: float = 1.0,
+        min_rate: float = 0.1,
+        max_rate: float = 10.0,
+        increase_step: float = 0.1,
+        decrease_factor: float = 0.5,
+        latency_threshold: float = 5.0,
+        error_threshold: float = 0.1,
+        window: int = 100,
+        decision_window: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize controller.
+
+        Args:
+            initial_rate: Starting rate in requests per second
+            min_rate: Rate floor in requests per second
+            max_rate: Rate ceiling in requests per second
+            increase_step: Additive increase per healthy response
+            decrease_factor: Multiplicative decrease on backoff signals
+            latency_threshold: Recent p95 latency (seconds) above which to back off
+            error_threshold: Recent error rate above which the rate stops rising
+            window: Number of recent responses in the metrics window
+            decision_window: Number of recent responses the rate decisions
+                look at; latency backoffs happen at most once per this many
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.error_threshold = error_threshold
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=window)
+        self._errors: deque = deque(maxlen=window)
+        self.decision_window = decision_window
+        self._recent_latencies: deque = deque(maxlen=decision_window)
+        self._recent_errors: deque = deque(maxlen=decision_window)
+        self._since_decrease = decision_window
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self._last_decrease = float('-inf')
+
+        self.requests = 0
+        self.backoffs = 0
+
+    def acquire(self) -> float:
+        """
+        Block until the next request may be sent.
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = start + 1.0 / self.rate
+            self.requests += 1
+
+        wait = start - now
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def record(
+        self,
+        latency: float,
+        status: Optional[int] = None,
+        error: bool = False,
+        retry_after: Optional[float] = None
+    ):
+        """
+        Record a response and adjust the rate.
+
+        Args:
+            latency: Response time in seconds
+            status: HTTP status code, if known
+            error: True for timeouts and other failures without a status
+            retry_after: Server-requested delay in seconds (Retry-After)
+        """
+        backoff_signal = error or status in BACKOFF_STATUSES
+
+        with self._lock:
+            now = self._clock()
+            self._latencies.append(latency)
+            self._errors.append(1 if backoff_signal else 0)
+            self._recent_latencies.append(latency)
+            self._recent_errors.append(1 if backoff_signal else 0)
+            self._since_decrease += 1
+
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+            error_rate = sum(self._recent_errors) / len(self._recent_errors)
+            # A fast response is not a reason to cut, whatever the window holds
+            slow = (
+                latency > self.latency_threshold
+                and percentile(list(self._recent_latencies), 95) > self.latency_threshold
+            )
+
+            if backoff_signal or slow:
+                # One cut per congestion episode: wait one interval between
+                # cuts, and a full decision window between latency cuts
+                if now - self._last_decrease >= 1.0 / self.rate and (
+                    backoff_signal or self._since_decrease >= self.decision_window
+                ):
+                    self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                    self._last_decrease = now
+                    self._since_decrease = 0
+                    self.backoffs += 1
+                    self._next_slot = max(self._next_slot, now + 1.0 / self.rate)
+            elif error_rate <= self.error_threshold:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def record_timeout(self, latency: float):
+        """Record a request that timed out."""
+        self.record(latency, error=True)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Current rate and rolling window statistics.
+
+        Returns:
+            Dictionary with rate, latency percentiles and error rate
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            errors = list(self._errors)
+
+            return {
+                'rate': round(self.rate, 3),
+                'latency_p50': percentile(latencies, 50),
+                'latency_p95': percentile(latencies, 95),
+                'latency_p99': percentile(latencies, 99),
+                'error_rate': sum(errors) / len(errors) if errors else 0.0,
+                'requests': self.requests,
+                'backoffs': self.backoffs,
+                'blocked_for': max(0.0, self._blocked_until - self._clock())
+            }
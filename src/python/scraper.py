@@ -3,7 +3,9 @@ Web scraper for HockeyDB player data.
 Uses Selenium with headless Chrome to fetch player pages.
 """
 import time
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -12,19 +14,42 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+from metrics import REGISTRY
+from rate_control import AdaptiveRateController
+from timing import ScrapeTimer
+
+PAGES_FETCHED = REGISTRY.counter('scraper_pages_fetched_total', 'Player pages fetched', ['status'])
+FETCH_SECONDS = REGISTRY.histogram('scraper_fetch_seconds', 'Time to fetch one player page')
+PAGE_CHARS = REGISTRY.counter('scraper_page_chars_total', 'Characters of page text fetched')
+
+
+def player_url(player_id: int) -> str:
+    """HockeyDB page URL of a player ID."""
+    return f"https://www.hockeydb.com/ihdb/stats/pdisplay.php?pid={player_id}"
+
 
 class HockeyDBScraper:
     """Scraper for HockeyDB player statistics."""
 
-    def __init__(self, headless: bool = True, timeout: int = 10):
+    def __init__(
+        self,
+        headless: bool = True,
+        timeout: int = 10,
+        timer: Optional[ScrapeTimer] = None
+    ):
         """
         Initialize scraper.
 
         Args:
             headless: Run Chrome in headless mode
             timeout: Page load timeout in seconds
+            timer: Timing span collector (default: new ScrapeTimer)
         """
         self.timeout = timeout
+        self.timer = timer if timer is not None else ScrapeTimer()
+        # Navigation + body wait of the last scrape, the latency to feed
+        # a rate controller (excludes the text-link wait and sleep)
+        self.last_load_time = 0.0
         self.driver = self._init_driver(headless)
 
     def _init_driver(self, headless: bool) -> webdriver.Chrome:
@@ -55,43 +80,59 @@ class HockeyDBScraper:
         Returns:
             Text content of player page, or None on failure
         """
+        timer = self.timer
+        start = time.perf_counter()
+        load_time = None
+
         try:
-            print(f"Fetching: {url}")
-            self.driver.get(url)
+            with timer.span(url, 'navigate'):
+                self.driver.get(url)
 
             # Wait for page to load
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            with timer.span(url, 'wait_body'):
+                WebDriverWait(self.driver, self.timeout).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+            load_time = time.perf_counter() - start
 
             # Try to click "View as text" link if available
             try:
-                text_link = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((
-                        By.XPATH,
-                        "//a[contains(text(), 'View as text') or contains(text(), 'Text-only')]"
-                    ))
-                )
+                with timer.span(url, 'wait_text_link'):
+                    text_link = WebDriverWait(self.driver, 5).until(
+                        EC.element_to_be_clickable((
+                            By.XPATH,
+                            "//a[contains(text(), 'View as text') or contains(text(), 'Text-only')]"
+                        ))
+                    )
                 text_link.click()
-                time.sleep(2)
+                with timer.span(url, 'sleep'):
+                    time.sleep(2)
             except Exception:
                 # Text view not available or already in text mode
                 pass
 
-            # Get page content
-            content = self.driver.page_source
-
             # Extract text from body
-            body = self.driver.find_element(By.TAG_NAME, 'body')
-            text_content = body.text
+            with timer.span(url, 'extract'):
+                body = self.driver.find_element(By.TAG_NAME, 'body')
+                text_content = body.text
 
-            print(f"OK - Fetched {len(text_content)} characters")
+            timer.record_fetch(url, ok=True, chars=len(text_content))
+            PAGES_FETCHED.inc(status='ok')
+            PAGE_CHARS.inc(len(text_content))
             return text_content
 
         except Exception as e:
             print(f"FAILED - Error scraping {url}: {e}")
+            timer.record_fetch(url, ok=False, error=str(e))
+            PAGES_FETCHED.inc(status='failed')
             return None
 
+        finally:
+            elapsed = time.perf_counter() - start
+            # A failed load counts until it failed (e.g. the page load timeout)
+            self.last_load_time = elapsed if load_time is None else load_time
+            FETCH_SECONDS.observe(elapsed)
+
     def scrape_player_by_id(self, player_id: int) -> Optional[str]:
         """
         Scrape player by HockeyDB player ID.
@@ -102,8 +143,7 @@ class HockeyDBScraper:
         Returns:
             Text content of player page, or None on failure
         """
-        url = f"https://www.hockeydb.com/ihdb/stats/pdisplay.php?pid={player_id}"
-        return self.scrape_player(url)
+        return self.scrape_player(player_url(player_id))
 
     def save_to_file(self, content: str, file_path: str) -> bool:
         """
@@ -142,7 +182,10 @@ class HockeyDBScraper:
 def scrape_multiple_players(
     player_ids: list[int],
     output_dir: str = '.',
-    headless: bool = True
+    headless: bool = True,
+    archive=None,
+    rate_controller: Optional[AdaptiveRateController] = None,
+    report_path: Optional[str] = None
 ) -> dict[int, str]:
     """
     Scrape multiple players and save to files.
@@ -151,23 +194,129 @@ def scrape_multiple_players(
         player_ids: List of HockeyDB player IDs
         output_dir: Directory to save output files
         headless: Run in headless mode
+        archive: PageArchive to append pages to instead of per-player files
+        rate_controller: Adaptive rate controller (default: starts at 1 req/s)
+        report_path: JSON timing report path (default: output_dir/scrape_report.json)
 
     Returns:
-        Dictionary mapping player_id to output file path
+        Dictionary mapping player_id to output file path (segment path
+        when archiving)
     """
     results = {}
+    rate = rate_controller or AdaptiveRateController()
+    timer = ScrapeTimer()
 
-    with HockeyDBScraper(headless=headless) as scraper:
+    with HockeyDBScraper(headless=headless, timer=timer) as scraper:
         for player_id in player_ids:
+            # Rate limiting
+            rate.acquire()
             content = scraper.scrape_player_by_id(player_id)
+            rate.record(scraper.last_load_time, error=content is None)
 
-            if content:
+            if content and archive is not None:
+                entry = archive.append(player_id, content)
+                results[player_id] = str(archive.segment_path(entry.segment))
+            elif content:
                 file_path = f"{output_dir}/player_{player_id}.txt"
                 if scraper.save_to_file(content, file_path):
                     results[player_id] = file_path
 
-            # Rate limiting
-            time.sleep(1)
+    report_path = report_path or f"{output_dir}/scrape_report.json"
+    if timer.write_report(report_path, extra={'rate': rate.metrics()}):
+        print(f"Scrape report: {report_path}")
+
+    return results
+
+
+def scrape_players_concurrent(
+    player_ids: Iterable[int],
+    output_dir: str = '.',
+    headless: bool = True,
+    workers: int = 4,
+    rate_controller: Optional[AdaptiveRateController] = None,
+    report_path: Optional[str] = None
+) -> dict[int, str]:
+    """
+    Scrape players with a pool of browsers, one per worker thread.
+
+    player_ids is consumed lazily (at most 2 * workers IDs in flight),
+    so it can be a crawler frontier that is still being filled. A worker
+    that raises (e.g. a browser that fails to start) fails only its
+    player, recorded like a failed fetch.
+
+    Args:
+        player_ids: Iterable of HockeyDB player IDs
+        output_dir: Directory to save output files
+        headless: Run in headless mode
+        workers: Number of concurrent browsers
+        rate_controller: Adaptive rate controller shared by all workers
+        report_path: JSON timing report path (default: output_dir/scrape_report.json)
+
+    Returns:
+        Dictionary mapping player_id to output file path
+    """
+    results = {}
+    rate = rate_controller or AdaptiveRateController()
+    timer = ScrapeTimer()
+    local = threading.local()
+    scrapers = []
+    lock = threading.Lock()
+
+    def scrape_one(player_id: int) -> Optional[str]:
+        scraper = getattr(local, 'scraper', None)
+        if scraper is None:
+            scraper = HockeyDBScraper(headless=headless, timer=timer)
+            local.scraper = scraper
+            with lock:
+                scrapers.append(scraper)
+
+        rate.acquire()
+        content = scraper.scrape_player_by_id(player_id)
+        rate.record(scraper.last_load_time, error=content is None)
+
+        if content:
+            file_path = f"{output_dir}/player_{player_id}.txt"
+            if scraper.save_to_file(content, file_path):
+                return file_path
+        return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+            ids = iter(player_ids)
+            exhausted = False
+
+            while pending or not exhausted:
+                while not exhausted and len(pending) < workers * 2:
+                    player_id = next(ids, None)
+                    if player_id is None:
+                        exhausted = True
+                        break
+                    pending[executor.submit(scrape_one, player_id)] = player_id
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    player_id = pending.pop(future)
+                    try:
+                        file_path = future.result()
+                    except Exception as e:
+                        url = player_url(player_id)
+                        print(f"FAILED - Error scraping {url}: {e}")
+                        timer.record_fetch(url, ok=False, error=str(e))
+                        PAGES_FETCHED.inc(status='failed')
+                        continue
+                    if file_path:
+                        results[player_id] = file_path
+    finally:
+        for scraper in scrapers:
+            scraper.close()
+
+    report_path = report_path or f"{output_dir}/scrape_report.json"
+    if timer.write_report(report_path, extra={'rate': rate.metrics(), 'workers': workers}):
+        print(f"Scrape report: {report_path}")
 
     return results
 
@@ -0,0 +1,167 @@
+"""
+Game data shards: per-player JSON files under src/data/players and the
+manifest.json that PlayerService loads first.
+"""
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# src/data, next to the game's JavaScript sources
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+MANIFEST_VERSION = '1.0.0'
+MANIFEST_DESCRIPTION = 'Player data manifest for hockey game'
+
+
+def _ascii_word(text: str) -> str:
+    """Lowercase ASCII letters and digits of text (accents folded)."""
+    folded = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]', '', folded.lower())
+
+
+def player_slug(name: str) -> str:
+    """
+    Shard id for a player: folded last name ("Ryan O'Reilly" -> "oreilly").
+
+    Args:
+        name: Player name
+
+    Returns:
+        Slug (empty if the name has no letters or digits)
+    """
+    words = [_ascii_word(word) for word in name.split()]
+    words = [word for word in words if word]
+    return words[-1] if words else ''
+
+
+def assign_slugs(players: List) -> List[str]:
+    """
+    Unique slugs for players (List[PlayerData]), in input order.
+
+    Last name alone when unique; colliding players get first-last, then
+    a birth year suffix, then a counter.
+
+    Args:
+        players: PlayerData objects
+
+    Returns:
+        One slug per player
+    """
+    def candidates(player):
+        name = player.player.name or ''
+        last = player_slug(name) or 'player'
+        words = [_ascii_word(word) for word in name.split()]
+        full = '-'.join(word for word in words if word) or last
+        year = re.search(r'\d{4}', player.player.birth_date or '')
+        yield last
+        yield full
+        if year:
+            yield f"{full}-{year.group()}"
+
+    counts: Dict[str, int] = {}
+    for player in players:
+        for candidate in candidates(player):
+            counts[candidate] = counts.get(candidate, 0) + 1
+
+    slugs = []
+    taken = set()
+    for player in players:
+        options = list(candidates(player))
+        slug = next((c for c in options if counts[c] == 1 and c not in taken), None)
+        if slug is None:
+            base, n = options[-1], 2
+            while f"{base}-{n}" in taken:
+                n += 1
+            slug = f"{base}-{n}"
+        taken.add(slug)
+        slugs.append(slug)
+
+    return slugs
+
+
+def shard_json(shard: dict) -> str:
+    """Serialize a shard dictionary the way the game's data files are written."""
+    return json.dumps(shard, indent=2, ensure_ascii=False) + '\n'
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def write_atomic(path: Path, text: Union[str, bytes]):
+    """
+    Write text (or bytes) to path via a temporary file and rename.
+
+    Readers never see a partially written file.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        if isinstance(text, bytes):
+            with open(tmp, 'wb') as f:
+                f.write(text)
+        else:
+            with open(tmp, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def manifest_entry(slug: str, name: str) -> dict:
+    """Manifest entry pointing at players/<slug>.json."""
+    return {'id': slug, 'name': name, 'file': f'players/{slug}.json'}
+
+
+def write_manifest(
+    entries: List[dict],
+    path: Optional[Path] = None,
+    bundles: Optional[List[dict]] = None,
+    indexes: Optional[Dict[str, dict]] = None
+) -> bool:
+    """
+    Write manifest.json if its content changed.
+
+    Args:
+        entries: Manifest player entries (id, name, file, and bundle and
+            offset for bundled players)
+        path: Manifest path (default: src/data/manifest.json)
+        bundles: Bundle entries (file, players, hash, size); omitted when None
+        indexes: Name index entries (file, hash, size) by index name
+            ('autocomplete', 'fuzzy'), each a top-level manifest key
+
+    Returns:
+        True if the file was written
+    """
+    path = Path(path) if path is not None else DATA_DIR / 'manifest.json'
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'description': MANIFEST_DESCRIPTION,
+        'players': entries
+    }
+    if bundles is not None:
+        manifest['bundles'] = bundles
+    manifest.update(indexes or {})
+    text = json.dumps(manifest, indent=2, ensure_ascii=False) + '\n'
+
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+
+    write_atomic(path, text)
+    return True
+
+
+if __name__ == "__main__":
+    # Example usage
+    for name in ["Ryan O'Reilly", "Tomas Holmstr\u00f6m", "Nazem Kadri"]:
+        print(f"{ascii(name)} -> {player_slug(name)}")
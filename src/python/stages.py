@@ -0,0 +1,282 @@
+"""
+Staged pipeline runner: stages run concurrently in worker threads,
+connected by bounded queues. A slow stage fills its input queue and
+blocks the stage before it (backpressure) instead of buffering the run.
+Per-stage busy, starved and blocked times show where the bottleneck is.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from metrics import REGISTRY
+
+STAGE_ITEMS = REGISTRY.counter('pipeline_stage_items_total', 'Items through each stage', ['stage', 'direction'])
+STAGE_ERRORS = REGISTRY.counter('pipeline_stage_errors_total', 'Stage calls that raised or failed outputs', ['stage'])
+STAGE_SECONDS = REGISTRY.histogram('pipeline_stage_seconds', 'Time per stage call', ['stage'])
+QUEUE_DEPTH = REGISTRY.gauge('pipeline_queue_depth', 'Items waiting in a stage input queue', ['stage'])
+QUEUE_DEPTH_MAX = REGISTRY.gauge('pipeline_queue_depth_max', 'Highest stage input queue depth', ['stage'])
+# End-of-stream marker, one per downstream worker
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline stage.
+
+    func takes one item and returns its output (None drops the item).
+    With batch_size > 1, func takes a list of up to batch_size items and
+    returns an iterable of outputs. A call that raises counts as an
+    error; so does an output for which failure returns a message (e.g.
+    a failed upload result), which is still passed on.
+    """
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 16
+    batch_size: int = 1
+    failure: Optional[Callable[[Any], Optional[str]]] = None
+
+
+@dataclass
+class StageStats:
+    """Counters for one stage."""
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy: float = 0.0
+    starved: float = 0.0
+    blocked: float = 0.0
+    max_queue_depth: int = 0
+    error_messages: List[str] = field(default_factory=list)
+
+    def utilization(self, elapsed: float) -> float:
+        """Fraction of worker time spent processing."""
+        capacity = self.workers * elapsed
+        return self.busy / capacity if capacity else 0.0
+
+    def to_dict(self, elapsed: float) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'workers': self.workers,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'errors': self.errors,
+            'busy': round(self.busy, 4),
+            'starved': round(self.starved, 4),
+            'blocked': round(self.blocked, 4),
+            'utilization': round(self.utilization(elapsed), 4),
+            'max_queue_depth': self.max_queue_depth,
+            'error_messages': self.error_messages
+        }
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of a staged run."""
+    elapsed: float = 0.0
+    stages: List[StageStats] = field(default_factory=list)
+    results: List[Any] = field(default_factory=list)
+
+    @property
+    def bottleneck(self) -> Optional[str]:
+        """Name of the stage with the highest utilization."""
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda s: s.utilization(self.elapsed)).name
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'elapsed': round(self.elapsed, 4),
+            'bottleneck': self.bottleneck,
+            'stages': {s.name: s.to_dict(self.elapsed) for s in self.stages}
+        }
+
+
+class StagedPipeline:
+    """Runs items from a source through stages with bounded queues."""
+
+    def __init__(self, stages: List[Stage], collect: bool = False):
+        """
+        Initialize pipeline.
+
+        Args:
+            stages: Stages in order
+            collect: Keep the last stage's outputs in report.results
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+
+        self.stages = stages
+        self.collect = collect
+
+    def run(self, source: Iterable[Any]) -> PipelineReport:
+        """
+        Feed source through all stages and wait for completion.
+
+        Args:
+            source: Items for the first stage (consumed lazily)
+
+        Returns:
+            PipelineReport with per-stage counters and utilization
+        """
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        stats = [StageStats(name=stage.name, workers=stage.workers) for stage in self.stages]
+        report = PipelineReport(stages=stats)
+        lock = threading.Lock()
+        remaining = [stage.workers for stage in self.stages]
+
+        def emit(index: int, item: Any, stage_stats: Optional[StageStats]) -> float:
+            """Hand item to stage index (or collect it); return seconds blocked."""
+            if index >= len(self.stages):
+                if self.collect and item is not _DONE:
+                    with lock:
+                        report.results.append(item)
+                return 0.0
+
+            start = time.perf_counter()
+            queues[index].put(item)
+            waited = time.perf_counter() - start
+            depth = queues[index].qsize()
+            with lock:
+                stats[index].max_queue_depth = max(stats[index].max_queue_depth, depth)
+            name = self.stages[index].name
+            QUEUE_DEPTH.set(depth, stage=name)
+            QUEUE_DEPTH_MAX.set_max(depth, stage=name)
+            return waited
+
+        def finish(index: int):
+            """Signal end of stream to the next stage."""
+            if index < len(self.stages):
+                for _ in range(self.stages[index].workers):
+                    emit(index, _DONE, None)
+
+        def work(index: int):
+            stage = self.stages[index]
+            stage_stats = stats[index]
+            inbox = queues[index]
+            busy = starved = blocked = 0.0
+            items_in = items_out = 0
+
+            done = False
+            while not done:
+                start = time.perf_counter()
+                item = inbox.get()
+                starved += time.perf_counter() - start
+                if item is _DONE:
+                    break
+
+                batch = [item]
+                while len(batch) < stage.batch_size:
+                    try:
+                        item = inbox.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        done = True
+                        break
+                    batch.append(item)
+                items_in += len(batch)
+                QUEUE_DEPTH.set(inbox.qsize(), stage=stage.name)
+
+                start = time.perf_counter()
+                try:
+                    if stage.batch_size > 1:
+                        outputs = list(stage.func(batch) or [])
+                    else:
+                        output = stage.func(batch[0])
+                        outputs = [] if output is None else [output]
+                except Exception as e:
+                    outputs = []
+                    errors = [f"{type(e).__name__}: {e}"]
+                else:
+                    errors = [stage.failure(output) for output in outputs] if stage.failure else []
+                    errors = [error for error in errors if error]
+                if errors:
+                    STAGE_ERRORS.inc(len(errors), stage=stage.name)
+                    with lock:
+                        stage_stats.errors += len(errors)
+                        room = 10 - len(stage_stats.error_messages)
+                        stage_stats.error_messages.extend(errors[:max(room, 0)])
+                elapsed = time.perf_counter() - start
+                busy += elapsed
+                STAGE_SECONDS.observe(elapsed, stage=stage.name)
+
+                for output in outputs:
+                    blocked += emit(index + 1, output, stage_stats)
+                items_out += len(outputs)
+
+            STAGE_ITEMS.inc(items_in, stage=stage.name, direction='in')
+            STAGE_ITEMS.inc(items_out, stage=stage.name, direction='out')
+
+            with lock:
+                stage_stats.busy += busy
+                stage_stats.starved += starved
+                stage_stats.blocked += blocked
+                stage_stats.items_in += items_in
+                stage_stats.items_out += items_out
+                remaining[index] -= 1
+                last = remaining[index] == 0
+
+            if last:
+                finish(index + 1)
+
+        threads = [
+            threading.Thread(target=work, args=(i,), name=f"{stage.name}-{w}", daemon=True)
+            for i, stage in enumerate(self.stages)
+            for w in range(stage.workers)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in source:
+                emit(0, item, None)
+        finally:
+            finish(0)
+            for thread in threads:
+                thread.join()
+            report.elapsed = time.perf_counter() - started
+
+        return report
+
+
+def print_stage_report(report: PipelineReport):
+    """Print per-stage utilization table (ASCII only)."""
+    print(f"\n=== STAGES ({report.elapsed:.2f}s) ===")
+    print(
+        f"{'stage':<10} {'workers':>7} {'in':>7} {'out':>7} {'errors':>7}"
+        f" {'util':>6} {'starved(s)':>10} {'blocked(s)':>10} {'max q':>6}"
+    )
+
+    for s in report.stages:
+        print(
+            f"{s.name:<10} {s.workers:>7} {s.items_in:>7} {s.items_out:>7} {s.errors:>7}"
+            f" {s.utilization(report.elapsed):>6.0%} {s.starved:>10.2f} {s.blocked:>10.2f}"
+            f" {s.max_queue_depth:>6}"
+        )
+
+    print(f"Bottleneck: {report.bottleneck}")
+    for s in report.stages:
+        for message in s.error_messages:
+            print(f"FAILED - {s.name}: {message}")
+        if s.errors > len(s.error_messages):
+            print(f"FAILED - {s.name}: ... {s.errors - len(s.error_messages)} more errors")
+
+
+if __name__ == "__main__":
+    # Example usage: a slow middle stage is the bottleneck
+    pipeline = StagedPipeline([
+        Stage('fetch', lambda x: time.sleep(0.01) or x, workers=4),
+        Stage('parse', lambda x: time.sleep(0.02) or x * 2, workers=1),
+        Stage('upload', lambda batch: batch, workers=1, batch_size=10)
+    ], collect=True)
+
+    print_stage_report(pipeline.run(range(50)))
@@ -0,0 +1,428 @@
+"""
+Diff-based, idempotent sync of parsed players into Directus.
+Pulls existing players and statistics in bulk pages, indexes them by
+natural key and issues only the creates, patches and deletes needed.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from api_client import DEFAULT_PAGE_SIZE, DirectusClient, chunk_items, player_statistics
+
+# Natural keys
+PLAYER_KEY_FIELDS = ('name', 'birth_date')
+STAT_KEY_FIELDS = ('season', 'team', 'league')
+
+# Values per _in filter when reading only some players
+MATCH_CHUNK_SIZE = 50
+
+
+@dataclass
+class SyncReport:
+    """Counts of sync operations."""
+    players_created: int = 0
+    players_updated: int = 0
+    players_deleted: int = 0
+    players_unchanged: int = 0
+    stats_created: int = 0
+    stats_updated: int = 0
+    stats_deleted: int = 0
+    stats_unchanged: int = 0
+    read_requests: int = 0
+    write_requests: int = 0
+    errors: List[str] = field(default_factory=list)
+    failed_players: Set[Tuple] = field(default_factory=set)
+
+    @property
+    def ok(self) -> bool:
+        """True if every write succeeded."""
+        return not self.errors
+
+    def player_ok(self, key: Tuple) -> bool:
+        """True if every write for the player with this natural key succeeded."""
+        return key not in self.failed_players
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for reporting."""
+        return {
+            'players': {
+                'created': self.players_created,
+                'updated': self.players_updated,
+                'deleted': self.players_deleted,
+                'unchanged': self.players_unchanged
+            },
+            'statistics': {
+                'created': self.stats_created,
+                'updated': self.stats_updated,
+                'deleted': self.stats_deleted,
+                'unchanged': self.stats_unchanged
+            },
+            'read_requests': self.read_requests,
+            'write_requests': self.write_requests,
+            'errors': self.errors
+        }
+
+
+def player_key(record: Dict[str, Any]) -> Tuple:
+    """Natural key of a player record: (name, birth date)."""
+    return tuple(record.get(f) for f in PLAYER_KEY_FIELDS)
+
+
+def stat_key(record: Dict[str, Any]) -> Tuple:
+    """Natural key of a statistics row within a player: (season, team, league)."""
+    return tuple(record.get(f) for f in STAT_KEY_FIELDS)
+
+
+def changed_fields(local: Dict[str, Any], remote: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fields whose local value differs from the remote record.
+
+    Values that only differ by type (e.g. 0.9 vs "0.9") are equal.
+
+    Args:
+        local: Local record
+        remote: Remote record
+
+    Returns:
+        Dictionary of changed fields with local values
+    """
+    changes = {}
+    for name, value in local.items():
+        current = remote.get(name)
+        if value == current:
+            continue
+        if value is not None and current is not None and str(value) == str(current):
+            continue
+        changes[name] = value
+    return changes
+
+
+def fetch_all(
+    client: DirectusClient,
+    collection: str,
+    fields: Optional[List[str]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    report: Optional[SyncReport] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> Optional[List[Dict]]:
+    """
+    Read every item of a collection in keyset pages.
+
+    Args:
+        client: DirectusClient instance
+        collection: Collection name
+        fields: Fields to request (default: all)
+        page_size: Items per request
+        report: SyncReport to count read requests on
+        filters: Filters as for DirectusClient.list_items
+
+    Returns:
+        List of items, or None if any page failed
+    """
+    pager = client.iter_items(collection, fields=fields, filters=filters, page_size=page_size)
+    try:
+        return list(pager)
+    except ConnectionError:
+        return None
+    finally:
+        if report is not None:
+            report.read_requests += pager.pages
+
+
+def fetch_matching(
+    client: DirectusClient,
+    collection: str,
+    field_name: str,
+    values: Iterable[Any],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    report: Optional[SyncReport] = None
+) -> Optional[List[Dict]]:
+    """
+    Read the items whose field is one of values (_in filters in chunks).
+
+    Args:
+        client: DirectusClient instance
+        collection: Collection name
+        field_name: Field to match
+        values: Wanted values
+        page_size: Items per request
+        report: SyncReport to count read requests on
+
+    Returns:
+        List of items, or None if any page failed
+    """
+    values = sorted({str(value) for value in values})
+
+    # _in takes a comma-separated list: values containing commas go alone
+    filters = [{field_name: value} for value in values if ',' in value]
+    listed = [value for value in values if ',' not in value]
+    filters += [
+        {field_name: {'_in': ','.join(listed[i:i + MATCH_CHUNK_SIZE])}}
+        for i in range(0, len(listed), MATCH_CHUNK_SIZE)
+    ]
+
+    items = []
+    for query_filter in filters:
+        page = fetch_all(client, collection, page_size=page_size, report=report, filters=query_filter)
+        if page is None:
+            return None
+        items.extend(page)
+    return items
+
+
+class RemoteIndex:
+    """In-memory index of remote players and statistics by natural key."""
+
+    def __init__(self, players: List[Dict], statistics: List[Dict]):
+        """
+        Build index.
+
+        Duplicate players (same natural key) keep the lowest id; the
+        others are listed in duplicate_player_ids.
+
+        Args:
+            players: Remote player records (with 'id')
+            statistics: Remote statistics rows (with 'id' and 'player_id')
+        """
+        self.players: Dict[Tuple, Dict] = {}
+        self.duplicate_player_ids: List[int] = []
+
+        for record in sorted(players, key=lambda r: r['id']):
+            key = player_key(record)
+            if key in self.players:
+                self.duplicate_player_ids.append(record['id'])
+            else:
+                self.players[key] = record
+
+        self.stats_by_player: Dict[int, Dict[Tuple, Dict]] = {}
+        self.duplicate_stat_ids: List[int] = []
+
+        for row in sorted(statistics, key=lambda r: r['id']):
+            rows = self.stats_by_player.setdefault(row.get('player_id'), {})
+            key = stat_key(row)
+            if key in rows:
+                self.duplicate_stat_ids.append(row['id'])
+            else:
+                rows[key] = row
+
+    @classmethod
+    def load(
+        cls,
+        client: DirectusClient,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        report: Optional[SyncReport] = None,
+        names: Optional[Iterable[str]] = None
+    ) -> Optional['RemoteIndex']:
+        """
+        Pull players and statistics in bulk pages and index them.
+
+        Args:
+            client: DirectusClient instance
+            page_size: Items per request
+            report: SyncReport to count read requests on
+            names: Read only players with these names and their
+                statistics (default: whole collections)
+
+        Returns:
+            RemoteIndex, or None if a read failed
+        """
+        if names is None:
+            players = fetch_all(client, 'players', page_size=page_size, report=report)
+        else:
+            players = fetch_matching(client, 'players', 'name', names, page_size, report)
+        if players is None:
+            return None
+
+        if names is None:
+            statistics = fetch_all(client, 'statistics', page_size=page_size, report=report)
+        else:
+            ids = [record['id'] for record in players]
+            statistics = fetch_matching(client, 'statistics', 'player_id', ids, page_size, report)
+        if statistics is None:
+            return None
+
+        return cls(players, statistics)
+
+
+def _write_chunks(
+    report: SyncReport,
+    label: str,
+    items: List[Any],
+    write,
+    chunk_size: int,
+    owner: Optional[Callable[[Any], Optional[Tuple]]] = None
+) -> bool:
+    """Send items through write() in chunks, recording errors (and the players owning failed items)."""
+    ok = True
+    for chunk in chunk_items(items, chunk_size):
+        report.write_requests += 1
+        if not write(chunk):
+            report.errors.append(f"{label} failed for {len(chunk)} items")
+            if owner is not None:
+                report.failed_players.update(key for key in map(owner, chunk) if key is not None)
+            ok = False
+    return ok
+
+
+def sync_players(
+    players: List,  # List[PlayerData] from models.py
+    client: DirectusClient,
+    delete_missing: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_size: int = 100,
+    scoped: bool = False
+) -> SyncReport:
+    """
+    Make Directus match the given players with the fewest writes.
+
+    Statistics rows of synced players that are not in the local data are
+    deleted. Players not in the local data, and duplicate players left by
+    earlier blind uploads, are deleted only with delete_missing.
+    Players whose writes failed are listed in report.failed_players.
+
+    Args:
+        players: PlayerData objects (the desired state)
+        client: DirectusClient instance
+        delete_missing: Also delete remote players absent locally
+        page_size: Items per read request
+        chunk_size: Items per write request
+        scoped: Read only the remote records of these players (by name)
+            instead of whole collections; cannot delete_missing
+
+    Returns:
+        SyncReport with operation and request counts
+    """
+    if scoped and delete_missing:
+        raise ValueError("delete_missing needs the full remote index (scoped=False)")
+
+    report = SyncReport()
+
+    names = {player_data.player.name for player_data in players} if scoped else None
+    remote = RemoteIndex.load(client, page_size=page_size, report=report, names=names)
+    if remote is None:
+        report.errors.append("Failed to read existing records")
+        report.failed_players.update(player_key(p.player.to_dict()) for p in players)
+        return report
+
+    # Players: patch changed, collect missing
+    local_keys = set()
+    player_ids: Dict[Tuple, int] = {}
+    to_create: List[Tuple[Tuple, Dict]] = []
+    player_patches = []
+
+    for player_data in players:
+        record = player_data.player.to_dict()
+        key = player_key(record)
+        if key in local_keys:
+            continue
+        local_keys.add(key)
+
+        existing = remote.players.get(key)
+        if existing is None:
+            to_create.append((key, record))
+            continue
+
+        player_ids[key] = existing['id']
+        changes = changed_fields(record, existing)
+        if changes:
+            player_patches.append({**changes, 'id': existing['id']})
+        else:
+            report.players_unchanged += 1
+
+    key_by_id = {player_id: key for key, player_id in player_ids.items()}
+    if player_patches and _write_chunks(
+        report, 'player update', player_patches,
+        lambda chunk: client.update_items('players', chunk), chunk_size,
+        lambda patch: key_by_id.get(patch['id'])
+    ):
+        report.players_updated = len(player_patches)
+
+    for chunk in chunk_items(to_create, chunk_size):
+        report.write_requests += 1
+        ids = client.create_players([record for _, record in chunk])
+        if ids is None:
+            report.errors.append(f"player create failed for {len(chunk)} items")
+            report.failed_players.update(key for key, _ in chunk)
+            continue
+        for (key, _), player_id in zip(chunk, ids):
+            player_ids[key] = player_id
+        report.players_created += len(ids)
+
+    # Statistics: diff per player
+    stat_creates = []
+    stat_patches = []
+    stat_deletes = list(remote.duplicate_stat_ids)
+    stat_owner: Dict[int, Tuple] = {}
+
+    synced_keys = set()
+    for player_data in players:
+        key = player_key(player_data.player.to_dict())
+        player_id = player_ids.get(key)
+        if player_id is None or key in synced_keys:
+            continue
+        synced_keys.add(key)
+        key_by_id[player_id] = key
+
+        existing_rows = remote.stats_by_player.pop(player_id, {})
+        for stat in player_statistics(player_data):
+            row = {**stat, 'player_id': player_id}
+            existing = existing_rows.pop(stat_key(stat), None)
+            if existing is None:
+                stat_creates.append(row)
+                continue
+            changes = changed_fields(row, existing)
+            if changes:
+                stat_patches.append({**changes, 'id': existing['id']})
+                stat_owner[existing['id']] = key
+            else:
+                report.stats_unchanged += 1
+
+        stat_deletes.extend(row['id'] for row in existing_rows.values())
+        stat_owner.update((row['id'], key) for row in existing_rows.values())
+
+    missing_players = []
+    if delete_missing:
+        missing_players = [
+            record['id'] for key, record in remote.players.items()
+            if key not in local_keys
+        ] + remote.duplicate_player_ids
+
+        # Statistics of deleted players go with them
+        for player_id in missing_players:
+            stat_deletes.extend(row['id'] for row in remote.stats_by_player.pop(player_id, {}).values())
+
+    if stat_creates and _write_chunks(
+        report, 'statistics create', stat_creates,
+        client.create_statistics_rows, chunk_size,
+        lambda row: key_by_id.get(row['player_id'])
+    ):
+        report.stats_created = len(stat_creates)
+
+    if stat_patches and _write_chunks(
+        report, 'statistics update', stat_patches,
+        lambda chunk: client.update_items('statistics', chunk), chunk_size,
+        lambda patch: stat_owner.get(patch['id'])
+    ):
+        report.stats_updated = len(stat_patches)
+
+    if stat_deletes and _write_chunks(
+        report, 'statistics delete', stat_deletes,
+        lambda chunk: client.delete_items('statistics', chunk), chunk_size,
+        stat_owner.get
+    ):
+        report.stats_deleted = len(stat_deletes)
+
+    # Players last, after the statistics that reference them
+    if missing_players and _write_chunks(
+        report, 'player delete', missing_players,
+        lambda chunk: client.delete_items('players', chunk), chunk_size
+    ):
+        report.players_deleted = len(missing_players)
+
+    print(
+        f"Sync: players +{report.players_created} ~{report.players_updated}"
+        f" -{report.players_deleted} ={report.players_unchanged},"
+        f" stats +{report.stats_created} ~{report.stats_updated}"
+        f" -{report.stats_deleted} ={report.stats_unchanged}"
+        f" ({report.write_requests} writes)"
+    )
+    return report
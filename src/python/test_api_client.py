@@ -0,0 +1,486 @@
+"""
+Tests for api_client module against the local mock Directus server.
+Run with: python test_api_client.py
+"""
+import contextlib
+import io
+import json
+import sys
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api_client import (
+    DirectusClient, iter_json_rows, player_statistics, upload_player_data, upload_players_batch
+)
+from async_upload import run_async_upload
+from mock_directus import MockDirectusServer
+from models import Player, PlayerData, Season
+from sync import RemoteIndex, player_key, sync_players
+
+
+def _player(name: str, seasons: int = 3) -> PlayerData:
+    """Build a PlayerData with simple season rows."""
+    return PlayerData(
+        player=Player(name=name, position="Center -- shoots L", birth_date="Jan 1 1990"),
+        seasons=[
+            Season(season=f"{2010 + s}-{11 + s}", team="Test Team", league="NHL",
+                   gp=82, g=s, a=s, pts=2 * s, pim=4)
+            for s in range(seasons)
+        ]
+    )
+
+
+def _quiet(func, *args, **kwargs):
+    """Call func with stdout captured."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def test_pooled_session_reuses_connection():
+    """Test sequential requests share one keep-alive connection."""
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            for i in range(5):
+                _quiet(upload_player_data, _player(f"Player {i}"), client)
+
+        assert server.state.requests == 10
+        assert server.state.connections == 1, f"Opened {server.state.connections} connections"
+
+    print("OK - test_pooled_session_reuses_connection passed")
+
+
+def test_delete_player_no_content():
+    """Test 204 No Content counts as a successful delete."""
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            player_id = _quiet(client.create_player, {'name': 'Temp'})
+            assert _quiet(client.delete_player, player_id)
+            assert server.items('players') == []
+
+    print("OK - test_delete_player_no_content passed")
+
+
+def test_upload_players_batch():
+    """Test batch upload uses two requests per chunk and maps ids back."""
+    players = [_player(f"Player {i}") for i in range(25)]
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            results = _quiet(upload_players_batch, players, client, chunk_size=10)
+
+        assert server.state.requests == 6, f"Made {server.state.requests} requests"
+        assert all(r.ok for r in results)
+        assert [r.name for r in results] == [p.player.name for p in players]
+
+        stored = {p['id']: p['name'] for p in server.items('players')}
+        for result in results:
+            assert stored[result.player_id] == result.name
+            assert result.stats_created == 3
+
+        stats = server.items('statistics')
+        assert len(stats) == 75
+        assert all(stored[s['player_id']] for s in stats)
+
+    print("OK - test_upload_players_batch passed")
+
+
+def test_upload_players_batch_partial_failure():
+    """Test one invalid player fails alone and is reported per item."""
+    players = [_player(f"Player {i}") for i in range(5)]
+    players[2].player.name = ''
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            results = _quiet(upload_players_batch, players, client, chunk_size=10)
+
+        assert [r.ok for r in results] == [True, True, False, True, True]
+        assert results[2].error == 'player create failed'
+        assert client.last_failure is None
+        assert len(server.items('players')) == 4
+        assert len(server.items('statistics')) == 12
+
+    print("OK - test_upload_players_batch_partial_failure passed")
+
+
+def test_batch_lost_response_not_resent():
+    """Test a batch applied by the server but never answered is not re-POSTed."""
+    players = [_player(f"Player {i}") for i in range(3)]
+
+    with MockDirectusServer(lost_responses=1) as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            results = _quiet(upload_players_batch, players, client, chunk_size=10)
+            assert client.last_failure.status is None
+            assert not client.last_failure.rejected
+
+        assert [r.error for r in results] == ['player create outcome unknown'] * 3
+        assert len(server.items('players')) == 3
+
+    with MockDirectusServer(lost_responses=1) as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            ids = _quiet(client.bulk_create_players, [{'name': f"Player {i}"} for i in range(3)])
+
+        assert ids == []
+        assert len(server.items('players')) == 3
+
+    print("OK - test_batch_lost_response_not_resent passed")
+
+
+def test_bulk_create_players_chunks():
+    """Test bulk_create_players sends arrays bounded by size."""
+    players = [{'name': f"Player {i}"} for i in range(7)]
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            ids = _quiet(client.bulk_create_players, players, chunk_size=3)
+
+        assert len(ids) == 7
+        assert server.state.requests == 3
+
+    print("OK - test_bulk_create_players_chunks passed")
+
+
+def test_async_upload_window():
+    """Test async upload overlaps requests and keeps stats after players."""
+    players = [_player(f"Player {i}") for i in range(24)]
+    produced = []
+
+    def producer():
+        for player_data in players:
+            produced.append(player_data)
+            yield player_data
+
+    with MockDirectusServer(latency=0.02) as server:
+        client = DirectusClient(api_url=server.url, token=server.token, pool_size=8)
+        report = _quiet(run_async_upload, producer(), concurrency=8, client=client)
+        client.close()
+
+        assert report.uploaded == 24 and report.failed == 0
+        # Sequential would take 48 requests * 20ms = 0.96s
+        assert report.elapsed < 0.5, f"Took {report.elapsed:.2f}s"
+        assert report.max_queue_depth <= 16
+
+        player_ids = {p['id'] for p in server.items('players')}
+        stats = server.items('statistics')
+        assert len(stats) == 72
+        assert all(s['player_id'] in player_ids for s in stats)
+
+    print("OK - test_async_upload_window passed")
+
+
+def test_sync_idempotent():
+    """Test sync writes only diffs and cleans up blind-upload duplicates."""
+    players = [_player(f"Player {i}") for i in range(10)]
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            # Earlier blind run left one duplicate player with its stats
+            _quiet(upload_player_data, players[0], client)
+            _quiet(upload_player_data, players[0], client)
+
+            first = _quiet(sync_players, players, client)
+            assert first.ok, first.errors
+            assert first.players_created == 9 and first.stats_created == 27
+
+            second = _quiet(sync_players, players, client)
+            assert second.write_requests == 0, second.to_dict()
+            assert second.players_unchanged == 10 and second.stats_unchanged == 30
+
+            players[3].seasons[1].g = 40
+            third = _quiet(sync_players, players, client)
+            assert third.write_requests == 1
+            assert third.stats_updated == 1 and third.stats_unchanged == 29
+
+            cleanup = _quiet(sync_players, players[:9], client, delete_missing=True)
+            assert cleanup.ok, cleanup.errors
+            assert cleanup.players_deleted == 2 and cleanup.stats_deleted == 6
+
+        assert len(server.items('players')) == 9
+        assert len(server.items('statistics')) == 27
+        assert len({p['name'] for p in server.items('players')}) == 9
+
+    print("OK - test_sync_idempotent passed")
+
+
+def test_sync_scoped():
+    """Test a scoped sync reads only its players' records and reports failed players."""
+    players = [_player(f"Player {i}") for i in range(10)] + [_player("Smith, Jr.")]
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            assert _quiet(sync_players, players, client).ok
+            remote = RemoteIndex.load(client, names=["Player 3", "Smith, Jr."])
+            assert sorted(name for name, _ in remote.players) == ["Player 3", "Smith, Jr."]
+            assert sum(len(rows) for rows in remote.stats_by_player.values()) == 6
+
+            players[3].seasons[1].g = 40
+            players[10].seasons[0].g = 7
+            scoped = _quiet(sync_players, [players[3], players[10]], client, scoped=True)
+            assert scoped.ok, scoped.errors
+            assert scoped.players_unchanged == 2 and scoped.players_deleted == 0
+            assert scoped.stats_updated == 2 and scoped.stats_unchanged == 4
+
+            try:
+                sync_players(players[:1], client, delete_missing=True, scoped=True)
+                assert False, "delete_missing needs the full index"
+            except ValueError:
+                pass
+
+            # Statistics updates fail: only their owner is reported
+            players[3].seasons[1].g = 41
+            players[5].seasons.append(
+                Season(season="2030-31", team="Test Team", league="NHL", gp=10, g=1, a=1, pts=2, pim=0)
+            )
+            update_items = client.update_items
+            client.update_items = lambda collection, items: collection != 'statistics' and update_items(collection, items)
+            partial = _quiet(sync_players, [players[3], players[5]], client, scoped=True)
+            assert not partial.ok and partial.stats_created == 1
+            assert partial.failed_players == {player_key(players[3].player.to_dict())}
+            assert partial.player_ok(player_key(players[5].player.to_dict()))
+
+        assert len(server.items('players')) == 11
+        assert len(server.items('statistics')) == 34
+
+    print("OK - test_sync_scoped passed")
+
+
+def test_get_player_by_name_cached():
+    """Test lookups are cached, coalesced and invalidated by writes."""
+    with MockDirectusServer(latency=0.02) as server:
+        with DirectusClient(api_url=server.url, token=server.token, pool_size=8) as client:
+            player_id = _quiet(client.create_player, {'name': "Ryan O'Reilly"})
+            server.state.requests = 0
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                found = list(pool.map(client.get_player_by_name, ["Ryan O'Reilly"] * 8))
+            assert all(p['id'] == player_id for p in found)
+            assert server.state.requests == 1, f"Made {server.state.requests} requests"
+
+            assert client.get_player_by_name("Nobody") is None
+            assert client.get_player_by_name("Nobody") is None
+            assert server.state.requests == 2
+
+            _quiet(client.update_player, player_id, {'birth_place': 'Clinton, ONT'})
+            assert client.get_player_by_name("Ryan O'Reilly")['birth_place'] == 'Clinton, ONT'
+
+            _quiet(client.create_player, {'name': 'Nobody'})
+            assert client.get_player_by_name("Nobody") is not None
+
+            client.delete_items('players', [player_id])
+            assert client.get_player_by_name("Ryan O'Reilly") is None
+
+    print("OK - test_get_player_by_name_cached passed")
+
+
+def test_iter_items_paging():
+    """Test keyset and offset paging, field selection and filters."""
+    with MockDirectusServer() as server:
+        with server.state.lock:
+            for i in range(1050):
+                server.state.insert('statistics', {'player_id': i % 7, 'season': f"{i}", 'goals': i})
+
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            server.state.requests = 0
+            pager = client.iter_statistics(fields=['goals'], page_size=100)
+            rows = list(pager)
+
+            assert [r['goals'] for r in rows] == list(range(1050))
+            assert set(rows[0]) == {'goals', 'id'}
+            assert pager.pages == 11 and server.state.requests == 11
+
+            offset_ids = [r['id'] for r in client.iter_items('statistics', page_size=100, keyset=False, prefetch=False)]
+            assert offset_ids == [r['id'] for r in rows]
+
+            player_rows = list(client.iter_statistics(player_id=3, page_size=40))
+            assert len(player_rows) == 150 and all(r['player_id'] == 3 for r in player_rows)
+
+            # Stopping early does not read the rest of the collection
+            server.state.requests = 0
+            for i, _ in enumerate(client.iter_statistics(page_size=100)):
+                if i == 150:
+                    break
+            assert server.state.requests <= 3
+
+    print("OK - test_iter_items_paging passed")
+
+
+def test_iter_items_constant_memory():
+    """Test streaming holds about two pages, not the whole collection."""
+    with MockDirectusServer() as server:
+        with server.state.lock:
+            for i in range(5000):
+                server.state.insert('statistics', {'player_id': i, 'season': '2000-01', 'team': 'x' * 100})
+
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            tracemalloc.start()
+            count = sum(1 for _ in client.iter_statistics(page_size=200))
+            _, streaming_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            rows = list(client.iter_statistics(page_size=200))
+            _, list_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        assert count == len(rows) == 5000
+        assert streaming_peak < list_peak / 3, f"{streaming_peak} vs {list_peak}"
+
+    print("OK - test_iter_items_constant_memory passed")
+
+
+def test_mock_fault_injection():
+    """Test injected errors and rate limits, and 429 POST retry."""
+    with MockDirectusServer(error_rate=1.0, error_status=500) as server:
+        with DirectusClient(api_url=server.url, token=server.token, max_retries=2, backoff_factor=0) as client:
+            assert _quiet(client.create_player, {'name': 'A'}) is None
+            assert server.state.requests == 1, "POST retried after a 500"
+
+            assert _quiet(client.list_items, 'players') is None
+            assert server.state.requests == 4
+
+        assert server.state.metrics()['injected_errors'] == 4
+
+    with MockDirectusServer(rate_limit=5.0, burst=1) as server:
+        with DirectusClient(api_url=server.url, token=server.token, max_retries=3) as client:
+            ids = [_quiet(client.create_player, {'name': f"P{i}"}) for i in range(2)]
+
+        assert all(ids), "Rate-limited POST was not retried"
+        metrics = server.state.metrics()
+        assert metrics['rate_limited'] >= 1
+        assert metrics['statuses'][429] == metrics['rate_limited']
+        assert len(server.items('players')) == 2
+
+    print("OK - test_mock_fault_injection passed")
+
+
+def test_iter_json_rows():
+    """Test streamed rows match copying, including fallback shapes."""
+    groups = [
+        (7, [{'season': '2010-11', 'team': 'A {"x"} B', 'goals': 3}, {'season': '2011-12', 'goals': None}]),
+        (8, []),
+        (9, [{'season': '2012-13', 'nested': {'a': 1}}]),
+        (10, [{}]),
+        (11, [{'player_id': 1, 'season': '2013-14'}])
+    ]
+    expected = [{**row, 'player_id': pid} for pid, rows in groups for row in rows]
+
+    encoded = b''.join(iter_json_rows(groups))
+    assert json.loads(encoded) == expected, encoded
+    assert json.loads(b''.join(iter_json_rows([]))) == []
+
+    print("OK - test_iter_json_rows passed")
+
+
+def test_gzip_request_bodies():
+    """Test gzip bodies store the same rows and fall back on 415."""
+    players = [_player(f"Player {i}", seasons=25) for i in range(10)]
+    stored = {}
+
+    for compress in (False, True):
+        with MockDirectusServer() as server:
+            with DirectusClient(api_url=server.url, token=server.token, compress=compress) as client:
+                _quiet(upload_players_batch, players, client)
+            stored[compress] = (server.items('statistics'), server.state.metrics()['bytes_received'])
+
+    assert stored[True][0] == stored[False][0]
+    assert stored[True][1] < stored[False][1] / 5, f"{stored[True][1]} vs {stored[False][1]}"
+
+    with MockDirectusServer(accept_gzip=False) as server:
+        with DirectusClient(api_url=server.url, token=server.token, compress=True) as client:
+            results = _quiet(upload_players_batch, players[:2], client)
+            assert all(r.ok for r in results)
+            assert not client.compress
+        assert server.state.metrics()['statuses'][415] == 1
+        assert len(server.items('statistics')) == 50
+
+    print("OK - test_gzip_request_bodies passed")
+
+
+def test_replace_statistics():
+    """Test current-season diff and whole-set replace paths."""
+    player_data = _player("Veteran", seasons=20)
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            player_id = _quiet(upload_players_batch, [player_data], client)[0].player_id
+            old_ids = {row['id'] for row in server.items('statistics')}
+
+            def replace():
+                server.state.requests = 0
+                assert _quiet(client.replace_statistics, player_id, player_statistics(player_data))
+                rows = [r for r in server.items('statistics') if r['player_id'] == player_id]
+                assert sorted(r['season'] for r in rows) == sorted(s.season for s in player_data.seasons)
+                return rows, server.state.requests
+
+            rows, requests_made = replace()
+            assert requests_made == 1, "Unchanged stats should only be read"
+
+            # Current season only: patch in place
+            player_data.seasons[-1].g = 30
+            rows, requests_made = replace()
+            assert requests_made == 2
+            assert {r['id'] for r in rows} == old_ids
+
+            player_data.seasons.append(
+                Season(season="2030-31", team="Test Team", league="NHL", gp=10, g=1, a=1, pts=2, pim=0)
+            )
+            rows, requests_made = replace()
+            assert requests_made == 2 and len(rows) == 21
+
+            # Older seasons changed: insert all, delete old by filter
+            player_data.seasons[0].g = 99
+            del player_data.seasons[5]
+            rows, requests_made = replace()
+            assert requests_made == 3
+            assert not {r['id'] for r in rows} & old_ids
+            assert [r['goals'] for r in rows if r['season'] == '2010-11'] == [99]
+
+    print("OK - test_replace_statistics passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== API CLIENT TESTS ===\n")
+
+    tests = [
+        test_pooled_session_reuses_connection,
+        test_delete_player_no_content,
+        test_upload_players_batch,
+        test_upload_players_batch_partial_failure,
+        test_batch_lost_response_not_resent,
+        test_bulk_create_players_chunks,
+        test_async_upload_window,
+        test_sync_idempotent,
+        test_sync_scoped,
+        test_get_player_by_name_cached,
+        test_iter_items_paging,
+        test_iter_items_constant_memory,
+        test_mock_fault_injection,
+        test_iter_json_rows,
+        test_gzip_request_bodies,
+        test_replace_statistics
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
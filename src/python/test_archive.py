@@ -0,0 +1,224 @@
+"""
+Tests for archive module.
+Run with: python test_archive.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from archive import COMPACT_JOURNAL, INDEX_FILE, PageArchive, parse_archive
+
+
+STAMKOS_PAGE = """Steven Stamkos
+Center -- shoots R
+Born Feb 7 1990 -- Markham, ONT
+
+Season 	Team 	Lge 	GP 	G 	A 	Pts 	PIM 	+/- 	GP 	G 	A 	Pts 	PIM
+2008-09 	Tampa Bay Lightning 	NHL 	79 	23 	23 	46 	39 	-13 	-- 	-- 	-- 	-- 	--"""
+
+
+def test_append_and_get():
+    """Test pages round-trip and latest version wins."""
+    with tempfile.TemporaryDirectory() as root:
+        with PageArchive(root) as archive:
+            archive.append(96607, "first version", fetch_time=1.0)
+            archive.append(67286, "other player", fetch_time=2.0)
+            entry = archive.append(96607, "second version", fetch_time=3.0)
+
+            assert archive.get(96607) == "second version"
+            assert archive.get(67286) == "other player"
+            assert archive.get(1) is None
+            assert len(archive) == 2
+            assert archive.superseded == 1
+            assert entry.fetch_time == 3.0
+
+        # Reopen from disk
+        with PageArchive(root) as archive:
+            assert archive.get(96607) == "second version"
+            assert archive.index[96607].fetch_time == 3.0
+            assert archive.superseded == 1
+
+    print("OK - test_append_and_get passed")
+
+
+def test_segment_rollover_and_streaming():
+    """Test segments roll over and streaming yields latest pages in order."""
+    with tempfile.TemporaryDirectory() as root:
+        with PageArchive(root, segment_size=200) as archive:
+            for player_id in range(20):
+                archive.append(player_id, f"page {player_id} " * 20)
+            archive.append(3, "page 3 updated")
+
+            assert len(archive.segments()) > 1, "Expected multiple segments"
+
+            pages = list(archive.iter_pages())
+            ids = [player_id for player_id, _, _ in pages]
+            assert sorted(ids) == list(range(20))
+            assert ids[-1] == 3
+            assert dict((p, t) for p, t, _ in pages)[3] == "page 3 updated"
+
+            all_versions = list(archive.iter_pages(latest_only=False))
+            assert len(all_versions) == 21
+
+    print("OK - test_segment_rollover_and_streaming passed")
+
+
+def test_compact():
+    """Test compaction drops superseded versions and keeps latest."""
+    with tempfile.TemporaryDirectory() as root:
+        with PageArchive(root, segment_size=500) as archive:
+            for version in range(5):
+                for player_id in range(10):
+                    archive.append(player_id, f"player {player_id} version {version} " * 10)
+
+            dropped, reclaimed = archive.compact()
+
+            assert dropped == 40, f"Dropped {dropped}"
+            assert reclaimed > 0
+            assert archive.superseded == 0
+            assert archive.get(7).startswith("player 7 version 4")
+
+            archive.append(7, "after compaction")
+            assert archive.get(7) == "after compaction"
+
+        with PageArchive(root) as archive:
+            assert len(archive) == 10
+            assert archive.get(7) == "after compaction"
+            assert archive.get(2).startswith("player 2 version 4")
+
+    print("OK - test_compact passed")
+
+
+class _Crash(Exception):
+    """Simulated process death."""
+
+
+def test_compact_crash_safe():
+    """Test a crash at any rename or delete of compaction loses no page."""
+    def fill(root):
+        with PageArchive(root, segment_size=200) as archive:
+            for version in range(3):
+                for player_id in range(1, 9):
+                    archive.append(player_id, f"player {player_id} version {version} " * 5)
+
+    expected = {player_id: f"player {player_id} version 2 " * 5 for player_id in range(1, 9)}
+    real_replace, real_unlink = os.replace, os.unlink
+
+    crash_at = 1
+    while True:
+        calls = [0]
+
+        def counted(real):
+            def call(*args, **kwargs):
+                calls[0] += 1
+                if calls[0] == crash_at:
+                    raise _Crash()
+                return real(*args, **kwargs)
+            return call
+
+        with tempfile.TemporaryDirectory() as root:
+            fill(root)
+            archive = PageArchive(root, segment_size=200)
+            before = archive.segments()
+            try:
+                with mock.patch('os.replace', counted(real_replace)), mock.patch('os.unlink', counted(real_unlink)):
+                    archive.compact()
+                finished = True
+            except _Crash:
+                finished = False
+
+            # Reopen as after a restart: every latest page is readable
+            with PageArchive(root, segment_size=200) as reopened:
+                assert {pid: reopened.get(pid) for pid in reopened.index} == expected, crash_at
+                assert [pid for pid, _, _ in reopened.iter_pages()] == sorted(expected), crash_at
+                assert not list(Path(root).glob('*.tmp')) and not (Path(root) / COMPACT_JOURNAL).exists()
+                # Either rolled back to the old segments or fully compacted
+                if reopened.superseded:
+                    assert reopened.superseded == 16 and reopened.segments() == before, crash_at
+                else:
+                    referenced = {entry.segment for entry in reopened.index.values()}
+                    assert set(reopened.segments()) == referenced and min(referenced) > max(before), crash_at
+
+                reopened.append(3, "after restart")
+                reopened.compact()
+                assert reopened.get(3) == "after restart" and reopened.get(4) == expected[4]
+
+        if finished:
+            break
+        crash_at += 1
+
+    assert crash_at > 5, "compaction never reached its later steps"
+    print(f"OK - test_compact_crash_safe passed ({crash_at - 1} crash points)")
+
+
+def test_rebuild_index():
+    """Test a lost index is rebuilt from segment headers."""
+    with tempfile.TemporaryDirectory() as root:
+        with PageArchive(root) as archive:
+            archive.append(1, "one", fetch_time=10.0)
+            archive.append(1, "one again", fetch_time=20.0)
+
+        (Path(root) / INDEX_FILE).unlink()
+
+        with PageArchive(root) as archive:
+            assert archive.get(1) == "one again"
+            assert archive.index[1].fetch_time == 20.0
+            assert archive.superseded == 1
+
+    print("OK - test_rebuild_index passed")
+
+
+def test_parse_archive():
+    """Test archived pages stream into the parser."""
+    with tempfile.TemporaryDirectory() as root:
+        with PageArchive(root) as archive:
+            archive.append(96607, STAMKOS_PAGE)
+            players = list(parse_archive(archive))
+
+    assert len(players) == 1
+    assert players[0].player.name == "Steven Stamkos"
+    assert players[0].seasons[0].gp == 79
+
+    print("OK - test_parse_archive passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== ARCHIVE TESTS ===\n")
+
+    tests = [
+        test_append_and_get,
+        test_segment_rollover_and_streaming,
+        test_compact,
+        test_compact_crash_safe,
+        test_rebuild_index,
+        test_parse_archive
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
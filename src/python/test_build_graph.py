@@ -0,0 +1,282 @@
+"""
+Tests for build_graph and shards modules.
+Run with: python test_build_graph.py
+"""
+import contextlib
+import io
+import json
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api_client import DirectusClient
+from build_graph import PARSE, SHARD, UPLOAD, run_incremental
+from export import export_players, update_players
+from mock_directus import MockDirectusServer
+from models import PlayerData
+from parser import parse_player_data
+from shards import DATA_DIR, shard_json
+
+
+def _page(name: str, goals: int = 23, born: str = "Feb 7 1990") -> str:
+    """Player page text in the HockeyDB text format."""
+    return f"""{name}
+Center -- shoots R
+Born {born} -- Markham, ONT
+Height 6.01 -- Weight 193 [185 cm/88 kg]
+
+\tRegular Season \tPlayoffs
+Season \tTeam \tLge \tGP \tG \tA \tPts \tPIM \t+/- \tGP \tG \tA \tPts \tPIM
+2008-09 \tTampa Bay Lightning \tNHL \t79 \t{goals} \t23 \t{goals + 23} \t39 \t-13 \t-- \t-- \t-- \t-- \t--
+2009-10 \tTampa Bay Lightning \tNHL \t82 \t51 \t44 \t95 \t38 \t-2 \t-- \t-- \t-- \t-- \t--"""
+
+
+def _build(root: str, pages, **kwargs):
+    """Run an incremental build into root with output captured."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_incremental(pages, data_dir=f"{root}/data", state_path=f"{root}/state.db", **kwargs)
+
+
+def test_shard_round_trip():
+    """Test shards are serialized byte-for-byte like the game's data files."""
+    for path in sorted((DATA_DIR / 'players').glob('*.json')):
+        text = path.read_text(encoding='utf-8')
+        player_data = PlayerData.from_shard_dict(json.loads(text))
+        assert shard_json(player_data.to_shard_dict()) == text, path.name
+
+    print("OK - test_shard_round_trip passed")
+
+
+def test_rebuilds_only_stale_nodes():
+    """Test unchanged pages are skipped and changed ones rebuilt."""
+    pages = [_page("Steven Stamkos"), _page("Ryan O'Reilly"), _page("Nazem Kadri")]
+
+    with tempfile.TemporaryDirectory() as root:
+        players_dir = Path(root) / 'data' / 'players'
+
+        first = _build(root, pages)
+        assert first.built[PARSE] == 3 and first.built[SHARD] == 3
+        assert sorted(p.name for p in players_dir.iterdir()) == ['kadri.json', 'oreilly.json', 'stamkos.json']
+
+        second = _build(root, pages)
+        assert second.built == {PARSE: 0, SHARD: 0, UPLOAD: 0}
+        assert second.skipped[SHARD] == 3 and not second.manifest_written
+        assert second.time_saved > 0
+
+        # One page changed, one shard deleted by hand, one page dropped
+        (players_dir / 'kadri.json').unlink()
+        third = _build(root, [_page("Steven Stamkos", goals=30), pages[2]])
+        reasons = dict(third.rebuilt)
+        assert third.built[PARSE] == 1 and third.skipped[PARSE] == 1
+        assert reasons['shard:stamkos'] == 'input changed'
+        assert reasons['shard:kadri'] == 'output missing'
+        assert third.removed == ['shard:oreilly']
+        assert not (players_dir / 'oreilly.json').exists()
+
+        stamkos = json.loads((players_dir / 'stamkos.json').read_text())
+        assert stamkos['seasons'][0]['g'] == 30
+
+        # Code change: shards are rebuilt, parsed records reused
+        with sqlite3.connect(f"{root}/state.db") as conn:
+            conn.execute("UPDATE nodes SET code_version = 'old' WHERE kind = ?", (SHARD,))
+        fourth = _build(root, [_page("Steven Stamkos", goals=30), pages[2]])
+        assert fourth.built[PARSE] == 0 and fourth.built[SHARD] == 2
+        assert set(dict(fourth.rebuilt).values()) == {'code changed'}
+
+    print("OK - test_rebuilds_only_stale_nodes passed")
+
+
+def test_dry_run_and_manifest():
+    """Test dry run writes nothing and hand-made manifest entries are kept."""
+    with tempfile.TemporaryDirectory() as root:
+        data_dir = Path(root) / 'data'
+        data_dir.mkdir()
+        (data_dir / 'manifest.json').write_text(json.dumps({'players': [
+            {'id': 'holmstrom', 'name': 'Tomas Holmstrom', 'file': 'players/holmstrom.json'}
+        ]}))
+
+        plan = _build(root, [_page("Steven Stamkos")], dry_run=True)
+        assert plan.dry_run and plan.built[SHARD] == 1
+        assert dict(plan.rebuilt)['shard:stamkos'] == 'new'
+        assert not (data_dir / 'players').exists()
+        assert _build(root, [_page("Steven Stamkos")], dry_run=True).built[SHARD] == 1
+
+        _build(root, [_page("Steven Stamkos")])
+        manifest = json.loads((data_dir / 'manifest.json').read_text())
+        # New players are appended to the existing entries
+        assert [p['id'] for p in manifest['players']] == ['holmstrom', 'stamkos']
+
+    print("OK - test_dry_run_and_manifest passed")
+
+
+def test_keeps_export_layout():
+    """Test an incremental build after an export keeps bundles, hashed names and indexes."""
+    pages = [_page("Tomas Holmstrom"), _page("Nazem Kadri"), _page("Ryan O'Reilly")]
+
+    with tempfile.TemporaryDirectory() as root:
+        data_dir = Path(root) / 'data'
+        players = [parse_player_data(page) for page in pages]
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_players(players, data_dir=str(data_dir), workers=1, bundles=2, hashed=True,
+                           autocomplete=True, fuzzy=True)
+
+        report = _build(root, [_page("Tomas Holmstrom", goals=40), pages[1]])
+        assert report.ok and report.built[SHARD] == 2 and report.removed == []
+        manifest = json.loads((data_dir / 'manifest.json').read_text())
+
+        assert len(manifest['bundles']) == 2
+        assert manifest['autocomplete']['file'].startswith('autocomplete.')
+        assert manifest['fuzzy']['file'].startswith('fuzzy.')
+        for entry in manifest['players']:
+            # O'Reilly's page is not part of the build: kept as it was, in its bundle
+            assert {'hash', 'size', 'last_modified', 'bundle', 'offset'} <= set(entry), entry
+            assert entry['file'] == f"players/{entry['id']}.{entry['hash'][:12]}.json"
+        shards = sorted(p.name.split('.')[0] for p in (data_dir / 'players').iterdir())
+        assert shards == ['holmstrom', 'kadri', 'oreilly']
+        holmstrom = next(e for e in manifest['players'] if e['id'] == 'holmstrom')
+        assert json.loads((data_dir / holmstrom['file']).read_text())['seasons'][0]['g'] == 40
+
+        # Fresh shards are found under their hashed names; a dropped page
+        # removes its shard and entry
+        again = _build(root, [_page("Tomas Holmstrom", goals=40)])
+        assert again.skipped[SHARD] == 1 and again.removed == ['shard:kadri']
+        manifest = json.loads((data_dir / 'manifest.json').read_text())
+        assert [e['id'] for e in manifest['players']] == ['holmstrom', 'oreilly']
+        assert 'bundles' in manifest and 'fuzzy' in manifest
+        assert not list((data_dir / 'players').glob('kadri*'))
+
+    print("OK - test_keeps_export_layout passed")
+
+
+def test_writes_only_stale_shards():
+    """Test an incremental build rewrites only stale shards and the bundle holding them."""
+    pages = [_page(f"Player {name}", born=f"Jan 1 19{90 + i}") for i, name in enumerate("ABCD")]
+
+    with tempfile.TemporaryDirectory() as root:
+        data_dir = Path(root) / 'data'
+        players = [parse_player_data(page) for page in pages]
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_players(players, data_dir=str(data_dir), workers=1, bundles=2)
+        _build(root, pages)
+
+        before = {path.name: path.stat().st_mtime_ns for path in data_dir.rglob('*.json')}
+        manifest = json.loads((data_dir / 'manifest.json').read_text())
+        old_bundles = manifest['bundles']
+        changed = next(e for e in manifest['players'] if e['id'] == 'b')
+
+        pages[1] = _page("Player B", goals=40, born="Jan 1 1991")
+        with mock.patch('build_graph.update_players', wraps=update_players) as update:
+            report = _build(root, pages)
+        assert report.built[SHARD] == 1 and report.skipped[SHARD] == 3
+        assert [slug for slug, _ in update.call_args.args[0]] == ['b']
+
+        after = {path.name: path.stat().st_mtime_ns for path in data_dir.rglob('*.json')}
+        rewritten = {name for name in before if after.get(name) != before[name]}
+        bundle = old_bundles[changed['bundle']]['file'].split('/')[-1]
+        assert rewritten == {'b.json', bundle, 'manifest.json'}, rewritten
+
+        # Entries keep their order and bundle places
+        merged = json.loads((data_dir / 'manifest.json').read_text())
+        assert [(e['id'], e['bundle'], e['offset']) for e in merged['players']] == \
+            [(e['id'], e['bundle'], e['offset']) for e in manifest['players']]
+        stored = json.loads((data_dir / merged['bundles'][changed['bundle']]['file']).read_text())
+        assert stored[changed['offset']]['seasons'][0]['g'] == 40
+
+    print("OK - test_writes_only_stale_shards passed")
+
+
+def test_incremental_uploads():
+    """Test only players whose records changed are synced again."""
+    pages = [_page(f"Player {name}", born=f"Jan 1 19{90 + i}") for i, name in enumerate("ABCD")]
+
+    with tempfile.TemporaryDirectory() as root:
+        with MockDirectusServer() as server:
+            with DirectusClient(api_url=server.url, token=server.token) as client:
+                first = _build(root, pages, client=client)
+                assert first.built[UPLOAD] == 4 and first.ok
+                assert len(server.items('players')) == 4
+
+                pages[1] = _page("Player B", goals=40, born="Jan 1 1991")
+                server.state.requests = 0
+                second = _build(root, pages, client=client)
+
+            assert second.built[UPLOAD] == 1 and second.skipped[UPLOAD] == 3
+            assert dict(second.rebuilt)['upload:b'] == 'input changed'
+            assert len(server.items('players')) == 4
+            goals = sorted(s['goals'] for s in server.items('statistics') if s['season'] == '2008-09')
+            assert goals == [23, 23, 23, 40]
+
+    print("OK - test_incremental_uploads passed")
+
+
+def test_partial_upload_failure():
+    """Test players whose writes succeeded are not uploaded again after a partial failure."""
+    pages = [_page(f"Player {name}", born=f"Jan 1 19{90 + i}") for i, name in enumerate("ABCD")]
+
+    with tempfile.TemporaryDirectory() as root:
+        with MockDirectusServer() as server:
+            with DirectusClient(api_url=server.url, token=server.token) as client:
+                assert _build(root, pages, client=client).ok
+
+                # B's statistics update fails, C's statistics create succeeds
+                pages[1] = _page("Player B", goals=40, born="Jan 1 1991")
+                pages[2] += "\n2010-11 \tTampa Bay Lightning \tNHL \t82 \t45 \t46 \t91 \t74 \t3 \t-- \t-- \t-- \t-- \t--"
+                update_items = client.update_items
+                client.update_items = lambda collection, items: collection != 'statistics' and update_items(collection, items)
+                partial = _build(root, pages, client=client)
+                assert not partial.ok and partial.built[UPLOAD] == 1
+                assert [key for key, _ in partial.rebuilt if key.startswith(UPLOAD)] == ['upload:c']
+
+                client.update_items = update_items
+                retry = _build(root, pages, client=client)
+
+            assert retry.ok and retry.built[UPLOAD] == 1 and retry.skipped[UPLOAD] == 3
+            assert dict(retry.rebuilt)['upload:b'] == 'input changed'
+            goals = sorted(s['goals'] for s in server.items('statistics') if s['season'] == '2008-09')
+            assert goals == [23, 23, 23, 40]
+            assert len(server.items('statistics')) == 9
+
+    print("OK - test_partial_upload_failure passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== BUILD GRAPH TESTS ===\n")
+
+    tests = [
+        test_shard_round_trip,
+        test_rebuilds_only_stale_nodes,
+        test_dry_run_and_manifest,
+        test_keeps_export_layout,
+        test_writes_only_stale_shards,
+        test_incremental_uploads,
+        test_partial_upload_failure
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
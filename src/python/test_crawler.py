@@ -0,0 +1,190 @@
+"""
+Tests for crawler module.
+Run with: python test_crawler.py
+"""
+import sys
+import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from crawler import BloomFilter, IdBitmap, PlayerFrontier, RosterCrawler
+from rate_control import AdaptiveRateController
+
+
+FIXTURE_PAGES = {
+    'stte/lightning-2009.html': """<html><body>
+<a href="/ihdb/stats/pdisplay.php?pid=96607">Steven Stamkos</a>
+<a href="/ihdb/stats/pdisplay.php?pid=67286">Martin St. Louis</a>
+<a href="/stte/lightning-2010.html">Next season</a>
+<a href="/stte/lightning-2009.html#top">Top</a>
+</body></html>""",
+    'stte/lightning-2010.html': """<html><body>
+<a href="/ihdb/stats/pdisplay.php?pid=96607">Steven Stamkos</a>
+<a href="/ihdb/stats/pdisplay.php?pid=104402">Victor Hedman</a>
+<a href="/stte/lightning-2011.html">Next season</a>
+<a href="/stte/missing.html">Broken link</a>
+</body></html>""",
+    'stte/lightning-2011.html': """<html><body>
+<a href="/ihdb/stats/pdisplay.php?pid=104402">Victor Hedman</a>
+<a href="/ihdb/stats/pdisplay.php?pid=5">Old Timer</a>
+</body></html>""",
+}
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without request logging."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_fixture_site(root: str) -> ThreadingHTTPServer:
+    """Start a local HTTP server over the fixture directory."""
+    for name, html in FIXTURE_PAGES.items():
+        path = Path(root) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(html, encoding='utf-8')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_id_bitmap():
+    """Test bitmap dedupe, growth and size."""
+    seen = IdBitmap(max_id=100)
+
+    assert seen.add(96607)
+    assert not seen.add(96607)
+    assert 96607 in seen
+    assert 96606 not in seen
+    assert len(seen) == 1
+
+    # 10M IDs in under 2 MB
+    big = IdBitmap(max_id=10_000_000)
+    assert big.nbytes < 2 * 1024 * 1024, f"Bitmap was {big.nbytes} bytes"
+
+    print("OK - test_id_bitmap passed")
+
+
+def test_bloom_filter():
+    """Test Bloom filter membership and false-positive rate."""
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+
+    for i in range(10_000):
+        bloom.add(f"https://example.com/stte/team-{i}.html")
+
+    assert "https://example.com/stte/team-42.html" in bloom
+    assert not bloom.add("https://example.com/stte/team-42.html")
+
+    false_positives = sum(
+        f"https://example.com/other-{i}.html" in bloom for i in range(10_000)
+    )
+    assert false_positives < 300, f"Got {false_positives} false positives"
+
+    print("OK - test_bloom_filter passed")
+
+
+def test_frontier_priority():
+    """Test frontier pops by priority, then discovery order."""
+    frontier = PlayerFrontier()
+
+    assert frontier.push(1, priority=0)
+    assert frontier.push(2, priority=5)
+    assert frontier.push(3, priority=0)
+    assert not frontier.push(2, priority=10)
+
+    assert frontier.pop_batch(2) == [2, 1]
+    assert list(frontier.drain()) == [3]
+    assert frontier.pop() is None
+
+    print("OK - test_frontier_priority passed")
+
+
+def test_crawl_fixture_site():
+    """Test crawling a local fixture site discovers every player once."""
+    with tempfile.TemporaryDirectory() as root:
+        server = _serve_fixture_site(root)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        try:
+            rate = AdaptiveRateController(initial_rate=100.0, max_rate=100.0)
+            seeds = [f"{base}/stte/lightning-2009.html"]
+
+            with RosterCrawler(seeds, max_depth=5, rate_controller=rate) as crawler:
+                crawler.crawl()
+                ids = list(crawler.frontier.drain())
+        finally:
+            server.shutdown()
+
+    assert sorted(ids) == [5, 67286, 96607, 104402], f"Got {ids}"
+    # Seed page players first (depth 0), deepest page last
+    assert ids[:2] == [96607, 67286], f"Got {ids}"
+    assert ids[-1] == 5
+    assert crawler.pages_fetched == 3
+    assert crawler.pages_failed == 1
+
+    print("OK - test_crawl_fixture_site passed")
+
+
+def test_iter_player_ids_lazy():
+    """Test lazy iteration fetches pages only as needed."""
+    pages = {
+        'a': '<a href="pdisplay.php?pid=1"></a><a href="/stte/b"></a>',
+        '/stte/b': '<a href="pdisplay.php?pid=2"></a>',
+    }
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return pages.get(url)
+
+    crawler = RosterCrawler(['a'], fetch=fetch)
+    ids = crawler.iter_player_ids()
+
+    assert next(ids) == 1
+    assert fetched == ['a']
+    assert crawler.pages_fetched == 1
+
+    print("OK - test_iter_player_ids_lazy passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== CRAWLER TESTS ===\n")
+
+    tests = [
+        test_id_bitmap,
+        test_bloom_filter,
+        test_frontier_priority,
+        test_crawl_fixture_site,
+        test_iter_player_ids_lazy
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
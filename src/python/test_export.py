@@ -0,0 +1,209 @@
+"""
+Tests for export module.
+Run with: python test_export.py
+"""
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import hashlib
+
+from export import NAME_HASH_LENGTH, balance_bundles, export_players
+from models import Player, PlayerData, Season
+from shards import DATA_DIR
+
+
+def _player(name: str, goals: int = 10) -> PlayerData:
+    """PlayerData with one season."""
+    return PlayerData(
+        player=Player(name=name, position="Center", birth_date="Jan 1 1990"),
+        seasons=[Season("2008-09", "Tampa Bay Lightning", "NHL", 79, goals, 23, goals + 23, 39, "-13")]
+    )
+
+
+def _players(count: int) -> list:
+    """count players with distinct last names."""
+    return [_player(f"Test Player{i}", goals=i) for i in range(count)]
+
+
+def test_skips_unchanged_shards():
+    """Test re-exporting writes only changed shards and keeps hand-made entries."""
+    players = _players(5)
+
+    with tempfile.TemporaryDirectory() as root:
+        players_dir = Path(root) / 'players'
+        (Path(root) / 'manifest.json').write_text(json.dumps({'players': [
+            {'id': 'holmstrom', 'name': 'Tomas Holmstrom', 'file': 'players/holmstrom.json'}
+        ]}))
+
+        first = export_players(players, data_dir=root, workers=1)
+        assert len(first.written) == 5 and first.unchanged == 0 and first.manifest_written
+        mtimes = {p.name: p.stat().st_mtime_ns for p in players_dir.iterdir()}
+
+        second = export_players(players, data_dir=root, workers=1)
+        assert second.written == [] and second.unchanged == 5
+        assert not second.manifest_written
+        assert {p.name: p.stat().st_mtime_ns for p in players_dir.iterdir()} == mtimes
+
+        players[3] = _player("Test Player3", goals=50)
+        third = export_players(players, data_dir=root, workers=1)
+        assert third.written == ['player3'] and third.unchanged == 4
+        assert json.loads((players_dir / 'player3.json').read_text())['seasons'][0]['g'] == 50
+
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        assert [p['id'] for p in manifest['players']] == [f'player{i}' for i in range(5)] + ['holmstrom']
+        assert not list(players_dir.glob('.*.tmp'))
+
+    print("OK - test_skips_unchanged_shards passed")
+
+
+def test_parallel_matches_serial():
+    """Test the process pool writes the same files as a serial export."""
+    players = _players(12)
+
+    with tempfile.TemporaryDirectory() as root:
+        serial = export_players(players, data_dir=f"{root}/serial", workers=1)
+        parallel = export_players(players, data_dir=f"{root}/parallel", workers=3, chunk_size=4)
+        assert parallel.workers == 3 and parallel.ok
+        assert sorted(parallel.written) == sorted(serial.written)
+
+        for path in sorted(Path(f"{root}/serial").rglob('*.json')):
+            other = Path(f"{root}/parallel") / path.relative_to(f"{root}/serial")
+            assert other.read_bytes() == path.read_bytes(), path.name
+
+        again = export_players(players, data_dir=f"{root}/parallel", workers=3, chunk_size=4)
+        assert again.written == [] and again.unchanged == 12
+
+    print("OK - test_parallel_matches_serial passed")
+
+
+def test_prune_and_existing_shards():
+    """Test prune removes other shards and real shards export unchanged."""
+    with tempfile.TemporaryDirectory() as root:
+        export_players(_players(3), data_dir=root, workers=1)
+        report = export_players(_players(2), data_dir=root, workers=1, prune=True)
+        assert report.removed == ['player2']
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        assert [p['id'] for p in manifest['players']] == ['player0', 'player1']
+
+    # Shards in src/data re-exported from their own content are untouched
+    shards = sorted((DATA_DIR / 'players').glob('*.json'))
+    players = [PlayerData.from_shard_dict(json.loads(p.read_text(encoding='utf-8'))) for p in shards]
+    with tempfile.TemporaryDirectory() as root:
+        (Path(root) / 'players').mkdir()
+        for path in shards:
+            (Path(root) / 'players' / path.name).write_bytes(path.read_bytes())
+        report = export_players(players, data_dir=root, workers=1)
+        assert report.written == [] and report.unchanged == len(shards)
+
+    print("OK - test_prune_and_existing_shards passed")
+
+
+def test_bundles():
+    """Test bundles are size-balanced and manifest offsets point at the right players."""
+    assert balance_bundles([10] * 9, 3) == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert balance_bundles([100, 1, 1], 3) == [0, 1, 1]
+    assert balance_bundles([5, 5], 4) == [0, 1]
+
+    players = _players(10)
+    with tempfile.TemporaryDirectory() as root:
+        report = export_players(players, data_dir=root, workers=1, bundles=3)
+        assert len(report.bundles_written) == 3
+
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        sizes = [bundle['size'] for bundle in manifest['bundles']]
+        assert max(sizes) - min(sizes) < 2 * max(len(json.dumps(p.to_shard_dict())) for p in players)
+        for entry in manifest['players']:
+            bundle = json.loads((Path(root) / manifest['bundles'][entry['bundle']]['file']).read_text())
+            shard = json.loads((Path(root) / entry['file']).read_text())
+            assert bundle[entry['offset']] == shard, entry['id']
+
+        again = export_players(players, data_dir=root, workers=1, bundles=3)
+        assert again.bundles_written == [] and again.bundles_unchanged == 3 and not again.manifest_written
+
+        plain = export_players(players, data_dir=root, workers=1)
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        assert 'bundles' not in manifest and 'bundle' not in manifest['players'][0]
+        assert sorted(plain.removed) == ['bundles/bundle-0', 'bundles/bundle-1', 'bundles/bundle-2']
+
+    print("OK - test_bundles passed")
+
+
+def test_hashed_names():
+    """Test content-hashed names, manifest metadata and removal of replaced files."""
+    players = _players(3)
+
+    with tempfile.TemporaryDirectory() as root:
+        export_players(players, data_dir=root, workers=1, bundles=2, hashed=True)
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        for entry in manifest['players'] + manifest['bundles']:
+            data = (Path(root) / entry['file']).read_bytes()
+            assert entry['hash'] == hashlib.sha256(data).hexdigest() and entry['size'] == len(data)
+            assert f".{entry['hash'][:NAME_HASH_LENGTH]}.json" in entry['file']
+            assert entry['last_modified'].endswith('Z')
+
+        old = {entry['id']: entry for entry in manifest['players']}
+        old['player0']['last_modified'] = '2000-01-01T00:00:00Z'
+        manifest['players'][0] = old['player0']
+        (Path(root) / 'manifest.json').write_text(json.dumps(manifest))
+
+        players[1] = _player("Test Player1", goals=70)
+        report = export_players(players, data_dir=root, workers=1, bundles=2, hashed=True)
+        assert report.written == ['player1']
+        assert Path(old['player1']['file']).stem in report.removed
+
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        new = {entry['id']: entry for entry in manifest['players']}
+        assert new['player1']['hash'] != old['player1']['hash']
+        assert new['player0']['last_modified'] == '2000-01-01T00:00:00Z'
+        assert not (Path(root) / old['player1']['file']).exists()
+        names = sorted(p.name for p in (Path(root) / 'players').iterdir())
+        assert names == sorted(entry['file'][len('players/'):] for entry in manifest['players'])
+        assert len(list((Path(root) / 'bundles').iterdir())) == 2
+
+        export_players(players, data_dir=root, workers=1)
+        assert sorted(p.name for p in (Path(root) / 'players').iterdir()) == [
+            'player0.json', 'player1.json', 'player2.json'
+        ]
+
+    print("OK - test_hashed_names passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== EXPORT TESTS ===\n")
+
+    tests = [
+        test_skips_unchanged_shards,
+        test_parallel_matches_serial,
+        test_prune_and_existing_shards,
+        test_bundles,
+        test_hashed_names
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,172 @@
+"""
+Tests for fuzzy module.
+Run with: python test_fuzzy.py
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from export import export_players
+from fuzzy import FuzzyIndex, build_fuzzy_index, edit_distance, max_typos, trigrams
+from models import Player, PlayerData, Season
+from name_index import build_prefix_index, fold_name, name_keys
+
+
+def _player(name: str, goals: int = 10) -> PlayerData:
+    """PlayerData with one season."""
+    return PlayerData(
+        player=Player(name=name, position="Center", birth_date="Jan 1 1990"),
+        seasons=[Season("2008-09", "Tampa Bay Lightning", "NHL", 79, goals, 23, goals + 23, 39, "-13")]
+    )
+
+
+def _table_distance(a: str, b: str) -> int:
+    """Reference edit distance (full table, adjacent swaps count once)."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_edit_distance():
+    """Test the bit-parallel distance against the full table."""
+    assert edit_distance('holmstrom', 'holmstrom', 1) == 0
+    assert edit_distance('holmstorm', 'holmstrom', 1) == 1
+    assert edit_distance('kadri', 'kardi', 2) == 1
+    assert edit_distance('kadri', 'nazem kadri', 2) == 3
+    assert edit_distance('', 'ab', 2) == 2
+
+    rng = random.Random(5)
+    for _ in range(5000):
+        a = ''.join(rng.choices('abc ', k=rng.randint(0, 9)))
+        b = ''.join(rng.choices('abc ', k=rng.randint(0, 9)))
+        limit = rng.randint(0, 3)
+        assert edit_distance(a, b, limit) == min(_table_distance(a, b), limit + 1), (a, b, limit)
+
+    assert trigrams('kadri') == {' ka', 'kad', 'adr', 'dri', 'ri '}
+    assert [max_typos(n) for n in (4, 5, 9, 10)] == [0, 1, 1, 2]
+
+    print("OK - test_edit_distance passed")
+
+
+def test_match_typos_and_accents():
+    """Test accents, swaps and missing letters match; short names need to be exact."""
+    index = FuzzyIndex(json.loads(json.dumps(build_fuzzy_index(build_prefix_index([
+        ('oreilly', "Ryan O'Reilly", 1200),
+        ('holmstrom', 'Tomas Holmström', 1400),
+        ('kadri', 'Nazem Kadri', 1100),
+        ('hossa', 'Marian Hossa', 1700),
+        ('orr', 'Bobby Orr', 2000)
+    ])))))
+
+    assert index.match('Tomas Holmstrom') == [('holmstrom', 'Tomas Holmström', 0)]
+    assert index.match('holmstorm') == [('holmstrom', 'Tomas Holmström', 1)]
+    assert index.match('ryan oreily')[0] == ('oreilly', "Ryan O'Reilly", 1)
+    assert index.match('nazem kardi')[0][0] == 'kadri'
+    assert index.match('orr') == [('orr', 'Bobby Orr', 0)]
+    assert index.match('hosa') == [] and index.match('hosa', max_distance=1)[0][0] == 'hossa'
+    assert index.match('') == [] and index.match('wayne gretzky') == []
+
+    print("OK - test_match_typos_and_accents passed")
+
+
+def test_large_index():
+    """Test 100k names: results agree with a full scan and queries stay fast."""
+    rng = random.Random(3)
+    syllables = sorted({rng.choice('bcdfghjklmnprstvz') + rng.choice('aeiouy') + rng.choice(['', 'n', 'r', 's'])
+                        for _ in range(600)})
+
+    def word(count: int) -> str:
+        return ''.join(rng.choices(syllables, k=count)).title()
+
+    entries = [(f'p{i}', f'{word(2)} {word(rng.randint(2, 3))}', rng.randint(0, 3000)) for i in range(100_000)]
+    data = build_fuzzy_index(build_prefix_index(entries))
+    index = FuzzyIndex(data)
+
+    queries = []
+    for _, name, _ in rng.sample(entries, 40):
+        folded = list(fold_name(name))
+        i = rng.randrange(len(folded) - 1)
+        folded[i], folded[i + 1] = folded[i + 1], folded[i]
+        queries.append(''.join(folded))
+    queries.append(fold_name(entries[0][1]).split()[-1])
+
+    for query in queries[:2] + queries[-1:]:
+        typos = max_typos(len(query))
+        expected = sorted(
+            (min(edit_distance(query, key, typos) for key in name_keys(name)), number)
+            for number, (_, name) in enumerate(data['players'])
+        )
+        expected = [(data['players'][n][0], distance) for distance, n in expected if distance <= typos][:5]
+        assert [(pid, distance) for pid, _, distance in index.match(query)] == expected, query
+
+    start = time.perf_counter()
+    for query in queries:
+        assert index.match(query), query
+    per_query = (time.perf_counter() - start) / len(queries)
+    assert per_query < 0.01, per_query
+
+    print(f"OK - test_large_index passed ({per_query * 1000:.2f} ms/query)")
+
+
+def test_export_fuzzy():
+    """Test the exporter writes fuzzy.json next to the other indexes."""
+    players = [_player("Tomas Holmström", goals=30), _player("Nazem Kadri", goals=20)]
+
+    with tempfile.TemporaryDirectory() as root:
+        report = export_players(players, data_dir=root, workers=1, autocomplete=True, fuzzy=True)
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        assert sorted(report.indexes_written) == ['autocomplete.json', 'fuzzy.json']
+        assert manifest['fuzzy']['file'] == 'fuzzy.json'
+
+        index = FuzzyIndex(json.loads((Path(root) / 'fuzzy.json').read_text(encoding='utf-8')))
+        assert index.match('holmstrom')[0][:2] == ('holmstrom', 'Tomas Holmström')
+
+        report = export_players(players, data_dir=root, workers=1, autocomplete=True)
+        assert report.removed == ['fuzzy'] and 'fuzzy' not in json.loads((Path(root) / 'manifest.json').read_text())
+
+    print("OK - test_export_fuzzy passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== FUZZY TESTS ===\n")
+
+    tests = [
+        test_edit_distance,
+        test_match_typos_and_accents,
+        test_large_index,
+        test_export_fuzzy
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,135 @@
+"""
+Tests for lookup_cache module.
+Run with: python test_lookup_cache.py
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lookup_cache import LookupCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_expiry():
+    """Test entries expire after ttl and None results are not cached."""
+    clock = FakeClock()
+    cache = LookupCache(ttl=10, clock=clock)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return len(loads)
+
+    assert cache.get_or_load('a', loader) == 1
+    clock.now += 9
+    assert cache.get_or_load('a', loader) == 1
+    clock.now += 1
+    assert cache.get_or_load('a', loader) == 2
+
+    assert cache.get_or_load('none', lambda: None) is None
+    assert cache.get('none', 'missing') == 'missing'
+
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3
+
+    print("OK - test_ttl_expiry passed")
+
+
+def test_lru_eviction():
+    """Test least recently used entry is evicted first."""
+    cache = LookupCache(max_size=2, ttl=60)
+
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2 and cache.stats()['evictions'] == 1
+
+    print("OK - test_lru_eviction passed")
+
+
+def test_single_flight():
+    """Test concurrent lookups share one load and invalidation discards it."""
+    cache = LookupCache(ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load('k', slow_loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    time.sleep(0.05)
+
+    # A write lands while the load is in flight
+    cache.invalidate('k')
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(loads) == 1
+    assert results == ['value'] * 8
+    assert cache.get('k') is None, "Value loaded before invalidation was stored"
+    assert cache.stats()['coalesced'] == 7
+
+    print("OK - test_single_flight passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== LOOKUP CACHE TESTS ===\n")
+
+    tests = [
+        test_ttl_expiry,
+        test_lru_eviction,
+        test_single_flight
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
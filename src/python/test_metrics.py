@@ -0,0 +1,159 @@
+"""
+Tests for metrics module and the metrics recorded by other modules.
+Run with: python test_metrics.py
+"""
+import contextlib
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api_client import RECORDS_UPLOADED, REQUESTS, RETRIES, DirectusClient, upload_players_batch
+from metrics import MetricsRegistry, write_metrics
+from mock_directus import MockDirectusServer
+from models import Player, PlayerData, Season
+from stages import QUEUE_DEPTH_MAX, STAGE_ITEMS, Stage, StagedPipeline
+
+
+def _player(name: str, seasons: int = 3) -> PlayerData:
+    """Build a PlayerData with simple season rows."""
+    return PlayerData(
+        player=Player(name=name, position="Center -- shoots L", birth_date="Jan 1 1990"),
+        seasons=[
+            Season(season=f"{2010 + s}-{11 + s}", team="Test Team", league="NHL",
+                   gp=82, g=s, a=s, pts=2 * s, pim=4)
+            for s in range(seasons)
+        ]
+    )
+
+
+def _quiet(func, *args, **kwargs):
+    """Call func with stdout captured."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def test_counter_gauge_labels():
+    """Test counters and gauges track values per label set."""
+    registry = MetricsRegistry()
+    pages = registry.counter('pages_total', 'Pages', ['status'])
+    depth = registry.gauge('depth', 'Depth', ['stage'])
+
+    pages.inc(status='ok')
+    pages.inc(2, status='ok')
+    pages.inc(status='failed')
+    depth.set_max(5, stage='parse')
+    depth.set_max(3, stage='parse')
+
+    assert pages.value(status='ok') == 3 and pages.value(status='failed') == 1
+    assert depth.value(stage='parse') == 5
+    assert registry.counter('pages_total', 'Pages', ['status']) is pages
+
+    for bad in (lambda: pages.inc(-1, status='ok'),
+                lambda: pages.inc(kind='x'),
+                lambda: registry.gauge('pages_total', 'Pages', ['status'])):
+        try:
+            bad()
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+    print("OK - test_counter_gauge_labels passed")
+
+
+def test_prometheus_and_json_export():
+    """Test text format lines and JSON snapshot written to files."""
+    registry = MetricsRegistry()
+    latency = registry.histogram('fetch_seconds', 'Fetch latency', ['method'], buckets=(0.1, 1.0))
+    registry.counter('rows_total', 'Rows with "quotes"', ['table']).inc(7, table='a"b')
+
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, method='GET')
+
+    text = registry.to_prometheus()
+    assert '# TYPE fetch_seconds histogram' in text
+    assert 'fetch_seconds_bucket{method="GET",le="0.1"} 1' in text
+    assert 'fetch_seconds_bucket{method="GET",le="1"} 2' in text
+    assert 'fetch_seconds_bucket{method="GET",le="+Inf"} 3' in text
+    assert 'fetch_seconds_count{method="GET"} 3' in text
+    assert 'rows_total{table="a\\"b"} 7' in text
+
+    with tempfile.TemporaryDirectory() as root:
+        written = write_metrics(root, registry=registry, extra={'run': 'nightly'})
+        assert Path(written['prometheus']).read_text() == text
+        snapshot = json.loads(Path(written['json']).read_text())
+        assert not list(Path(root).glob('.*.tmp'))
+
+    assert snapshot['run'] == 'nightly'
+    hist = snapshot['metrics']['fetch_seconds']['values'][0]
+    assert hist['count'] == 3 and hist['buckets']['+Inf'] == 3
+    assert snapshot['metrics']['rows_total']['values'] == [{'labels': {'table': 'a"b'}, 'value': 7}]
+
+    print("OK - test_prometheus_and_json_export passed")
+
+
+def test_pipeline_metrics_recorded():
+    """Test client and stage metrics count uploads, retries and queue depth."""
+    created = RECORDS_UPLOADED.value(collection='players', method='POST')
+    stats = RECORDS_UPLOADED.value(collection='statistics', method='POST')
+    retries = RETRIES.value(reason='503')
+    failed_gets = REQUESTS.value(method='GET', status='503')
+
+    with MockDirectusServer() as server:
+        with DirectusClient(api_url=server.url, token=server.token) as client:
+            pipeline = StagedPipeline([
+                Stage('metrics_upload', lambda batch: upload_players_batch(batch, client),
+                      queue_size=4, batch_size=5)
+            ])
+            _quiet(pipeline.run, (_player(f"P{i}") for i in range(10)))
+
+    with MockDirectusServer(error_rate=1.0, error_status=503) as server:
+        with DirectusClient(api_url=server.url, token=server.token, max_retries=2, backoff_factor=0) as client:
+            _quiet(client.list_items, 'players')
+
+    assert RECORDS_UPLOADED.value(collection='players', method='POST') - created == 10
+    assert RECORDS_UPLOADED.value(collection='statistics', method='POST') - stats == 30
+    assert RETRIES.value(reason='503') - retries == 2
+    assert REQUESTS.value(method='GET', status='503') - failed_gets == 1
+    assert STAGE_ITEMS.value(stage='metrics_upload', direction='in') >= 10
+    assert 1 <= QUEUE_DEPTH_MAX.value(stage='metrics_upload') <= 4
+
+    print("OK - test_pipeline_metrics_recorded passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== METRICS TESTS ===\n")
+
+    tests = [
+        test_counter_gauge_labels,
+        test_prometheus_and_json_export,
+        test_pipeline_metrics_recorded
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
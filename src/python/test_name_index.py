@@ -0,0 +1,149 @@
+"""
+Tests for name_index module.
+Run with: python test_name_index.py
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from export import export_players
+from models import Player, PlayerData, Season
+from name_index import PrefixIndex, build_prefix_index, fold_name, name_keys, popularity
+
+
+def _player(name: str, goals: int = 10) -> PlayerData:
+    """PlayerData with one season."""
+    return PlayerData(
+        player=Player(name=name, position="Center", birth_date="Jan 1 1990"),
+        seasons=[Season("2008-09", "Tampa Bay Lightning", "NHL", 79, goals, 23, goals + 23, 39, "-13")]
+    )
+
+
+def test_fold_name():
+    """Test accents, apostrophes and punctuation fold to one form."""
+    assert fold_name("Ryan O'Reilly") == fold_name("Ryan OReilly") == 'ryan oreilly'
+    assert fold_name("Ryan O’Reilly") == 'ryan oreilly'
+    assert fold_name("Piteå") == fold_name("PITEA") == 'pitea'
+    assert fold_name("Ørjan Æbelø") == 'orjan aebelo'
+    assert fold_name("Ľubomír Višňovský") == 'lubomir visnovsky'
+    assert fold_name("Jean-Gabriel  Pageau ") == 'jean gabriel pageau'
+    assert fold_name("J.T. Miller") == 'jt miller'
+    assert name_keys("Jean-Gabriel Pageau") == ['jean gabriel pageau', 'gabriel pageau', 'pageau']
+
+    print("OK - test_fold_name passed")
+
+
+def test_search_ranked_by_popularity():
+    """Test every word prefix matches, most popular first."""
+    index = PrefixIndex(build_prefix_index([
+        ('oreilly', "Ryan O'Reilly", 1200),
+        ('holmstrom', "Tomas Holmström", 1400),
+        ('kadri', 'Nazem Kadri', 1100),
+        ('hossa', 'Marian Hossa', 1700),
+        ('ohlund', 'Mattias Ohlund', 900)
+    ]))
+
+    assert [pid for pid, _ in index.search('ho')] == ['hossa', 'holmstrom']
+    assert [pid for pid, _ in index.search('hol')] == ['holmstrom']
+    assert [pid for pid, _ in index.search("o'r")] == ['oreilly']
+    assert [pid for pid, _ in index.search('o')] == ['oreilly', 'ohlund']
+    assert [pid for pid, _ in index.search('ma', limit=1)] == ['hossa']
+    assert index.search('nazem k') == [('kadri', 'Nazem Kadri')]
+    assert index.search('') == [] and index.search('zz') == []
+
+    assert popularity(_player("A B", goals=10)) == 79 + 33
+    assert popularity(PlayerData(player=Player(name="A B", position="Center"))) == 0
+
+    print("OK - test_search_ranked_by_popularity passed")
+
+
+def test_large_index():
+    """Test 100k names: short and long prefixes agree with a full scan and stay fast."""
+    rng = random.Random(7)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    entries = [
+        (f'p{i}', ''.join(rng.choices(letters, k=6)).title() + ' ' + ''.join(rng.choices(letters, k=8)).title(),
+         rng.randint(0, 3000))
+        for i in range(100_000)
+    ]
+    data = build_prefix_index(entries)
+    index = PrefixIndex(json.loads(json.dumps(data)))
+
+    queries = ['q', 'qu', 'que', 'kel', 'mb']
+    keys = [name_keys(name) for _, name in data['players']]
+    for query in queries:
+        expected = [n for n, player_keys in enumerate(keys) if any(k.startswith(query) for k in player_keys)][:10]
+        assert [pid for pid, _ in index.search(query)] == [data['players'][n][0] for n in expected], query
+
+    start = time.perf_counter()
+    for query in queries * 200:
+        index.search(query)
+    per_query = (time.perf_counter() - start) / (len(queries) * 200)
+    assert per_query < 0.005, per_query
+    assert data['keys'] == sorted(data['keys'])
+
+    print("OK - test_large_index passed")
+
+
+def test_export_autocomplete():
+    """Test the exporter writes the index, lists it in the manifest and removes it when disabled."""
+    players = [_player("Test Player0", goals=1), _player("Other Skater", goals=40)]
+
+    with tempfile.TemporaryDirectory() as root:
+        first = export_players(players, data_dir=root, workers=1, autocomplete=True, hashed=True)
+        manifest = json.loads((Path(root) / 'manifest.json').read_text())
+        entry = manifest['autocomplete']
+        assert first.indexes_written == [entry['file']] and entry['file'].startswith('autocomplete.')
+
+        index = PrefixIndex(json.loads((Path(root) / entry['file']).read_text(encoding='utf-8')))
+        assert index.players[0][0] == 'skater' and index.search('pla') == [('player0', 'Test Player0')]
+
+        again = export_players(players, data_dir=root, workers=1, autocomplete=True, hashed=True)
+        assert again.indexes_written == [] and not again.manifest_written
+
+        export_players(players, data_dir=root, workers=1)
+        assert 'autocomplete' not in json.loads((Path(root) / 'manifest.json').read_text())
+        assert not list(Path(root).glob('autocomplete*.json'))
+
+    print("OK - test_export_autocomplete passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== NAME INDEX TESTS ===\n")
+
+    tests = [
+        test_fold_name,
+        test_search_ranked_by_popularity,
+        test_large_index,
+        test_export_autocomplete
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
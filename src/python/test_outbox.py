@@ -0,0 +1,276 @@
+"""
+Tests for outbox module against the local mock Directus server.
+Run with: python test_outbox.py
+"""
+import contextlib
+import io
+import json
+import socket
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api_client import DirectusClient, upload_record
+from mock_directus import MockDirectusServer
+from models import Player, PlayerData, Season
+from outbox import DEAD, DONE, INFLIGHT, PENDING, SCHEMA, Outbox, OutboxWorker, drain_outbox
+
+
+def _player(name: str, seasons: int = 3) -> PlayerData:
+    """Build a PlayerData with simple season rows."""
+    return PlayerData(
+        player=Player(name=name, position="Defence -- shoots L", birth_date="Mar 3 1985"),
+        seasons=[
+            Season(season=f"{2005 + s}-{6 + s:02d}", team="Test Team", league="NHL",
+                   gp=80, g=s, a=s, pts=2 * s, pim=20)
+            for s in range(seasons)
+        ]
+    )
+
+
+def _quiet(func, *args, **kwargs):
+    """Call func with stdout captured."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _closed_port_url() -> str:
+    """URL of a local port with nothing listening."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_enqueue_dedup_and_persist():
+    """Test identical operations queue once and survive reopening."""
+    players = [_player(f"Player {i}") for i in range(5)]
+
+    with tempfile.TemporaryDirectory() as root:
+        path = Path(root) / 'outbox.db'
+
+        with Outbox(path) as outbox:
+            assert outbox.enqueue_many(players) == 5
+            assert outbox.enqueue_many(players) == 0
+            assert not outbox.enqueue(players[0])
+
+        with Outbox(path) as outbox:
+            assert outbox.counts()[PENDING] == 5
+            players[0].seasons[0].g = 50
+            assert outbox.enqueue(players[0]), "Changed player should queue again"
+
+    print("OK - test_enqueue_dedup_and_persist passed")
+
+
+def test_drain_when_api_down_then_up():
+    """Test failed drains keep operations queued and retry later."""
+    players = [_player(f"Player {i}") for i in range(4)]
+
+    with tempfile.TemporaryDirectory() as root:
+        with Outbox(Path(root) / 'outbox.db', backoff_base=0) as outbox:
+            outbox.enqueue_many(players)
+
+            with DirectusClient(api_url=_closed_port_url(), token='x', max_retries=0) as down:
+                report = _quiet(drain_outbox, outbox, down, batch_size=10, max_batches=1)
+            assert report.failed == 4 and report.uploaded == 0
+            assert outbox.counts()[PENDING] == 4
+
+            with MockDirectusServer() as server:
+                with DirectusClient(api_url=server.url, token=server.token) as client:
+                    report = _quiet(drain_outbox, outbox, client, batch_size=10)
+
+                assert report.reconciled == 4, report.to_dict()
+                assert outbox.counts()[DONE] == 4
+                assert len(server.items('players')) == 4
+                assert len(server.items('statistics')) == 12
+
+    print("OK - test_drain_when_api_down_then_up passed")
+
+
+def test_crash_replay_exactly_once():
+    """Test operations interrupted mid-flight are not uploaded twice."""
+    players = [_player(f"Player {i}") for i in range(3)]
+
+    with tempfile.TemporaryDirectory() as root:
+        path = Path(root) / 'outbox.db'
+
+        with MockDirectusServer() as server:
+            with DirectusClient(api_url=server.url, token=server.token) as client:
+                with Outbox(path) as outbox:
+                    outbox.enqueue_many(players)
+                    claimed = outbox.claim(3)
+
+                    # Crash after player 0 was fully uploaded and player 1's
+                    # player row was created, before anything was recorded
+                    done_id = _quiet(client.create_player, claimed[0].payload['player'])
+                    client.create_statistics_rows(
+                        [{**s, 'player_id': done_id} for s in claimed[0].payload['statistics']]
+                    )
+                    player_id = _quiet(client.create_player, claimed[1].payload['player'])
+                    assert outbox.counts()[INFLIGHT] == 3
+
+                with Outbox(path) as outbox:
+                    assert outbox.recovered == 3
+                    report = _quiet(drain_outbox, outbox, client)
+                    assert report.reconciled == 3 and report.failed == 0
+
+                    # A second drain has nothing to do
+                    server.state.requests = 0
+                    assert _quiet(drain_outbox, outbox, client).batches == 0
+                    assert server.state.requests == 0
+
+            names = sorted(p['name'] for p in server.items('players'))
+            assert names == ['Player 0', 'Player 1', 'Player 2']
+            stats = server.items('statistics')
+            assert len(stats) == 9
+            assert sum(1 for s in stats if s['player_id'] == player_id) == 3
+
+    print("OK - test_crash_replay_exactly_once passed")
+
+
+def test_lost_batch_response_replayed_once():
+    """Test a batch the server committed but never answered is looked up, not re-created."""
+    players = [_player(f"Player {i}") for i in range(3)]
+
+    with tempfile.TemporaryDirectory() as root:
+        with Outbox(Path(root) / 'outbox.db', backoff_base=0) as outbox:
+            outbox.enqueue_many(players)
+
+            with MockDirectusServer(lost_responses=1) as server:
+                with DirectusClient(api_url=server.url, token=server.token) as client:
+                    report = _quiet(drain_outbox, outbox, client, batch_size=10)
+
+                assert report.failed == 3 and report.reconciled == 3, report.to_dict()
+                assert outbox.counts()[DONE] == 3
+
+                names = sorted(p['name'] for p in server.items('players'))
+                assert names == ['Player 0', 'Player 1', 'Player 2'], names
+                assert len(server.items('statistics')) == 9
+
+    print("OK - test_lost_batch_response_replayed_once passed")
+
+
+def test_changed_player_updates_in_place():
+    """Test changed stats re-send the same operation and replace the player's statistics."""
+    players = [_player(f"Player {i}") for i in range(2)]
+
+    with tempfile.TemporaryDirectory() as root:
+        with MockDirectusServer() as server:
+            with DirectusClient(api_url=server.url, token=server.token) as client:
+                with Outbox(Path(root) / 'outbox.db') as outbox:
+                    outbox.enqueue_many(players)
+                    assert _quiet(drain_outbox, outbox, client).uploaded == 2
+
+                    # Nightly update: current season changed, one season added
+                    players[0].seasons[-1].g = 30
+                    players[0].seasons.append(Season(season="2008-09", team="Test Team", league="NHL",
+                                                     gp=10, g=4, a=1, pts=5, pim=2))
+                    assert outbox.enqueue_many(players) == 1
+                    assert outbox.counts() == {PENDING: 1, INFLIGHT: 0, DONE: 1, DEAD: 0}
+
+                    report = _quiet(drain_outbox, outbox, client)
+                    assert report.reconciled == 1 and report.uploaded == 0, report.to_dict()
+
+                    # Changed again while in flight: sent once more afterwards
+                    players[0].seasons[0].g = 9
+                    assert outbox.enqueue(players[0])
+                    item = outbox.claim()[0]
+                    players[0].seasons[0].g = 10
+                    assert outbox.enqueue(players[0])
+                    outbox.complete(item.key, item.player_id, item.content)
+                    assert outbox.counts()[PENDING] == 1
+                    assert _quiet(drain_outbox, outbox, client).reconciled == 1
+                    assert outbox.pending() == 0
+
+            assert sorted(p['name'] for p in server.items('players')) == ['Player 0', 'Player 1']
+            player_id = next(p['id'] for p in server.items('players') if p['name'] == 'Player 0')
+            goals = {s['season']: s['goals'] for s in server.items('statistics') if s['player_id'] == player_id}
+            assert goals == {'2005-06': 10, '2006-07': 1, '2007-08': 30, '2008-09': 4}, goals
+            assert len(server.items('statistics')) == 7
+
+    print("OK - test_changed_player_updates_in_place passed")
+
+
+def test_upgrade_content_keyed_outbox():
+    """Test an outbox keyed by payload hash is re-keyed by player without duplicates."""
+    with tempfile.TemporaryDirectory() as root:
+        path = Path(root) / 'outbox.db'
+        old, new = _player("Player 0"), _player("Player 0", seasons=4)
+        with sqlite3.connect(path) as conn:
+            conn.executescript(SCHEMA.replace("    content TEXT,\n", ""))
+            for seq, (player, status, player_id) in enumerate([(old, DONE, 7), (new, PENDING, None)]):
+                payload = json.dumps(upload_record(player))
+                conn.execute(
+                    "INSERT INTO outbox (key, name, payload, status, player_id, created, updated)"
+                    " VALUES (?, ?, ?, ?, ?, 0, 0)", (f"old-{seq}", "Player 0", payload, status, player_id)
+                )
+
+        with Outbox(path) as outbox:
+            assert outbox.counts() == {PENDING: 1, INFLIGHT: 0, DONE: 0, DEAD: 0}
+            item = outbox.claim()[0]
+            assert item.player_id == 7 and item.is_replay and len(item.payload['statistics']) == 4
+            assert not outbox.enqueue(new)
+
+    print("OK - test_upgrade_content_keyed_outbox passed")
+
+
+def test_background_worker():
+    """Test worker drains operations enqueued while it runs."""
+    with tempfile.TemporaryDirectory() as root:
+        with Outbox(Path(root) / 'outbox.db') as outbox:
+            with MockDirectusServer() as server:
+                with DirectusClient(api_url=server.url, token=server.token) as client:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        with OutboxWorker(outbox, client, batch_size=5, poll_interval=0.05) as worker:
+                            for i in range(3):
+                                outbox.enqueue_many(_player(f"P{i}-{j}") for j in range(4))
+                                worker.notify()
+                            assert worker.wait_idle(timeout=10)
+
+                assert worker.report.uploaded == 12
+                assert outbox.counts()[DONE] == 12
+                assert len(server.items('players')) == 12
+
+    print("OK - test_background_worker passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== OUTBOX TESTS ===\n")
+
+    tests = [
+        test_enqueue_dedup_and_persist,
+        test_drain_when_api_down_then_up,
+        test_crash_replay_exactly_once,
+        test_lost_batch_response_replayed_once,
+        test_changed_player_updates_in_place,
+        test_upgrade_content_keyed_outbox,
+        test_background_worker
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
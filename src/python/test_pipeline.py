@@ -0,0 +1,164 @@
+"""
+Tests for pipeline module startup behavior and exit codes.
+Run with: python test_pipeline.py
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pipeline
+from archive import PageArchive
+from mock_directus import MockDirectusServer
+from parser import split_player_sections
+
+HERE = Path(__file__).resolve().parent
+
+SAMPLE = HERE.parent.parent / 'archive' / 'data_player.txt'
+
+
+def _run_without_stage_packages(args: list, cwd: str) -> subprocess.CompletedProcess:
+    """Run pipeline.main(args) in a fresh interpreter where selenium and requests cannot be imported."""
+    code = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {str(HERE)!r})
+
+        class Block:
+            def find_spec(self, name, path=None, target=None):
+                if name.split('.')[0] in ('selenium', 'webdriver_manager', 'requests', 'urllib3'):
+                    raise ModuleNotFoundError(f"No module named {{name!r}}")
+                return None
+
+        sys.meta_path.insert(0, Block())
+
+        import pipeline
+        code = pipeline.main({args!r})
+        loaded = [m for m in ('scraper', 'api_client', 'sync', 'outbox') if m in sys.modules]
+        print('LOADED=' + ','.join(loaded))
+        sys.exit(code)
+    """)
+    env = {'PATH': '', 'SYSTEMROOT': ''}
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=cwd, env=env)
+
+
+def test_parse_only_without_stage_packages():
+    """Test parse-only runs work when selenium and requests are missing."""
+    with tempfile.TemporaryDirectory() as root:
+        result = _run_without_stage_packages(['--data-file', str(SAMPLE), '--no-metrics'], root)
+
+    assert result.returncode == 0, result.stderr or result.stdout
+    assert "Players parsed: 8" in result.stdout
+    assert "LOADED=\n" in result.stdout, result.stdout
+
+    print("OK - test_parse_only_without_stage_packages passed")
+
+
+def test_metrics_only_with_metrics_dir():
+    """Test metrics files are written only to an explicit --metrics-dir."""
+    with tempfile.TemporaryDirectory() as root:
+        result = _run_without_stage_packages(['--data-file', str(SAMPLE)], root)
+        assert result.returncode == 0, result.stderr or result.stdout
+        assert os.listdir(root) == [], os.listdir(root)
+
+        metrics_dir = Path(root) / 'metrics'
+        metrics_dir.mkdir()
+        result = _run_without_stage_packages(['--data-file', str(SAMPLE), '--metrics-dir', str(metrics_dir)], root)
+        assert result.returncode == 0, result.stderr or result.stdout
+        assert sorted(os.listdir(metrics_dir)) == ['pipeline_metrics.json', 'pipeline_metrics.prom']
+        assert sorted(os.listdir(root)) == ['metrics']
+
+    print("OK - test_metrics_only_with_metrics_dir passed")
+
+
+def test_dry_run_without_stage_packages():
+    """Test an incremental dry run plans shards without upload packages."""
+    with tempfile.TemporaryDirectory() as root:
+        result = _run_without_stage_packages([
+            '--data-file', str(SAMPLE), '--dry-run', '--no-metrics',
+            '--data-dir', str(Path(root) / 'data'), '--build-state', str(Path(root) / 'state.db')
+        ], root)
+
+        assert result.returncode == 0, result.stderr or result.stdout
+        assert "would rebuild shard:holmstrom (new)" in result.stdout
+        assert not (Path(root) / 'data').exists()
+
+    print("OK - test_dry_run_without_stage_packages passed")
+
+
+def test_export_import_failure():
+    """Test export_data reports a failed import of the exporter instead of raising."""
+    out = io.StringIO()
+    with mock.patch.dict(sys.modules, {'export': None}), contextlib.redirect_stdout(out):
+        assert pipeline.export_data([]) is False
+
+    assert "Export: FAILED" in out.getvalue()
+
+    print("OK - test_export_import_failure passed")
+
+
+def test_staged_upload_failures_fail_run():
+    """Test a staged run whose uploads all fail exits non-zero."""
+    pages = split_player_sections(SAMPLE.read_text(encoding='utf-8'))[:3]
+
+    with tempfile.TemporaryDirectory() as root:
+        with PageArchive(Path(root) / 'pages') as archive:
+            for player_id, text in enumerate(pages, 1):
+                archive.append(player_id, text)
+
+        for error_rate, expected in ((1.0, 1), (0.0, 0)):
+            with MockDirectusServer(error_rate=error_rate, error_status=400) as server:
+                env = {'DIRECTUS_URL': server.url, 'DIRECTUS_TOKEN': server.token}
+                out = io.StringIO()
+                with mock.patch.dict(os.environ, env), contextlib.redirect_stdout(out):
+                    code = pipeline.main(['--archive', str(Path(root) / 'pages'), '--no-metrics'])
+
+            assert code == expected, out.getvalue()
+            if expected:
+                assert "PIPELINE FAILED" in out.getvalue()
+                assert "FAILED - upload:" in out.getvalue()
+
+    print("OK - test_staged_upload_failures_fail_run passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== PIPELINE TESTS ===\n")
+
+    tests = [
+        test_parse_only_without_stage_packages,
+        test_metrics_only_with_metrics_dir,
+        test_dry_run_without_stage_packages,
+        test_export_import_failure,
+        test_staged_upload_failures_fail_run
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
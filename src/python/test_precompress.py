@@ -0,0 +1,146 @@
+"""
+Tests for precompress module.
+Run with: python test_precompress.py
+"""
+import gzip
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import precompress
+from export import export_players
+from models import Player, PlayerData, Season
+from precompress import precompress_tree
+
+
+def _player(name: str, goals: int = 10) -> PlayerData:
+    """PlayerData with one season."""
+    return PlayerData(
+        player=Player(name=name, position="Center", birth_date="Jan 1 1990"),
+        seasons=[Season("2008-09", "Tampa Bay Lightning", "NHL", 79, goals, 23, goals + 23, 39, "-13")]
+    )
+
+
+def _write(root: Path, name: str, data: dict) -> Path:
+    """Write a JSON file under root."""
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2))
+    return path
+
+
+def test_variants_regenerated_only_on_change():
+    """Test variants match their sources and are rebuilt only when a source changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        a = _write(root, 'players/a.json', {'name': 'A', 'seasons': list(range(50))})
+        b = _write(root, 'players/b.json', {'name': 'B'})
+        _write(root, 'manifest.json', {'players': ['a', 'b']})
+
+        first = precompress_tree(root)
+        per_file = len(precompress.encoders())
+        assert len(first.written) == 3 * per_file and first.ok
+        assert gzip.decompress((root / 'players/a.json.gz').read_bytes()) == a.read_bytes()
+        assert first.totals()['players']['.gz'] < first.totals()['players']['size']
+
+        second = precompress_tree(root)
+        assert second.written == [] and second.unchanged == 3 * per_file
+
+        _write(root, 'players/a.json', {'name': 'A2'})
+        third = precompress_tree(root)
+        assert sorted(third.written) == sorted(f'players/a.json{s}' for s in precompress.encoders())
+        assert gzip.decompress((root / 'players/a.json.gz').read_bytes()) == a.read_bytes()
+
+        # Same mtime but new content: only a caller that knows it changed can tell
+        stat = b.stat()
+        b.write_text(json.dumps({'name': 'B2'}))
+        os.utime(b, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert precompress_tree(root).written == []
+        assert precompress_tree(root, changed=[b]).written[0] == 'players/b.json.gz'
+        assert gzip.decompress((root / 'players/b.json.gz').read_bytes()) == b.read_bytes()
+
+        b.unlink()
+        removed = precompress_tree(root).removed
+        assert 'players/b.json.gz' in removed and not (root / 'players/b.json.gz').exists()
+
+    print("OK - test_variants_regenerated_only_on_change passed")
+
+
+def test_stale_brotli_variant_not_served():
+    """Test a .br variant is never left older than its source."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write(root, 'manifest.json', {'players': []})
+        (root / 'manifest.json.br').write_bytes(b'stale')
+
+        report = precompress_tree(root)
+        if precompress.brotli is None:
+            assert report.removed == ['manifest.json.br']
+            assert not (root / 'manifest.json.br').exists()
+        else:
+            assert 'manifest.json.br' in report.written
+            assert (root / 'manifest.json.br').read_bytes() != b'stale'
+
+    print("OK - test_stale_brotli_variant_not_served passed")
+
+
+def test_export_compress():
+    """Test the exporter recompresses only the files it rewrote."""
+    players = [_player(f"Test Player{i}", goals=i) for i in range(4)]
+
+    with tempfile.TemporaryDirectory() as root:
+        first = export_players(players, data_dir=root, workers=1, bundles=2, compress=True)
+        gz = sorted(p.relative_to(root).as_posix() for p in Path(root).rglob('*.gz'))
+        assert gz == [
+            'bundles/bundle-0.json.gz', 'bundles/bundle-1.json.gz', 'manifest.json.gz',
+            'players/player0.json.gz', 'players/player1.json.gz',
+            'players/player2.json.gz', 'players/player3.json.gz'
+        ]
+        assert first.ok and first.compressed.totals()['bundles']['files'] == 2
+
+        players[2] = _player("Test Player2", goals=40)
+        second = export_players(players, data_dir=root, workers=1, bundles=2, compress=True)
+        gz_written = [path for path in second.compressed.written if path.endswith('.gz')]
+        # The manifest records bundle sizes, so it changed too
+        assert gz_written == ['bundles/bundle-1.json.gz', 'manifest.json.gz', 'players/player2.json.gz']
+
+    print("OK - test_export_compress passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== PRECOMPRESS TESTS ===\n")
+
+    tests = [
+        test_variants_regenerated_only_on_change,
+        test_stale_brotli_variant_not_served,
+        test_export_compress
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
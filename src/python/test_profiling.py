@@ -0,0 +1,157 @@
+"""
+Tests for profiling module.
+Run with: python test_profiling.py
+"""
+import json
+import sys
+import tempfile
+import threading
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from profiling import PER_THREAD_PROFILES, StageProfiler
+
+
+def _build_rows(count: int) -> list:
+    """Allocate count small dictionaries."""
+    return [{'season': str(i), 'gp': i} for i in range(count)]
+
+
+def _busy(count: int) -> int:
+    """Burn some CPU."""
+    return sum(i * i for i in range(count))
+
+
+def test_disabled_is_noop():
+    """Test a disabled profiler returns shared no-ops and traces nothing."""
+    profiler = StageProfiler(enabled=False)
+
+    assert profiler.stage('parse') is profiler.stage('upload')
+    assert profiler.wrap('parse', _busy) is _busy
+
+    with profiler.stage('parse'):
+        assert not tracemalloc.is_tracing()
+        _build_rows(100)
+
+    assert profiler.stages == {} and profiler.write_report() is None
+
+    print("OK - test_disabled_is_noop passed")
+
+
+def test_stage_cpu_and_memory():
+    """Test stages record hotspots, allocation sites, peak memory and files."""
+    with tempfile.TemporaryDirectory() as root:
+        profiler = StageProfiler(output_dir=root, top_n=5)
+
+        with profiler.stage('parse'):
+            rows = _build_rows(50000)
+        with profiler.stage('upload'):
+            _busy(200000)
+        del rows
+
+        assert not tracemalloc.is_tracing(), "tracing left on after last stage"
+        report_path = profiler.write_report()
+
+        parse = profiler.stages['parse']
+        upload = profiler.stages['upload']
+        assert parse.peak_memory > 2_000_000, parse.peak_memory
+        assert upload.peak_memory < parse.peak_memory / 10
+        assert 'test_profiling.py' in parse.allocations[0]['site']
+        assert any('_busy' in row['function'] or 'genexpr' in row['function'] for row in upload.hotspots)
+
+        for name in ('parse', 'upload'):
+            assert (Path(root) / f'{name}.prof').exists()
+            assert (Path(root) / f'{name}_hotspots.txt').read_text()
+        report = json.loads(Path(report_path).read_text())
+        assert report['parse']['calls'] == 1 and report['upload']['cpu'] > 0
+
+    print("OK - test_stage_cpu_and_memory passed")
+
+
+def test_wrap_merges_threads():
+    """Test wrapped calls from several threads merge into one stage."""
+    with tempfile.TemporaryDirectory() as root:
+        profiler = StageProfiler(output_dir=root)
+        busy = profiler.wrap('parse', _busy)
+
+        threads = [threading.Thread(target=lambda: [busy(1000) for _ in range(5)]) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        profiler.write_report()
+
+    parse = profiler.stages['parse']
+    assert parse.calls == 15
+    if PER_THREAD_PROFILES:
+        assert any(row['calls'] == 15 and '_busy' in row['function'] for row in parse.hotspots)
+
+    print("OK - test_wrap_merges_threads passed")
+
+
+def test_wrap_inside_stage():
+    """Test wrapped worker threads inside a stage are profiled on this interpreter."""
+    with tempfile.TemporaryDirectory() as root:
+        profiler = StageProfiler(output_dir=root)
+        busy = profiler.wrap('parse', _busy)
+        results = []
+
+        with profiler.stage('staged'):
+            threads = [
+                threading.Thread(target=lambda: results.extend(busy(20000) for _ in range(5)))
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        profiler.write_report()
+
+    # Every call ran and was counted (none failed to start a profiler)
+    assert results == [_busy(20000)] * 15
+    assert profiler.stages['parse'].calls == 15
+    # CPU is per thread before 3.12, in the enclosing stage from 3.12
+    owner = profiler.stages['parse' if PER_THREAD_PROFILES else 'staged']
+    assert any(row['calls'] == 15 and '_busy' in row['function'] for row in owner.hotspots), owner.hotspots
+
+    print("OK - test_wrap_inside_stage passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== PROFILING TESTS ===\n")
+
+    tests = [
+        test_disabled_is_noop,
+        test_stage_cpu_and_memory,
+        test_wrap_merges_threads,
+        test_wrap_inside_stage
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
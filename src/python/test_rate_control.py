@@ -0,0 +1,193 @@
+"""
+Tests for rate_control module.
+Run with: python test_rate_control.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rate_control import AdaptiveRateController, parse_retry_after, percentile
+
+
+class FakeClock:
+    """Manually advanced clock; sleep advances time."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def _controller(clock: FakeClock, **kwargs) -> AdaptiveRateController:
+    return AdaptiveRateController(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+    assert percentile([3.0], 99) == 3.0
+
+    print("OK - test_percentile passed")
+
+
+def test_additive_increase():
+    """Test rate rises while healthy and stops at max_rate."""
+    clock = FakeClock()
+    rate = _controller(clock, initial_rate=1.0, max_rate=2.0, increase_step=0.25)
+
+    for _ in range(3):
+        rate.acquire()
+        rate.record(0.1, status=200)
+
+    assert rate.rate == 1.75, f"Rate was {rate.rate}"
+
+    for _ in range(10):
+        rate.acquire()
+        rate.record(0.1, status=200)
+
+    assert rate.rate == 2.0
+
+    print("OK - test_additive_increase passed")
+
+
+def test_multiplicative_decrease():
+    """Test 429/5xx/timeouts halve the rate once per episode."""
+    clock = FakeClock()
+    rate = _controller(clock, initial_rate=8.0, min_rate=1.0)
+
+    rate.record(0.1, status=503)
+    assert rate.rate == 4.0
+
+    # Same episode: second error right away does not cut again
+    rate.record(0.1, status=503)
+    assert rate.rate == 4.0
+
+    clock.sleep(1.0)
+    rate.record_timeout(10.0)
+    assert rate.rate == 2.0
+    assert rate.backoffs == 2
+
+    print("OK - test_multiplicative_decrease passed")
+
+
+def test_latency_backoff():
+    """Test slow responses back off even without errors."""
+    clock = FakeClock()
+    rate = _controller(clock, initial_rate=4.0, latency_threshold=1.0)
+
+    rate.record(3.0, status=200)
+    assert rate.rate == 2.0
+
+    print("OK - test_latency_backoff passed")
+
+
+def test_recovers_after_slow_burst():
+    """Test a slow burst cuts the rate once per decision window and fast responses restore it."""
+    clock = FakeClock()
+    rate = _controller(clock, initial_rate=4.0, min_rate=0.1, latency_threshold=1.0, decision_window=20)
+
+    for _ in range(60):
+        rate.acquire()
+        rate.record(3.0, status=200)
+    assert rate.backoffs == 3 and rate.rate == 0.5, f"Rate was {rate.rate}"
+
+    # p95 of the decision window is fast again after a window of fast responses
+    for _ in range(20):
+        rate.acquire()
+        rate.record(0.1, status=200)
+    assert rate.rate > 0.5, f"Rate was {rate.rate}"
+
+    for _ in range(40):
+        rate.acquire()
+        rate.record(0.1, status=200)
+    assert rate.rate >= 4.0 and rate.backoffs == 3
+
+    print("OK - test_recovers_after_slow_burst passed")
+
+
+def test_retry_after():
+    """Test Retry-After blocks acquire until the server allows it."""
+    clock = FakeClock()
+    rate = _controller(clock, initial_rate=10.0)
+
+    rate.acquire()
+    rate.record(0.1, status=429, retry_after=30.0)
+
+    waited = rate.acquire()
+    assert waited >= 30.0, f"Waited {waited}"
+    assert rate.metrics()['blocked_for'] == 0.0
+
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+    print("OK - test_retry_after passed")
+
+
+def test_metrics():
+    """Test metrics expose rate and rolling latency percentiles."""
+    clock = FakeClock()
+    rate = _controller(clock, initial_rate=1.0, window=10)
+
+    for latency in [0.1, 0.2, 0.3, 0.4, 0.5]:
+        rate.acquire()
+        rate.record(latency, status=200)
+
+    metrics = rate.metrics()
+    assert metrics['latency_p50'] == 0.3
+    assert metrics['latency_p99'] == 0.5
+    assert metrics['error_rate'] == 0.0
+    assert metrics['requests'] == 5
+    assert metrics['rate'] == 1.5
+
+    print("OK - test_metrics passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== RATE CONTROL TESTS ===\n")
+
+    tests = [
+        test_percentile,
+        test_additive_increase,
+        test_multiplicative_decrease,
+        test_latency_backoff,
+        test_recovers_after_slow_burst,
+        test_retry_after,
+        test_metrics
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
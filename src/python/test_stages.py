@@ -0,0 +1,135 @@
+"""
+Tests for stages module.
+Run with: python test_stages.py
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from stages import Stage, StagedPipeline
+
+
+def test_all_items_flow_through():
+    """Test every item passes each stage and None outputs are dropped."""
+    pipeline = StagedPipeline([
+        Stage('double', lambda x: x * 2, workers=3),
+        Stage('odd_only', lambda x: x if x % 4 else None, workers=2),
+        Stage('collect', lambda batch: batch, batch_size=7)
+    ], collect=True)
+
+    report = pipeline.run(range(100))
+
+    assert sorted(report.results) == [x * 2 for x in range(100) if (x * 2) % 4]
+    double, odd_only, collect = report.stages
+    assert double.items_in == double.items_out == 100
+    assert odd_only.items_out == 50
+    assert collect.items_in == collect.items_out == 50
+
+    print("OK - test_all_items_flow_through passed")
+
+
+def test_backpressure_bounds_queues():
+    """Test a slow stage blocks its producer instead of buffering the run."""
+    produced = []
+    lock = threading.Lock()
+
+    def fast(x):
+        with lock:
+            produced.append(x)
+        return x
+
+    pipeline = StagedPipeline([
+        Stage('fast', fast, workers=2, queue_size=4),
+        Stage('slow', lambda x: time.sleep(0.005) or x, workers=1, queue_size=4)
+    ])
+
+    def source():
+        for i in range(60):
+            # Producer can run at most a few queue lengths ahead of the slow stage
+            assert len(produced) <= i, "source consumed eagerly"
+            yield i
+
+    report = pipeline.run(source())
+
+    fast, slow = report.stages
+    assert slow.items_out == 60
+    assert fast.max_queue_depth <= 4 and slow.max_queue_depth <= 4
+    assert fast.blocked > 0, "fast stage never waited on the slow one"
+    assert report.bottleneck == 'slow'
+    assert slow.utilization(report.elapsed) > fast.utilization(report.elapsed)
+
+    print("OK - test_backpressure_bounds_queues passed")
+
+
+def test_errors_counted_per_stage():
+    """Test a failing item is counted and does not stop the run."""
+    def parse(x):
+        if x == 3:
+            raise ValueError("bad page")
+        return x
+
+    report = StagedPipeline([Stage('parse', parse, workers=2)], collect=True).run(range(10))
+
+    assert sorted(report.results) == [x for x in range(10) if x != 3]
+    assert report.stages[0].errors == 1
+    assert report.stages[0].error_messages == ["ValueError: bad page"]
+    assert report.to_dict()['stages']['parse']['errors'] == 1
+
+    print("OK - test_errors_counted_per_stage passed")
+
+
+def test_failed_outputs_counted():
+    """Test outputs the stage marks as failed count as errors and still pass on."""
+    def upload(batch):
+        return [{'id': x, 'ok': x % 4 != 0} for x in batch]
+
+    report = StagedPipeline([
+        Stage('upload', upload, batch_size=5,
+              failure=lambda result: None if result['ok'] else f"item {result['id']}: rejected")
+    ], collect=True).run(range(10))
+
+    upload_stats = report.stages[0]
+    assert len(report.results) == 10
+    assert upload_stats.errors == 3
+    assert sorted(upload_stats.error_messages) == ["item 0: rejected", "item 4: rejected", "item 8: rejected"]
+
+    print("OK - test_failed_outputs_counted passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== STAGES TESTS ===\n")
+
+    tests = [
+        test_all_items_flow_through,
+        test_backpressure_bounds_queues,
+        test_errors_counted_per_stage,
+        test_failed_outputs_counted
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,168 @@
+"""
+Tests for timing module.
+Run with: python test_timing.py
+"""
+import json
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from timing import ScrapeTimer
+
+
+def _span(timer: ScrapeTimer, url: str, phase: str, seconds: float):
+    """Record one span of exactly seconds."""
+    with mock.patch('timing.time.perf_counter', side_effect=[10.0, 10.0 + seconds]):
+        with timer.span(url, phase):
+            pass
+
+
+def _page(timer: ScrapeTimer, url: str, navigate: float, extract: float, ok: bool = True):
+    """Record one page fetch with two phases."""
+    _span(timer, url, 'navigate', navigate)
+    _span(timer, url, 'extract', extract)
+    if ok:
+        timer.record_fetch(url, ok=True, chars=100)
+    else:
+        timer.record_fetch(url, ok=False, error='timeout')
+
+
+def test_phase_timings():
+    """Test per-phase counts, totals, percentiles and max."""
+    timer = ScrapeTimer()
+    for i in range(1, 101):
+        _page(timer, f'u{i}', navigate=i / 100, extract=0.5)
+
+    phases = timer.report()['phases']
+    assert set(phases) == {'navigate', 'extract'}
+
+    navigate = phases['navigate']
+    assert navigate['count'] == 100
+    assert navigate['total'] == 50.5
+    assert navigate['p50'] == 0.5
+    assert navigate['p95'] == 0.95
+    assert navigate['p99'] == 0.99
+    assert navigate['max'] == 1.0
+    assert phases['extract']['total'] == 50.0
+
+    print("OK - test_phase_timings passed")
+
+
+def test_span_records_on_error():
+    """Test a span that raises is still timed."""
+    timer = ScrapeTimer()
+    try:
+        with mock.patch('timing.time.perf_counter', side_effect=[0.0, 2.0]):
+            with timer.span('u', 'wait_body'):
+                raise TimeoutError('slow')
+    except TimeoutError:
+        pass
+    timer.record_fetch('u', ok=False, error='slow')
+
+    report = timer.report()
+    assert report['phases']['wait_body']['count'] == 1
+    assert report['slowest_urls'] == [{'url': 'u', 'total': 2.0, 'phases': {'wait_body': 2.0}}]
+
+    print("OK - test_span_records_on_error passed")
+
+
+def test_report():
+    """Test page counts, slowest URLs and failures in the report."""
+    timer = ScrapeTimer()
+    _page(timer, 'fast', navigate=0.1, extract=0.1)
+    _page(timer, 'slow', navigate=3.0, extract=0.5)
+    _page(timer, 'medium', navigate=1.0, extract=0.5, ok=False)
+
+    report = timer.report(slowest=2)
+    assert report['pages'] == 3
+    assert report['pages_ok'] == 2
+    assert report['characters'] == 200
+    assert report['failed'] == 1
+    assert report['failures'] == [{'url': 'medium', 'error': 'timeout'}]
+    assert report['slowest_urls'] == [
+        {'url': 'slow', 'total': 3.5, 'phases': {'navigate': 3.0, 'extract': 0.5}},
+        {'url': 'medium', 'total': 1.5, 'phases': {'navigate': 1.0, 'extract': 0.5}}
+    ]
+
+    print("OK - test_report passed")
+
+
+def test_memory_bounded():
+    """Test a long crawl keeps bounded samples, slowest pages and failures."""
+    timer = ScrapeTimer(samples=50, slowest=3, failures=5)
+    for i in range(1000):
+        _page(timer, f'u{i}', navigate=i / 1000, extract=0.0, ok=i % 2 == 0)
+
+    assert len(timer.phases['navigate'].recent) == 50
+    assert len(timer._slowest) == 3
+    assert len(timer.failures) == 5
+    assert not timer._open
+
+    report = timer.report()
+    assert report['pages'] == 1000
+    assert report['failed'] == 500
+    assert report['phases']['navigate']['count'] == 1000
+    assert report['phases']['navigate']['max'] == 0.999
+    assert [page['url'] for page in report['slowest_urls']] == ['u999', 'u998', 'u997']
+    assert report['failures'][-1]['url'] == 'u999'
+
+    print("OK - test_memory_bounded passed")
+
+
+def test_write_report():
+    """Test the JSON report includes extra fields."""
+    timer = ScrapeTimer()
+    _page(timer, 'u', navigate=0.2, extract=0.1)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'scrape_report.json'
+        assert timer.write_report(str(path), extra={'rate': {'current': 1.0}})
+
+        report = json.loads(path.read_text(encoding='utf-8'))
+        assert report['pages'] == 1
+        assert report['rate'] == {'current': 1.0}
+        assert report['phases']['navigate']['count'] == 1
+
+        assert not timer.write_report(str(Path(temp_dir) / 'missing' / 'report.json'))
+
+    print("OK - test_write_report passed")
+
+
+def main():
+    """Run all tests."""
+    print("=== TIMING TESTS ===\n")
+
+    tests = [
+        test_phase_timings,
+        test_span_records_on_error,
+        test_report,
+        test_memory_bounded,
+        test_write_report
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"FAILED - {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"ERROR - {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\n=== RESULTS ===")
+    print(f"Passed: {passed}/{len(tests)}")
+    print(f"Failed: {failed}/{len(tests)}")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
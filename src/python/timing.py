@@ -0,0 +1,184 @@
+"""
+Per-phase timing spans for scraping runs.
+Records how long each phase of each page fetch takes and aggregates
+them into per-run latency histograms and slowest-URL lists.
+
+Memory stays bounded for crawls of any length: each phase keeps running
+totals plus its most recent durations (percentiles are over those), and
+only the slowest pages and the latest failures are kept.
+"""
+import heapq
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from rate_control import percentile
+
+
+class PhaseStats:
+    """Running totals and recent durations of one phase."""
+
+    def __init__(self, samples: int):
+        """
+        Args:
+            samples: Recent durations kept for percentiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=samples)
+
+    def add(self, duration: float):
+        """Count one duration."""
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.recent.append(duration)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        recent = list(self.recent)
+        return {
+            'count': self.count,
+            'total': round(self.total, 4),
+            'p50': round(percentile(recent, 50), 4),
+            'p95': round(percentile(recent, 95), 4),
+            'p99': round(percentile(recent, 99), 4),
+            'max': round(self.max, 4)
+        }
+
+
+class ScrapeTimer:
+    """Thread-safe collector of (url, phase, duration) timing spans."""
+
+    def __init__(self, samples: int = 10000, slowest: int = 10, failures: int = 100):
+        """
+        Initialize empty timer.
+
+        Args:
+            samples: Recent durations per phase kept for percentiles
+            slowest: Slowest pages kept
+            failures: Most recent failures kept (all are counted)
+        """
+        self.samples = samples
+        self.keep_slowest = slowest
+        self.phases: Dict[str, PhaseStats] = {}
+        self.pages = 0
+        self.pages_ok = 0
+        self.characters = 0
+        self.failed = 0
+        self.failures: Deque[Dict[str, Any]] = deque(maxlen=failures)
+        self.started_at = time.time()
+
+        # Phases of pages still being fetched, and a min-heap of the
+        # slowest finished pages: (total, sequence, url, phases)
+        self._open: Dict[str, Dict[str, float]] = {}
+        self._slowest: List[Tuple[float, int, str, Dict[str, float]]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, url: str, phase: str):
+        """
+        Time a block as one phase of fetching url.
+
+        Args:
+            url: Page URL
+            phase: Phase name (e.g. 'navigate', 'wait_body')
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                stats = self.phases.get(phase)
+                if stats is None:
+                    stats = self.phases[phase] = PhaseStats(self.samples)
+                stats.add(duration)
+                phases = self._open.setdefault(url, {})
+                phases[phase] = phases.get(phase, 0.0) + duration
+
+    def record_fetch(self, url: str, ok: bool, chars: int = 0, error: Optional[str] = None):
+        """
+        Record the outcome of one page fetch (ends its spans).
+
+        Args:
+            url: Page URL
+            ok: True if text was extracted
+            chars: Characters of text extracted
+            error: Error message on failure
+        """
+        with self._lock:
+            self.pages += 1
+            if ok:
+                self.pages_ok += 1
+                self.characters += chars
+            else:
+                self.failed += 1
+                self.failures.append({'url': url, 'error': error})
+
+            phases = self._open.pop(url, {})
+            page = (sum(phases.values()), self.pages, url, phases)
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, page)
+            elif self._slowest and page[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, page)
+
+    def report(self, slowest: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate spans into a per-run report.
+
+        Args:
+            slowest: Number of slowest URLs to list (at most the number kept)
+
+        Returns:
+            Dictionary with per-phase histograms, slowest URLs and failures
+        """
+        with self._lock:
+            phases = {phase: stats.to_dict() for phase, stats in self.phases.items()}
+            pages = sorted(self._slowest, reverse=True)[:slowest]
+            report = {
+                'started_at': self.started_at,
+                'duration': round(time.time() - self.started_at, 4),
+                'pages': self.pages,
+                'pages_ok': self.pages_ok,
+                'characters': self.characters,
+                'phases': phases,
+                'slowest_urls': [
+                    {
+                        'url': url,
+                        'total': round(total, 4),
+                        'phases': {phase: round(d, 4) for phase, d in page_phases.items()}
+                    }
+                    for total, _, url, page_phases in pages
+                ],
+                'failed': self.failed,
+                'failures': list(self.failures)
+            }
+        return report
+
+    def write_report(self, file_path: str, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Write report as JSON.
+
+        Args:
+            file_path: Output file path
+            extra: Additional top-level fields (e.g. rate metrics)
+
+        Returns:
+            True on success, False on failure
+        """
+        report = self.report()
+        if extra:
+            report.update(extra)
+
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            return True
+        except OSError as e:
+            print(f"FAILED - Error writing report {file_path}: {e}")
+            return False
@@ -5,26 +5,43 @@ Verifies all modules work correctly.
 """
 import sys
 import os
+import importlib
+import importlib.util
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Packages each optional stage needs (parsing needs none)
+STAGE_PACKAGES = {
+    'scrape': [('selenium', 'selenium'), ('webdriver_manager', 'webdriver-manager')],
+    'upload': [('requests', 'requests')]
+}
+
+# Modules that import each stage's packages
+STAGE_MODULES = {
+    'scrape': [('scraper', 'HockeyDBScraper')],
+    'upload': [('api_client', 'DirectusClient')]
+}
+
+
+def _stage_available(stage: str) -> bool:
+    """True if every package a stage needs is installed (without importing it)."""
+    return all(importlib.util.find_spec(name) is not None for name, _ in STAGE_PACKAGES[stage])
+
 
 def check_imports() -> bool:
-    """Verify all modules can be imported."""
+    """Verify modules import, and that parse-only imports stay lightweight."""
     print("\n=== CHECKING IMPORTS ===")
 
-    modules = [
+    core = [
         ('models', 'Player, Season, GoalieStats, PlayerData'),
         ('parser', 'parse_player_data, load_data_file'),
-        ('scraper', 'HockeyDBScraper'),
-        ('api_client', 'DirectusClient'),
         ('pipeline', 'main')
     ]
 
     failed = []
 
-    for module, items in modules:
+    for module, items in core:
         try:
             exec(f"from {module} import {items}")
             print(f"  {module}: OK")
@@ -32,6 +49,26 @@ def check_imports() -> bool:
             print(f"  {module}: FAILED - {e}")
             failed.append(module)
 
+    # Stage packages must not load until their stage runs
+    eager = [name for names in STAGE_PACKAGES.values() for name, _ in names if name in sys.modules]
+    if eager:
+        print(f"  lazy imports: FAILED - pipeline loaded {', '.join(eager)}")
+        failed.append('pipeline (lazy imports)')
+    else:
+        print("  lazy imports: OK")
+
+    for stage, modules in STAGE_MODULES.items():
+        for module, items in modules:
+            if not _stage_available(stage):
+                print(f"  {module}: SKIPPED - {stage} packages not installed")
+                continue
+            try:
+                exec(f"from {module} import {items}")
+                print(f"  {module}: OK")
+            except ImportError as e:
+                print(f"  {module}: FAILED - {e}")
+                failed.append(module)
+
     if failed:
         print(f"\nFAILED imports: {', '.join(failed)}")
         return False
@@ -186,31 +223,31 @@ def check_models() -> bool:
 
 
 def check_requirements() -> bool:
-    """Check if required packages are installed."""
-    print("\n=== CHECKING REQUIREMENTS ===")
+    """
+    Check which optional packages are installed.
 
-    packages = [
-        ('selenium', 'selenium'),
-        ('requests', 'requests'),
-        ('webdriver_manager', 'webdriver-manager')
-    ]
+    Packages are located without importing them. Parsing needs none, so
+    missing packages only disable their stage.
+    """
+    print("\n=== CHECKING REQUIREMENTS ===")
 
     missing = []
 
-    for import_name, package_name in packages:
-        try:
-            __import__(import_name)
-            print(f"  {package_name}: OK")
-        except ImportError:
-            print(f"  {package_name}: MISSING")
-            missing.append(package_name)
+    for stage, packages in STAGE_PACKAGES.items():
+        for import_name, package_name in packages:
+            if importlib.util.find_spec(import_name) is not None:
+                print(f"  {package_name}: OK ({stage})")
+            else:
+                print(f"  {package_name}: MISSING ({stage} stage disabled)")
+                missing.append(package_name)
 
     if missing:
         print(f"\nMissing packages: {', '.join(missing)}")
         print("Install with: pip install -r requirements.txt")
-        return False
+        print("Parse-only runs work without them")
+    else:
+        print("\nRequirements: OK - All packages installed")
 
-    print("\nRequirements: OK - All packages installed")
     return True
 
 
@@ -1,10 +1,21 @@
 // PlayerService - Lazy loading player data
 // Loads player JSON only when needed, caches in memory
+// When the manifest lists bundles, one fetch fills the cache with every player in a bundle
+// Files with a content hash in the manifest are kept in a persistent Cache API store keyed
+// by hash; only the manifest is revalidated with the server
+
+import { PrefixIndex, FuzzyIndex } from '../utils/NameIndex.js';
+
+const DATA_CACHE_NAME = 'hockey-player-data';
 
 class PlayerService {
     constructor() {
         this.manifest = null;
+        this.manifestLoad = null; // in-flight manifest request
         this.cache = new Map();
+        this.bundleLoads = new Map(); // bundle index -> Promise (one fetch per bundle)
+        this.storeOpen = null; // Promise of the Cache API store (null result if unavailable)
+        this.indexLoads = new Map(); // manifest key ('autocomplete', 'fuzzy') -> Promise of the index
         // Detect base path from current script location for GitHub Pages compatibility
         this.basePath = this._detectBasePath();
         this.manifestPath = `${this.basePath}src/data/manifest.json`;
@@ -30,18 +41,29 @@ class PlayerService {
         if (this.manifest) {
             return this.manifest;
         }
+        // Concurrent callers share the in-flight request
+        if (this.manifestLoad) {
+            return this.manifestLoad;
+        }
 
-        try {
-            const response = await fetch(this.manifestPath);
-            if (!response.ok) {
-                throw new Error(`Failed to load manifest: ${response.status} ${response.statusText}`);
+        this.manifestLoad = (async () => {
+            try {
+                // Always revalidate: the manifest is what points at new file hashes
+                const response = await fetch(this.manifestPath, { cache: 'no-cache' });
+                if (!response.ok) {
+                    throw new Error(`Failed to load manifest: ${response.status} ${response.statusText}`);
+                }
+                this.manifest = await response.json();
+                this._pruneStore();
+                return this.manifest;
+            } catch (error) {
+                console.error('Error loading manifest:', error);
+                throw new Error('Failed to load player manifest. Please refresh the page.');
+            } finally {
+                this.manifestLoad = null;
             }
-            this.manifest = await response.json();
-            return this.manifest;
-        } catch (error) {
-            console.error('Error loading manifest:', error);
-            throw new Error('Failed to load player manifest. Please refresh the page.');
-        }
+        })();
+        return this.manifestLoad;
     }
 
     /**
@@ -64,13 +86,20 @@ class PlayerService {
             throw new Error(`Player not found: ${playerId}`);
         }
 
-        try {
-            const response = await fetch(`${this.basePath}src/data/${playerEntry.file}`);
-            if (!response.ok) {
-                throw new Error(`Failed to load player ${playerId}: ${response.status} ${response.statusText}`);
+        // Bundled players: fetch the whole bundle once, fall back to the single file
+        if (Number.isInteger(playerEntry.bundle) && this.manifest.bundles) {
+            try {
+                await this.loadBundle(playerEntry.bundle);
+                if (this.cache.has(playerId)) {
+                    return this.cache.get(playerId);
+                }
+            } catch (error) {
+                console.warn(`Bundle ${playerEntry.bundle} unavailable, loading ${playerId} alone:`, error);
             }
+        }
 
-            const playerData = await response.json();
+        try {
+            const playerData = await this._fetchData(playerEntry.file, playerEntry.hash, `player ${playerId}`);
 
             // Cache the player data
             this.cache.set(playerId, playerData);
@@ -82,6 +111,124 @@ class PlayerService {
         }
     }
 
+    /**
+     * Load a bundle and cache every player in it
+     * Concurrent calls for the same bundle share one fetch
+     * @param {number} bundleIndex - Index into manifest.bundles
+     * @returns {Promise<void>}
+     */
+    async loadBundle(bundleIndex) {
+        if (this.bundleLoads.has(bundleIndex)) {
+            return this.bundleLoads.get(bundleIndex);
+        }
+
+        const load = (async () => {
+            await this.loadManifest();
+
+            const bundle = (this.manifest.bundles || [])[bundleIndex];
+            if (!bundle) {
+                throw new Error(`Bundle not found: ${bundleIndex}`);
+            }
+
+            const players = await this._fetchData(bundle.file, bundle.hash, `bundle ${bundleIndex}`);
+            for (const entry of this.manifest.players) {
+                if (entry.bundle === bundleIndex && players[entry.offset] && !this.cache.has(entry.id)) {
+                    this.cache.set(entry.id, players[entry.offset]);
+                }
+            }
+        })();
+
+        this.bundleLoads.set(bundleIndex, load);
+        try {
+            await load;
+        } catch (error) {
+            // Allow a retry on the next call
+            this.bundleLoads.delete(bundleIndex);
+            throw error;
+        }
+    }
+
+    /**
+     * Fetch a data file as JSON, going through the persistent store when its hash is known
+     * A hash names exactly one content, so stored responses never need revalidation
+     * @param {string} file - Path relative to src/data
+     * @param {string} [hash] - SHA-256 of the file from the manifest
+     * @param {string} label - Name used in error messages
+     * @returns {Promise<Object>} Parsed JSON
+     */
+    async _fetchData(file, hash, label) {
+        const store = hash ? await this._openStore() : null;
+        const key = hash ? this._storeKey(hash) : null;
+
+        if (store) {
+            const stored = await store.match(key).catch(() => undefined);
+            if (stored) {
+                return stored.json();
+            }
+        }
+
+        const response = await fetch(`${this.basePath}src/data/${file}`);
+        if (!response.ok) {
+            throw new Error(`Failed to load ${label}: ${response.status} ${response.statusText}`);
+        }
+
+        if (store) {
+            // Quota or private-mode errors only cost the persistent copy
+            await store.put(key, response.clone()).catch(() => {});
+        }
+        return response.json();
+    }
+
+    _storeKey(hash) {
+        return `${this.basePath}src/data/sha256/${hash}`;
+    }
+
+    /**
+     * Open the Cache API store once
+     * @returns {Promise<Cache|null>} Store, or null where the Cache API is unavailable
+     */
+    _openStore() {
+        if (!this.storeOpen) {
+            this.storeOpen = typeof caches === 'undefined'
+                ? Promise.resolve(null)
+                : caches.open(DATA_CACHE_NAME).catch(() => null);
+        }
+        return this.storeOpen;
+    }
+
+    /**
+     * Drop stored files the current manifest no longer references (runs in the background)
+     */
+    async _pruneStore() {
+        const entries = [...(this.manifest.players || []), ...(this.manifest.bundles || [])];
+        for (const key of ['autocomplete', 'fuzzy']) {
+            if (this.manifest[key]) {
+                entries.push(this.manifest[key]);
+            }
+        }
+        const hashes = entries
+            .map(entry => entry.hash)
+            .filter(Boolean);
+        if (hashes.length === 0) {
+            return;
+        }
+
+        try {
+            const store = await this._openStore();
+            if (!store) {
+                return;
+            }
+            const current = new Set(hashes.map(hash => this._storeKey(hash)));
+            for (const request of await store.keys()) {
+                if (!current.has(request.url)) {
+                    await store.delete(request);
+                }
+            }
+        } catch (error) {
+            console.warn('Could not prune stored player data:', error);
+        }
+    }
+
     /**
      * Get a random player from the manifest
      * @returns {Promise<Object>} Random player data
@@ -131,6 +278,45 @@ class PlayerService {
         await Promise.all(loadPromises);
     }
 
+    /**
+     * Load the autocomplete name index once
+     * @returns {Promise<PrefixIndex|null>} Index, or null if the manifest lists none
+     */
+    loadNameIndex() {
+        return this._loadIndex('autocomplete', data => new PrefixIndex(data));
+    }
+
+    /**
+     * Load the typo-tolerant name index once
+     * @returns {Promise<FuzzyIndex|null>} Index, or null if the manifest lists none
+     */
+    loadFuzzyIndex() {
+        return this._loadIndex('fuzzy', data => new FuzzyIndex(data));
+    }
+
+    /**
+     * Fetch the index file a manifest key points at; concurrent calls share one fetch
+     * @param {string} key - Manifest key of the index entry
+     * @param {Function} create - Builds the index from the parsed file
+     * @returns {Promise<Object|null>} Index, or null if the manifest lists none
+     */
+    _loadIndex(key, create) {
+        if (!this.indexLoads.has(key)) {
+            const load = (async () => {
+                await this.loadManifest();
+                const entry = this.manifest[key];
+                if (!entry) {
+                    return null;
+                }
+                return create(await this._fetchData(entry.file, entry.hash, `${key} index`));
+            })();
+            this.indexLoads.set(key, load);
+            // Allow a retry on the next call
+            load.catch(() => this.indexLoads.delete(key));
+        }
+        return this.indexLoads.get(key);
+    }
+
     /**
      * Get all player names and IDs from manifest
      * @returns {Promise<Array>} Array of {id, name}
@@ -143,11 +329,27 @@ class PlayerService {
         }));
     }
 
+    /**
+     * ID of a loaded player (player files do not store their own ID)
+     * @param {Object} player - Player data returned by loadPlayer
+     * @returns {string|null} Player ID, or null if the player is not in the cache
+     */
+    getPlayerId(player) {
+        for (const [id, data] of this.cache) {
+            if (data === player) {
+                return id;
+            }
+        }
+        return null;
+    }
+
     /**
      * Clear cache (useful for testing or memory management)
      */
     clearCache() {
         this.cache.clear();
+        this.bundleLoads.clear();
+        this.indexLoads.clear();
     }
 
     /**
@@ -157,7 +359,8 @@ class PlayerService {
     getCacheStats() {
         return {
             size: this.cache.size,
-            players: Array.from(this.cache.keys())
+            players: Array.from(this.cache.keys()),
+            bundles: this.bundleLoads.size
         };
     }
 }
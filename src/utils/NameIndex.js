@@ -0,0 +1,290 @@
+// NameIndex - Player-name lookup over the exported autocomplete.json and fuzzy.json
+// Keys are folded names (no accents, apostrophes or case) from each word on, sorted;
+// players are stored most popular first, so a prefix is a binary search plus a small sort
+// FuzzyIndex finds names within a few typos: trigram counts narrow 100k names to a handful,
+// which are checked with a bounded edit distance
+// Built by src/python/name_index.py and fuzzy.py - foldName, maxTypos and editDistance must
+// stay in step with fold_name, max_typos and edit_distance there
+
+// Letters NFKD does not decompose into an ASCII base letter
+const SPECIAL_LETTERS = {
+    'ø': 'o', 'æ': 'ae', 'œ': 'oe', 'ß': 'ss', 'đ': 'd',
+    'ð': 'd', 'ł': 'l', 'þ': 'th', 'ı': 'i'
+};
+const SPECIAL_PATTERN = new RegExp(`[${Object.keys(SPECIAL_LETTERS).join('')}]`, 'g');
+const DEFAULT_LIMIT = 10;
+
+// Edits allowed by folded length: shorter names must match more closely
+const TYPO_LENGTHS = [[5, 0], [10, 1]];
+const MAX_TYPOS = 2;
+// Trigrams one edit can change (a swap touches 4 windows)
+const GRAMS_PER_EDIT = 4;
+const FUZZY_LIMIT = 5;
+
+/**
+ * Replace accented letters with their base letters ("ö" -> "o", "ø" -> "o")
+ * @param {string} text - Lowercase text
+ * @returns {string} Text without accents
+ */
+function stripAccents(text) {
+    return text
+        .replace(SPECIAL_PATTERN, c => SPECIAL_LETTERS[c])
+        .normalize('NFKD')
+        .replace(/\p{M}/gu, '');
+}
+
+/**
+ * Fold a name for matching: "Ryan O'Reilly" -> "ryan oreilly", "Piteå" -> "pitea"
+ * @param {string} name - Player name or user input
+ * @returns {string} Folded name
+ */
+function foldName(name) {
+    return stripAccents(String(name).toLowerCase())
+        .replace(/['‘’`´.]/g, '')
+        .replace(/[^a-z0-9]+/g, ' ')
+        .trim();
+}
+
+/**
+ * Edits a name of this folded length may contain
+ * @param {number} length - Length of the folded name
+ * @returns {number} 0 below 5 characters, 1 below 10, otherwise 2
+ */
+function maxTypos(length) {
+    for (const [below, typos] of TYPO_LENGTHS) {
+        if (length < below) {
+            return typos;
+        }
+    }
+    return MAX_TYPOS;
+}
+
+/**
+ * Distinct trigrams of a folded name, padded with one space per side
+ * @param {string} folded - Folded name
+ * @returns {Set<string>} Trigrams ("kadri" -> " ka", "kad", "adr", "dri", "ri ")
+ */
+function trigrams(folded) {
+    const padded = ` ${folded} `;
+    const grams = new Set();
+    for (let i = 0; i + 3 <= padded.length; i++) {
+        grams.add(padded.slice(i, i + 3));
+    }
+    return grams;
+}
+
+/**
+ * Edit distance counting a swap of adjacent letters as one edit, computed only as far as limit
+ * @param {string} a - First string
+ * @param {string} b - Second string
+ * @param {number} limit - Largest distance of interest
+ * @returns {number} Distance, or limit + 1 if it is larger
+ */
+function editDistance(a, b, limit) {
+    if (Math.abs(a.length - b.length) > limit) {
+        return limit + 1;
+    }
+    if (a.length > b.length) {
+        [a, b] = [b, a];
+    }
+
+    const over = limit + 1;
+    let before = null;
+    let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+    for (let i = 1; i <= a.length; i++) {
+        // Cells further than limit from the diagonal cannot be <= limit
+        const low = Math.max(1, i - limit);
+        const high = Math.min(b.length, i + limit);
+        const current = new Array(b.length + 1).fill(over);
+        if (low === 1) {
+            current[0] = i;
+        }
+        let rowMin = current[low - 1];
+        for (let j = low; j <= high; j++) {
+            let cost = Math.min(
+                previous[j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1),
+                previous[j] + 1,
+                current[j - 1] + 1
+            );
+            if (before && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+                cost = Math.min(cost, before[j - 2] + 1);
+            }
+            current[j] = cost;
+            rowMin = Math.min(rowMin, cost);
+        }
+        if (rowMin > limit) {
+            return over;
+        }
+        before = previous;
+        previous = current;
+    }
+    return Math.min(previous[b.length], over);
+}
+
+class PrefixIndex {
+    /**
+     * @param {Object} data - Parsed autocomplete.json ({ players, keys, refs, top })
+     */
+    constructor(data) {
+        this.players = data.players;
+        this.keys = data.keys;
+        this.refs = data.refs;
+        this.top = data.top || {};
+    }
+
+    /**
+     * Players with a name word starting with the query, most popular first
+     * @param {string} query - User input
+     * @param {number} [limit=10] - Maximum results
+     * @returns {Array<{id: string, name: string}>} Matches
+     */
+    search(query, limit = DEFAULT_LIMIT) {
+        const prefix = foldName(query);
+        if (!prefix) {
+            return [];
+        }
+
+        let numbers;
+        if (this.top[prefix] && limit <= DEFAULT_LIMIT) {
+            numbers = this.top[prefix].slice(0, limit);
+        } else {
+            const found = new Set();
+            for (let i = this._lowerBound(prefix); i < this.keys.length && this.keys[i].startsWith(prefix); i++) {
+                found.add(this.refs[i]);
+            }
+            numbers = [...found].sort((a, b) => a - b).slice(0, limit);
+        }
+
+        return numbers.map(n => ({ id: this.players[n][0], name: this.players[n][1] }));
+    }
+
+    /**
+     * First key not less than prefix (keys are ASCII, so < matches the Python sort)
+     */
+    _lowerBound(prefix) {
+        let low = 0;
+        let high = this.keys.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (this.keys[mid] < prefix) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        return low;
+    }
+}
+
+class FuzzyIndex {
+    /**
+     * @param {Object} data - Parsed fuzzy.json ({ players, keys, refs, grams })
+     */
+    constructor(data) {
+        this.players = data.players;
+        this.keys = data.keys;
+        this.refs = data.refs;
+
+        // Keys are stored shortest first: starts[n] is the first key at least n long
+        const longest = this.keys.length ? this.keys[this.keys.length - 1].length : 0;
+        this.starts = new Int32Array(longest + 2);
+        for (let n = 0, k = 0; n < this.starts.length; n++) {
+            while (k < this.keys.length && this.keys[k].length < n) {
+                k++;
+            }
+            this.starts[n] = k;
+        }
+        this.sizes = this.keys.map(key => trigrams(key).size);
+
+        this.postings = new Map();
+        for (const [gram, deltas] of Object.entries(data.grams)) {
+            const numbers = new Int32Array(deltas.length);
+            let number = 0;
+            deltas.forEach((delta, i) => {
+                number += delta;
+                numbers[i] = number;
+            });
+            this.postings.set(gram, numbers);
+        }
+        this.counts = new Uint16Array(this.keys.length); // scratch, zero between queries
+    }
+
+    /**
+     * Players whose name (or its end from any word) is within maxDistance edits of the query
+     * @param {string} query - User input
+     * @param {number} [limit=5] - Maximum results
+     * @param {number} [maxDistance] - Edits allowed (default: maxTypos of the query)
+     * @returns {Array<{id: string, name: string, distance: number}>} Closest, then most popular first
+     */
+    match(query, limit = FUZZY_LIMIT, maxDistance) {
+        const folded = foldName(query);
+        if (!folded) {
+            return [];
+        }
+        const typos = maxDistance ?? maxTypos(folded.length);
+        const last = this.starts.length - 1;
+        const first = this.starts[Math.min(Math.max(folded.length - typos, 0), last)];
+        const end = this.starts[Math.min(folded.length + typos + 1, last)];
+
+        const grams = trigrams(folded);
+        const needed = grams.size - GRAMS_PER_EDIT * typos;
+        const candidates = [];
+        if (needed > 0) {
+            const touched = [];
+            for (const gram of grams) {
+                const numbers = this.postings.get(gram);
+                if (!numbers) {
+                    continue;
+                }
+                for (let i = this._lowerBound(numbers, first); i < numbers.length && numbers[i] < end; i++) {
+                    if (this.counts[numbers[i]]++ === 0) {
+                        touched.push(numbers[i]);
+                    }
+                }
+            }
+            const slack = GRAMS_PER_EDIT * typos;
+            for (const number of touched) {
+                const count = this.counts[number];
+                if (count >= needed && count + slack >= this.sizes[number]) {
+                    candidates.push(number);
+                }
+                this.counts[number] = 0;
+            }
+        } else {
+            // Too short for the trigram bound: verify every key of a fitting length
+            for (let number = first; number < end; number++) {
+                candidates.push(number);
+            }
+        }
+
+        const best = new Map();
+        for (const number of candidates) {
+            const distance = editDistance(folded, this.keys[number], typos);
+            const player = this.refs[number];
+            if (distance <= typos && distance < (best.get(player) ?? typos + 1)) {
+                best.set(player, distance);
+            }
+        }
+
+        return [...best]
+            .sort((x, y) => x[1] - y[1] || x[0] - y[0])
+            .slice(0, limit)
+            .map(([n, distance]) => ({ id: this.players[n][0], name: this.players[n][1], distance }));
+    }
+
+    _lowerBound(numbers, value) {
+        let low = 0;
+        let high = numbers.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (numbers[mid] < value) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        return low;
+    }
+}
+
+export { foldName, stripAccents, maxTypos, editDistance, PrefixIndex, FuzzyIndex };
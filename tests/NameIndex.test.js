@@ -0,0 +1,239 @@
+// NameIndex Tests - Verify name folding, prefix lookup and typo-tolerant matching
+// Tests: foldName, prefix ranges, popularity order, precomputed short prefixes, editDistance,
+// FuzzyIndex, validateGuess, near-homonym guesses
+
+import { foldName, editDistance, PrefixIndex, FuzzyIndex } from '../src/utils/NameIndex.js';
+import { validateGuess, sanitizeInput } from '../src/logic/GameLogic.js';
+
+// Built by name_index.build_prefix_index (popularity: Hossa > Holmström > O'Reilly > Kadri > Piteå)
+const INDEX = {
+    version: 1,
+    players: [
+        ['hossa', 'Marian Hossa'], ['holmstrom', 'Tomas Holmström'], ['oreilly', "Ryan O'Reilly"],
+        ['kadri', 'Nazem Kadri'], ['pitea', 'Erik Piteå']
+    ],
+    keys: [
+        'erik pitea', 'holmstrom', 'hossa', 'kadri', 'marian hossa',
+        'nazem kadri', 'oreilly', 'pitea', 'ryan oreilly', 'tomas holmstrom'
+    ],
+    refs: [4, 1, 0, 3, 0, 3, 2, 4, 2, 1],
+    top: { h: [0, 1], ho: [0, 1] }
+};
+
+// Built by fuzzy.build_fuzzy_index from the players above
+const FUZZY = {
+    version: 1,
+    players: INDEX.players,
+    keys: [
+        'hossa', 'kadri', 'pitea', 'oreilly', 'holmstrom', 'erik pitea',
+        'nazem kadri', 'marian hossa', 'ryan oreilly', 'tomas holmstrom'
+    ],
+    refs: [0, 3, 4, 2, 1, 4, 3, 0, 2, 1],
+    grams: {
+        ' er': [5], ' ho': [0, 4, 3, 2], ' ka': [1, 5], ' ma': [7], ' na': [6], ' or': [3, 5],
+        ' pi': [2, 3], ' ry': [8], ' to': [9], 'adr': [1, 5], 'an ': [7, 1], 'ari': [7], 'as ': [9],
+        'aze': [6], 'dri': [1, 5], 'ea ': [2, 3], 'eil': [3, 5], 'em ': [6], 'eri': [5], 'hol': [4, 5],
+        'hos': [0, 7], 'ian': [7], 'ik ': [5], 'ill': [3, 5], 'ite': [2, 3], 'k p': [5], 'kad': [1, 5],
+        'lly': [3, 5], 'lms': [4, 5], 'ly ': [3, 5], 'm k': [6], 'mar': [7], 'mas': [9], 'mst': [4, 5],
+        'n h': [7], 'n o': [8], 'naz': [6], 'olm': [4, 5], 'om ': [4, 5], 'oma': [9], 'ore': [3, 5],
+        'oss': [0, 7], 'pit': [2, 3], 'rei': [3, 5], 'ri ': [1, 5], 'ria': [7], 'rik': [5],
+        'rom': [4, 5], 'rya': [8], 's h': [9], 'sa ': [0, 7], 'ssa': [0, 7], 'str': [4, 5],
+        'tea': [2, 3], 'tom': [9], 'tro': [4, 5], 'yan': [8], 'zem': [6]
+    }
+};
+
+// Built by fuzzy.build_fuzzy_index: two Ryans one letter apart, two Staals
+const HOMONYMS = {
+    version: 1,
+    players: [['smyth', 'Ryan Smyth'], ['smith', 'Ryan Smith'], ['staal-m', 'Marc Staal'], ['staal-e', 'Eric Staal']],
+    keys: ['smith', 'smyth', 'staal', 'staal', 'eric staal', 'marc staal', 'ryan smith', 'ryan smyth'],
+    refs: [1, 0, 2, 3, 3, 2, 1, 0],
+    grams: {
+        ' er': [4], ' ma': [5], ' ry': [6, 1], ' sm': [0, 1, 5, 1], ' st': [2, 1, 1, 1], 'aal': [2, 1, 1, 1],
+        'al ': [2, 1, 1, 1], 'an ': [6, 1], 'arc': [5], 'c s': [4, 1], 'eri': [4], 'ic ': [4], 'ith': [0, 6],
+        'mar': [5], 'mit': [0, 6], 'myt': [1, 6], 'n s': [6, 1], 'rc ': [5], 'ric': [4], 'rya': [6, 1],
+        'smi': [0, 6], 'smy': [1, 6], 'sta': [2, 1, 1, 1], 'taa': [2, 1, 1, 1], 'th ': [0, 1, 5, 1],
+        'yan': [6, 1], 'yth': [1, 6]
+    }
+};
+
+const ids = (results) => results.map(r => r.id).join(',');
+
+// Test 1: Folding matches name_index.fold_name
+function testFoldName() {
+    const cases = [
+        ["Ryan O'Reilly", 'ryan oreilly'],
+        ['Piteå', 'pitea'],
+        ['Jean-Gabriel Pageau', 'jean gabriel pageau'],
+        ['J.T. Miller', 'jt miller'],
+        ['Ørjan Æbelø', 'orjan aebelo'],
+        ['Ľubomír Višňovský', 'lubomir visnovsky'],
+        ['  Mats   Sundin ', 'mats sundin']
+    ];
+    const failures = cases.filter(([name, folded]) => foldName(name) !== folded);
+
+    if (failures.length === 0) {
+        console.log('✓ Test 1: foldName folds accents, apostrophes and punctuation');
+        return true;
+    }
+    console.error('✗ Test 1: foldName failed for', failures.map(([name]) => name));
+    return false;
+}
+
+// Test 2: Any word of the name matches, with or without accents or apostrophes
+function testWordPrefixes() {
+    const index = new PrefixIndex(INDEX);
+    const results = [
+        ids(index.search('o\'rei')), ids(index.search('orei')), ids(index.search('piteå')),
+        ids(index.search('PITEA')), ids(index.search('holmström')), ids(index.search('nazem k'))
+    ];
+    const expected = ['oreilly', 'oreilly', 'pitea', 'pitea', 'holmstrom', 'kadri'];
+
+    if (results.join('|') === expected.join('|')) {
+        console.log('✓ Test 2: Word prefixes match folded names');
+        return true;
+    }
+    console.error('✗ Test 2: Word prefixes failed:', results);
+    return false;
+}
+
+// Test 3: Results are ranked by popularity and limited
+function testRanking() {
+    const index = new PrefixIndex(INDEX);
+    const range = ids(index.search('r', 20)); // ryan oreilly
+    const short = ids(index.search('ho'));    // precomputed
+    const long = ids(index.search('hos'));
+    const limited = ids(index.search('k', 1));
+
+    if (short === 'hossa,holmstrom' && long === 'hossa' && range === 'oreilly' && limited === 'kadri') {
+        console.log('✓ Test 3: Results ranked by popularity');
+        return true;
+    }
+    console.error('✗ Test 3: Ranking failed:', { short, long, range, limited });
+    return false;
+}
+
+// Test 4: Empty and unmatched queries
+function testNoMatch() {
+    const index = new PrefixIndex(INDEX);
+
+    if (index.search('').length === 0 && index.search("'").length === 0 && index.search('zz').length === 0) {
+        console.log('✓ Test 4: Empty and unmatched queries return nothing');
+        return true;
+    }
+    console.error('✗ Test 4: Expected no results');
+    return false;
+}
+
+// Test 5: Edit distance counts an adjacent swap as one edit and stops at the limit
+function testEditDistance() {
+    const results = [
+        editDistance('holmstrom', 'holmstrom', 1), editDistance('holmstorm', 'holmstrom', 1),
+        editDistance('kadri', 'nazem kadri', 2), editDistance('ab', '', 2), editDistance('abcd', 'badc', 2)
+    ];
+
+    if (results.join(',') === '0,1,3,2,2') {
+        console.log('✓ Test 5: editDistance works');
+        return true;
+    }
+    console.error('✗ Test 5: editDistance failed:', results);
+    return false;
+}
+
+// Test 6: Fuzzy matches tolerate typos and accents, closest and most popular first
+function testFuzzyMatch() {
+    const index = new FuzzyIndex(FUZZY);
+    const results = [
+        index.match('tomas holmstrom'), index.match('holmstorm'), index.match('ryan oreily'),
+        index.match('nazem kardi'), index.match('hosa'), index.match('hosa', 5, 1)
+    ].map(matches => matches.map(m => `${m.id}:${m.distance}`).join(','));
+    const expected = ['holmstrom:0', 'holmstrom:1', 'oreilly:1', 'kadri:1', '', 'hossa:1'];
+
+    if (results.join('|') === expected.join('|')) {
+        console.log('✓ Test 6: FuzzyIndex matches typos');
+        return true;
+    }
+    console.error('✗ Test 6: FuzzyIndex failed:', results);
+    return false;
+}
+
+// Test 7: Guesses ignore accents and allow typos on longer names
+function testValidateGuess() {
+    const index = new FuzzyIndex(FUZZY);
+    const accepted = [
+        validateGuess(sanitizeInput('Tomas Holmström'), 'tomas holmström'),
+        validateGuess(sanitizeInput('tomas holmstrom'), 'tomas holmström'),
+        validateGuess('tomas holmstorm', 'Tomas Holmström', index, 'holmstrom'),
+        validateGuess('ryan oreily', "Ryan O'Reilly", index, 'oreilly'),
+        validateGuess('ryan oreilly', "Ryan O'Reilly"),
+        validateGuess('bobby orr', 'Bobby Orr')
+    ];
+    const rejected = [
+        validateGuess('holmstrom', 'Tomas Holmström', index, 'holmstrom'),
+        validateGuess('tomas holmstorm', 'Tomas Holmström'), // typos need the index
+        validateGuess('tomas holmstorm', 'Tomas Holmström', index, 'hossa'),
+        validateGuess('bob orr', 'Bobby Orr'),
+        validateGuess('', 'Bobby Orr')
+    ];
+
+    if (accepted.every(Boolean) && !rejected.some(Boolean) && sanitizeInput(' Piteå ') === 'pitea') {
+        console.log('✓ Test 7: validateGuess allows accents and typos');
+        return true;
+    }
+    console.error('✗ Test 7: validateGuess failed:', accepted, rejected);
+    return false;
+}
+
+// Test 8: A typo is only forgiven when no other player is as close
+function testNearHomonyms() {
+    const index = new FuzzyIndex(HOMONYMS);
+    const accepted = [
+        validateGuess('ryan smyth', 'Ryan Smyth', index, 'smyth'),
+        validateGuess('ryan smith', 'Ryan Smith', index, 'smith'),
+        validateGuess('ryan smyht', 'Ryan Smyth', index, 'smyth'),
+        validateGuess('ryan smithe', 'Ryan Smith', index, 'smith'),
+        validateGuess('mark staal', 'Marc Staal', index, 'staal-m')
+    ];
+    const rejected = [
+        validateGuess('ryan smith', 'Ryan Smyth', index, 'smyth'),  // another player exactly
+        validateGuess('ryan smyth', 'Ryan Smith', index, 'smith'),
+        validateGuess('ryan smithe', 'Ryan Smyth', index, 'smyth'), // closer to Ryan Smith
+        validateGuess('ryan smoth', 'Ryan Smyth', index, 'smyth'),  // one edit from both
+        validateGuess('ryan smoth', 'Ryan Smith', index, 'smith')
+    ];
+
+    if (accepted.every(Boolean) && !rejected.some(Boolean)) {
+        console.log('✓ Test 8: validateGuess rejects typos closer to other players');
+        return true;
+    }
+    console.error('✗ Test 8: Near-homonym guesses failed:', accepted, rejected);
+    return false;
+}
+
+// Run all tests
+export function runAllTests() {
+    console.log('Running NameIndex tests...\n');
+
+    const results = [
+        testFoldName(),
+        testWordPrefixes(),
+        testRanking(),
+        testNoMatch(),
+        testEditDistance(),
+        testFuzzyMatch(),
+        testValidateGuess(),
+        testNearHomonyms()
+    ];
+
+    const passed = results.filter(r => r).length;
+    const total = results.length;
+
+    console.log(`\n${passed}/${total} tests passed`);
+
+    return passed === total;
+}
+
+// Auto-run if executed directly
+if (import.meta.url === `file://${process.argv[1]}`) {
+    runAllTests();
+}
@@ -324,6 +324,183 @@ asyncTest('PlayerService clearCache removes all cached data', async () => {
     }
 });
 
+asyncTest('PlayerService loads bundled players with one fetch per bundle', async () => {
+    const mockManifest = createMockManifest();
+    mockManifest.players.forEach((p, i) => {
+        p.bundle = i < 3 ? 0 : 1;
+        p.offset = i < 3 ? i : i - 3;
+    });
+    mockManifest.bundles = [
+        { file: "bundles/bundle-0.json", players: 3 },
+        { file: "bundles/bundle-1.json", players: 2 }
+    ];
+    const bundleFiles = {
+        'bundle-0.json': mockManifest.players.slice(0, 3).map(p => createMockPlayer(p.name)),
+        'bundle-1.json': mockManifest.players.slice(3).map(p => createMockPlayer(p.name))
+    };
+    const fetched = [];
+
+    const originalFetch = global.fetch || window.fetch;
+    const mockFetch = async (url) => {
+        fetched.push(url);
+        if (url.includes('manifest.json')) {
+            return { ok: true, json: async () => mockManifest };
+        }
+        for (const [file, players] of Object.entries(bundleFiles)) {
+            if (url.includes(file)) {
+                return { ok: true, json: async () => players };
+            }
+        }
+        return { ok: false, status: 404 };
+    };
+    (typeof global !== 'undefined' ? global : window).fetch = mockFetch;
+
+    try {
+        const singleton = (await import('../src/services/PlayerService.js')).default;
+        const service = new singleton.constructor();
+
+        const players = await Promise.all(['holmstrom', 'redmond', 'oreilly'].map(id => service.loadPlayer(id)));
+
+        assertEqual(players[2].name, "Ryan O'Reilly", 'Player should come from its bundle offset');
+        assertEqual(fetched.filter(url => url.includes('bundle-0.json')).length, 1, 'Should fetch bundle 0 once');
+        assertEqual(fetched.filter(url => url.includes('players/')).length, 0, 'Should not fetch single players');
+        assertEqual(service.getCacheStats().size, 3, 'Cache should hold every player of bundle 0');
+
+        const kadri = await service.loadPlayer('kadri');
+        assertEqual(kadri.name, 'Nazem Kadri', 'Player should load from bundle 1');
+        assertEqual(service.getCacheStats().size, 5, 'Cache should hold both bundles');
+        assertEqual(fetched.filter(url => url.includes('manifest.json')).length, 1, 'Should fetch manifest once');
+    } finally {
+        (typeof global !== 'undefined' ? global : window).fetch = originalFetch;
+    }
+});
+
+asyncTest('PlayerService keeps hashed files in the persistent store and revalidates only the manifest', async () => {
+    const mockManifest = createMockManifest();
+    mockManifest.players[0].file = 'players/holmstrom.aaaaaaaaaaaa.json';
+    mockManifest.players[0].hash = 'a'.repeat(64);
+    const fetched = [];
+
+    const entries = new Map();
+    const mockStore = {
+        match: async (key) => (entries.has(key) ? entries.get(key).clone() : undefined),
+        put: async (key, response) => { entries.set(key, response); },
+        keys: async () => [...entries.keys()].map(url => ({ url })),
+        delete: async (request) => entries.delete(request.url)
+    };
+
+    const scope = typeof global !== 'undefined' ? global : window;
+    const originalFetch = scope.fetch;
+    const originalCaches = scope.caches;
+    scope.caches = { open: async () => mockStore };
+    scope.fetch = async (url, options) => {
+        fetched.push({ url, options });
+        if (url.includes('manifest.json')) {
+            return { ok: true, json: async () => JSON.parse(JSON.stringify(mockManifest)) };
+        }
+        if (url.includes('holmstrom.')) {
+            return new Response(JSON.stringify(createMockPlayer('Tomas Holmstrom')));
+        }
+        return { ok: false, status: 404 };
+    };
+
+    try {
+        const singleton = (await import('../src/services/PlayerService.js')).default;
+
+        const first = new singleton.constructor();
+        await first.loadPlayer('holmstrom');
+        assertEqual(entries.size, 1, 'Hashed file should be stored');
+
+        // New page load: empty memory cache, stored copy is used
+        const second = new singleton.constructor();
+        const player = await second.loadPlayer('holmstrom');
+        assertEqual(player.name, 'Tomas Holmstrom', 'Stored player should load');
+        assertEqual(fetched.filter(f => f.url.includes('holmstrom.')).length, 1, 'Player file fetched once');
+
+        const manifestFetches = fetched.filter(f => f.url.includes('manifest.json'));
+        assertEqual(manifestFetches.length, 2, 'Manifest fetched on each load');
+        assertEqual(manifestFetches[1].options.cache, 'no-cache', 'Manifest should be revalidated');
+
+        // New content: new hash, old stored copy is pruned
+        mockManifest.players[0].file = 'players/holmstrom.bbbbbbbbbbbb.json';
+        mockManifest.players[0].hash = 'b'.repeat(64);
+        const third = new singleton.constructor();
+        await third.loadPlayer('holmstrom');
+        await new Promise(resolve => setTimeout(resolve, 0));
+        assertEqual(fetched.filter(f => f.url.includes('holmstrom.')).length, 2, 'Changed file fetched again');
+        assertEqual(entries.size, 1, 'Old hash should be pruned');
+        assertTrue([...entries.keys()][0].endsWith('b'.repeat(64)), 'Store should hold the new hash');
+    } finally {
+        scope.fetch = originalFetch;
+        scope.caches = originalCaches;
+    }
+});
+
+asyncTest('PlayerService loadNameIndex and loadFuzzyIndex fetch each index once', async () => {
+    const mockManifest = createMockManifest();
+    mockManifest.autocomplete = { file: 'autocomplete.json', size: 0 };
+    mockManifest.fuzzy = { file: 'fuzzy.json', size: 0 };
+    const mockIndex = {
+        version: 1,
+        players: [['kadri', 'Nazem Kadri'], ['oreilly', "Ryan O'Reilly"]],
+        keys: ['kadri', 'nazem kadri', 'oreilly', 'ryan oreilly'],
+        refs: [0, 0, 1, 1],
+        top: {}
+    };
+    // Built by fuzzy.build_fuzzy_index
+    const mockFuzzy = {
+        version: 1,
+        players: mockIndex.players,
+        keys: ['kadri', 'oreilly', 'nazem kadri', 'ryan oreilly'],
+        refs: [0, 1, 0, 1],
+        grams: {
+            ' ka': [0, 2], ' na': [2], ' or': [1, 2], ' ry': [3], 'adr': [0, 2], 'an ': [3], 'aze': [2],
+            'dri': [0, 2], 'eil': [1, 2], 'em ': [2], 'ill': [1, 2], 'kad': [0, 2], 'lly': [1, 2],
+            'ly ': [1, 2], 'm k': [2], 'n o': [3], 'naz': [2], 'ore': [1, 2], 'rei': [1, 2], 'ri ': [0, 2],
+            'rya': [3], 'yan': [3], 'zem': [2]
+        }
+    };
+    const fetched = [];
+
+    const scope = typeof global !== 'undefined' ? global : window;
+    const originalFetch = scope.fetch;
+    scope.fetch = async (url) => {
+        fetched.push(url);
+        if (url.includes('manifest.json')) {
+            return { ok: true, json: async () => mockManifest };
+        }
+        if (url.includes('autocomplete.json')) {
+            return { ok: true, json: async () => mockIndex };
+        }
+        if (url.includes('fuzzy.json')) {
+            return { ok: true, json: async () => mockFuzzy };
+        }
+        return { ok: false, status: 404 };
+    };
+
+    try {
+        const singleton = (await import('../src/services/PlayerService.js')).default;
+        const service = new singleton.constructor();
+
+        const [index, again] = await Promise.all([service.loadNameIndex(), service.loadNameIndex()]);
+        assertTrue(index === again, 'Concurrent calls should share one index');
+        assertEqual(index.search("o'rei")[0].id, 'oreilly', 'Index should match folded prefixes');
+        assertEqual(fetched.filter(url => url.includes('autocomplete.json')).length, 1, 'Index fetched once');
+
+        const fuzzy = await service.loadFuzzyIndex();
+        assertEqual(fuzzy.match('ryan oreily')[0].id, 'oreilly', 'Fuzzy index should allow a typo');
+        assertTrue(fuzzy === await service.loadFuzzyIndex(), 'Fuzzy index should be loaded once');
+
+        delete mockManifest.autocomplete;
+        delete mockManifest.fuzzy;
+        const plain = new singleton.constructor();
+        assertEqual(await plain.loadNameIndex(), null, 'No index listed should give null');
+        assertEqual(await plain.loadFuzzyIndex(), null, 'No fuzzy index listed should give null');
+    } finally {
+        scope.fetch = originalFetch;
+    }
+});
+
 // Run tests
 console.log('Running PlayerService Tests...\n');
 